@@ -1,9 +1,14 @@
 from .client import (
     AsyncIOHTTPClient,
     AsyncIOIPCClient,
+    AsyncIOIPCPool,
+    AsyncIOWSClient,
     BaseAsyncIOClient,
+    Subscription,
     create_ethereum_client
 )
+from .batch import BatchRequest
+from .multinode import HedgePolicy, MultiNodeClient, create_multinode_client
 
 
 __version__ = '0.2.2'
@@ -11,6 +16,13 @@ __version__ = '0.2.2'
 __all__ = [
     'AsyncIOHTTPClient',
     'AsyncIOIPCClient',
+    'AsyncIOIPCPool',
+    'AsyncIOWSClient',
     'BaseAsyncIOClient',
+    'BatchRequest',
+    'HedgePolicy',
+    'MultiNodeClient',
+    'Subscription',
     'create_ethereum_client',
+    'create_multinode_client',
 ]
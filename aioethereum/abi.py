@@ -0,0 +1,379 @@
+import abc
+import binascii
+import re
+
+from .crypto import keccak256
+
+try:
+    from abc import ABC
+except ImportError:
+    class ABC(metaclass=abc.ABCMeta):
+        pass
+
+
+_TYPE = re.compile(r'^(u?int|bytes|address|bool|string|function)(\d*)'
+                   r'((?:\[\d*\])*)$')
+_ARRAY = re.compile(r'\[(\d*)\]')
+
+_WORD = 32
+
+
+def _pad(data):
+    remainder = len(data) % _WORD
+    if remainder:
+        data += b'\x00' * (_WORD - remainder)
+    return data
+
+
+def _to_bytes(value):
+    if isinstance(value, str):
+        value = value[2:] if value.startswith('0x') else value
+        return binascii.unhexlify(value)
+    return bytes(value)
+
+
+class _Codec(ABC):
+    """Encoder and decoder of one ABI type.
+
+    Static codecs take ``size`` bytes in head, dynamic ones take one word
+    of offset in head and their data in tail.
+    """
+
+    dynamic = False
+    size = _WORD
+
+    @abc.abstractmethod
+    def encode(self, value):
+        """Encode value.
+
+        :rtype: bytes
+        """
+
+    @abc.abstractmethod
+    def decode(self, data, offset):
+        """Decode value starting at offset of data.
+        """
+
+
+class _Uint(_Codec):
+
+    def __init__(self, bits):
+        self._max = 1 << bits
+
+    def encode(self, value):
+        if not 0 <= value < self._max:
+            raise ValueError('Value {0} is out of range.'.format(value))
+        return value.to_bytes(_WORD, 'big')
+
+    def decode(self, data, offset):
+        return int.from_bytes(data[offset:offset + _WORD], 'big')
+
+
+class _Int(_Codec):
+
+    def __init__(self, bits):
+        self._max = 1 << (bits - 1)
+
+    def encode(self, value):
+        if not -self._max <= value < self._max:
+            raise ValueError('Value {0} is out of range.'.format(value))
+        return value.to_bytes(_WORD, 'big', signed=True)
+
+    def decode(self, data, offset):
+        return int.from_bytes(data[offset:offset + _WORD], 'big',
+                              signed=True)
+
+
+class _Address(_Codec):
+
+    def encode(self, value):
+        value = _to_bytes(value)
+        if len(value) != 20:
+            raise ValueError('Address must be 20 bytes.')
+        return b'\x00' * 12 + value
+
+    def decode(self, data, offset):
+        return '0x' + binascii.hexlify(
+            data[offset + 12:offset + _WORD]).decode('ascii')
+
+
+class _Bool(_Codec):
+
+    def encode(self, value):
+        return (1 if value else 0).to_bytes(_WORD, 'big')
+
+    def decode(self, data, offset):
+        return data[offset + _WORD - 1] == 1
+
+
+class _FixedBytes(_Codec):
+
+    def __init__(self, length):
+        self._length = length
+
+    def encode(self, value):
+        value = _to_bytes(value)
+        if len(value) > self._length:
+            raise ValueError('Value is longer than {0} bytes.'.format(
+                self._length))
+        return value + b'\x00' * (_WORD - len(value))
+
+    def decode(self, data, offset):
+        return bytes(data[offset:offset + self._length])
+
+
+class _Bytes(_Codec):
+
+    dynamic = True
+
+    def encode(self, value):
+        value = _to_bytes(value)
+        return len(value).to_bytes(_WORD, 'big') + _pad(value)
+
+    def decode(self, data, offset):
+        length = int.from_bytes(data[offset:offset + _WORD], 'big')
+        start = offset + _WORD
+        if start + length > len(data):
+            raise ValueError('Data is too short.')
+        return bytes(data[start:start + length])
+
+
+class _String(_Bytes):
+
+    def encode(self, value):
+        return super().encode(value.encode('utf-8'))
+
+    def decode(self, data, offset):
+        return super().decode(data, offset).decode('utf-8', 'replace')
+
+
+def _encode_items(codecs, values):
+    if len(codecs) != len(values):
+        raise ValueError('Expected {0} values, got {1}.'.format(
+            len(codecs), len(values)))
+    heads = []
+    tails = []
+    tail_offset = sum(_WORD if codec.dynamic else codec.size
+                      for codec in codecs)
+    for codec, value in zip(codecs, values):
+        data = codec.encode(value)
+        if codec.dynamic:
+            heads.append(tail_offset.to_bytes(_WORD, 'big'))
+            tails.append(data)
+            tail_offset += len(data)
+        else:
+            heads.append(data)
+    return b''.join(heads) + b''.join(tails)
+
+
+def _decode_items(layout, data, offset):
+    values = []
+    for codec, head in layout:
+        position = offset + head
+        if codec.dynamic:
+            position = offset + int.from_bytes(
+                data[position:position + _WORD], 'big')
+        values.append(codec.decode(data, position))
+    return values
+
+
+class _Tuple(_Codec):
+    """Sequence of values, base of fixed size arrays.
+    """
+
+    def __init__(self, codecs):
+        self._codecs = tuple(codecs)
+        self.dynamic = any(codec.dynamic for codec in self._codecs)
+        # head offsets are known at compile time
+        self._offsets = []
+        head = 0
+        for codec in self._codecs:
+            self._offsets.append(head)
+            head += _WORD if codec.dynamic else codec.size
+        self.size = head
+        self._layout = tuple(zip(self._codecs, self._offsets))
+
+    def encode(self, values):
+        return _encode_items(self._codecs, values)
+
+    def decode(self, data, offset):
+        if offset + self.size > len(data):
+            raise ValueError('Data is too short.')
+        return tuple(_decode_items(self._layout, data, offset))
+
+
+class _FixedArray(_Tuple):
+
+    def __init__(self, codec, length):
+        super().__init__([codec] * length)
+
+    def decode(self, data, offset):
+        return list(super().decode(data, offset))
+
+
+class _Array(_Codec):
+
+    dynamic = True
+
+    def __init__(self, codec):
+        self._codec = codec
+        self._item_size = _WORD if codec.dynamic else codec.size
+
+    def encode(self, values):
+        return (len(values).to_bytes(_WORD, 'big') +
+                _encode_items([self._codec] * len(values), values))
+
+    def decode(self, data, offset):
+        length = int.from_bytes(data[offset:offset + _WORD], 'big')
+        start = offset + _WORD
+        if start + length * self._item_size > len(data):
+            raise ValueError('Data is too short.')
+        layout = [(self._codec, index * self._item_size)
+                  for index in range(length)]
+        return _decode_items(layout, data, start)
+
+
+_CODECS = {}
+
+
+def canonical_type(abi_type, components=None):
+    """Canonical name of ABI type used in signatures.
+
+    :param abi_type: Type, e.g. ``uint`` or ``tuple[]``
+    :type abi_type: str
+
+    :param components: Components of tuple type (optional)
+    :type components: list
+
+    :rtype: str
+    """
+    if abi_type.startswith('tuple'):
+        return '({0}){1}'.format(
+            ','.join(canonical_type(item['type'], item.get('components'))
+                     for item in components or ()),
+            abi_type[len('tuple'):])
+    match = _TYPE.match(abi_type)
+    if match is None:
+        raise ValueError('Invalid ABI type {0}.'.format(abi_type))
+    base, bits, arrays = match.groups()
+    if base in ('int', 'uint') and not bits:
+        bits = '256'
+    return base + bits + arrays
+
+
+def _split_tuple(abi_type):
+    # '(a,(b,c)[])[2]' -> ['a', '(b,c)[]'], '[2]'
+    depth = 0
+    items = []
+    start = 1
+    for index, char in enumerate(abi_type):
+        if char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if not depth:
+                if index > start:
+                    items.append(abi_type[start:index])
+                return items, abi_type[index + 1:]
+        elif char == ',' and depth == 1:
+            items.append(abi_type[start:index])
+            start = index + 1
+    raise ValueError('Invalid ABI type {0}.'.format(abi_type))
+
+
+def _compile(abi_type):
+    if abi_type.startswith('('):
+        items, arrays = _split_tuple(abi_type)
+        codec = _Tuple([get_codec(item) for item in items])
+    else:
+        match = _TYPE.match(abi_type)
+        if match is None:
+            raise ValueError('Invalid ABI type {0}.'.format(abi_type))
+        base, bits, arrays = match.groups()
+        if base == 'uint':
+            codec = _Uint(int(bits or 256))
+        elif base == 'int':
+            codec = _Int(int(bits or 256))
+        elif base == 'address':
+            codec = _Address()
+        elif base == 'bool':
+            codec = _Bool()
+        elif base == 'string':
+            codec = _String()
+        elif base == 'function':
+            codec = _FixedBytes(24)
+        elif bits:
+            codec = _FixedBytes(int(bits))
+        else:
+            codec = _Bytes()
+    for length in _ARRAY.findall(arrays):
+        codec = _FixedArray(codec, int(length)) if length else _Array(codec)
+    return codec
+
+
+def get_codec(abi_type):
+    """Get compiled codec of canonical ABI type, codecs are cached.
+
+    :param abi_type: Canonical type, e.g. ``uint256`` or
+                     ``(address,uint256)[]``
+    :type abi_type: str
+    """
+    codec = _CODECS.get(abi_type)
+    if codec is None:
+        codec = _CODECS[abi_type] = _compile(abi_type)
+    return codec
+
+
+def encode_abi(types, values):
+    """Encode values by ABI.
+
+    :param types: Canonical types of values
+    :type types: list
+
+    :param values: Values
+    :type values: list
+
+    :rtype: bytes
+    """
+    return get_codec('({0})'.format(','.join(types))).encode(values)
+
+
+def decode_abi(types, data):
+    """Decode values by ABI.
+
+    :param types: Canonical types of values
+    :type types: list
+
+    :param data: Encoded data, bytes or hex string
+    :type data: bytes or str
+
+    :rtype: tuple
+    :raises ValueError: when data does not match types
+    """
+    if isinstance(data, str):
+        data = _to_bytes(data)
+    return get_codec('({0})'.format(','.join(types))).decode(data, 0)
+
+
+def selector(signature):
+    """First 4 bytes of keccak hash of function signature.
+
+    :param signature: Signature, e.g. ``transfer(address,uint256)``
+    :type signature: str
+
+    :rtype: bytes
+    """
+    return keccak256(signature.encode('ascii'))[:4]
+
+
+def signature(entry):
+    """Signature of ABI function or event entry.
+
+    :param entry: Entry of ABI JSON
+    :type entry: dict
+
+    :rtype: str
+    """
+    return '{0}({1})'.format(entry['name'], ','.join(
+        canonical_type(item['type'], item.get('components'))
+        for item in entry.get('inputs', ())))
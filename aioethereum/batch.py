@@ -0,0 +1,116 @@
+import asyncio
+import functools
+
+from .errors import BadResponseError
+from .management import RpcMixin
+
+
+class _BatchCall:
+
+    __slots__ = ('method', 'params')
+
+    def __init__(self, method, params):
+        self.method = method
+        self.params = params or []
+
+
+class _BatchRecorder(RpcMixin):
+    """Runs management methods up to their rpc call and suspends there.
+    """
+
+    @asyncio.coroutine
+    def rpc_call(self, method, params=None, id_=None):
+        return (yield _BatchCall(method, params))
+
+
+def _finish(coro, result):
+    if coro is None:
+        return result
+    try:
+        if isinstance(result, BadResponseError):
+            coro.throw(result)
+        else:
+            coro.send(result)
+    except StopIteration as e:
+        return e.value
+    except Exception as e:
+        return e
+    raise RuntimeError('Management method awaited more than one rpc call.')
+
+
+class BatchRequest:
+    """Builder of RPC 2.0 batch request.
+
+    Any method of :class:`aioethereum.management.RpcMixin` can be called on
+    the builder, call is queued instead of being sent and the result of the
+    method is returned by :meth:`execute` at the position of the call.
+
+    .. code:: python
+
+        batch = client.batch()
+        for address in addresses:
+            batch.eth_getBalance(address)
+        balances = yield from batch.execute()
+
+    :param client: Client used to send the batch
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :return: :class:`BatchRequest` instance.
+    """
+
+    def __init__(self, client):
+        self._client = client
+        self._recorder = _BatchRecorder()
+        self._recorder.models = getattr(client, 'models', False)
+        self._calls = []
+
+    def __len__(self):
+        return len(self._calls)
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        method = getattr(self._recorder, name)
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            coro = method(*args, **kwargs)
+            try:
+                call = coro.send(None)
+            except StopIteration:
+                raise ValueError('Method {0} does not make rpc '
+                                 'call.'.format(name))
+            return self._append(call.method, call.params, coro)
+        return wrapper
+
+    def _append(self, method, params, coro):
+        self._calls.append((method, params, coro))
+        return len(self._calls) - 1
+
+    def add(self, method, params=None):
+        """Queue raw rpc call.
+
+        :param method: RPC node method
+        :type method: str
+
+        :param params: Input params for method
+        :type params: list
+
+        :return: position of the call in the batch
+        :rtype: int
+        """
+        return self._append(method, params or [], None)
+
+    @asyncio.coroutine
+    def execute(self):
+        """Send all queued calls as one batch and clear the builder.
+
+        :return: results in order of calls, failed items are returned
+                 as exception instances
+        :rtype: list
+        """
+        calls, self._calls = self._calls, []
+        results = yield from self._client.rpc_batch(
+            [(method, params) for method, params, _ in calls])
+        return [_finish(coro, result)
+                for (_, _, coro), result in zip(calls, results)]
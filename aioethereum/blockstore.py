@@ -0,0 +1,280 @@
+import asyncio
+import dbm
+import mmap
+import os
+import struct
+import zlib
+
+try:
+    import ujson as json  # noqa
+except ImportError:
+    import json
+
+from .models import Model
+from .streams import BLOCK_EVENT_NEW
+from .utils import hex_to_dec
+
+
+# segment number + 1 (0 when block is absent), offset and size of record
+_RECORD = struct.Struct('<IQI')
+_INDEX_GROWTH = 1024 * _RECORD.size
+
+
+class BlockStore:
+    """Append-only local storage of blocks.
+
+    Blocks are stored as compressed json records in segment files, index
+    of fixed size records by block number is memory-mapped and hashes are
+    mapped to numbers in :mod:`dbm` database. Client created with
+    ``block_store`` reads historical blocks from the store and calls node
+    only for missing ones, :meth:`sync` fills the store from the chain.
+
+    .. code:: python
+
+        store = BlockStore('blocks')
+        client = yield from create_ethereum_client(uri, block_store=store)
+        asyncio.ensure_future(store.sync(client, confirmations=12))
+
+    :param path: Directory of the store
+    :type path: str
+
+    :param segment_size: Size of segment file to start the next one
+    :type segment_size: int
+
+    :param compress_level: Level of :mod:`zlib` compression
+    :type compress_level: int
+
+    :return: :class:`BlockStore` instance.
+    """
+
+    def __init__(self, path, segment_size=256 * 1024 * 1024,
+                 compress_level=6):
+        os.makedirs(path, exist_ok=True)
+        self._path = path
+        self._segment_size = segment_size
+        self._compress_level = compress_level
+        self._hashes = dbm.open(os.path.join(path, 'hashes.db'), 'c')
+        self._segments = {}
+        self._writer = None
+        self._segment = self._last_segment()
+
+        self._index_file = open(os.path.join(path, 'numbers.idx'), 'a+b')
+        self._index = None
+        self._map_index()
+        self.last = self._find_last()
+
+    def _segment_path(self, segment):
+        return os.path.join(self._path, 'segment-{0:06d}.dat'.format(segment))
+
+    def _last_segment(self):
+        segment = 0
+        while os.path.exists(self._segment_path(segment + 1)):
+            segment += 1
+        return segment
+
+    def _map_index(self):
+        if self._index is not None:
+            self._index.close()
+        size = os.fstat(self._index_file.fileno()).st_size
+        self._index = None
+        if size:
+            self._index = mmap.mmap(self._index_file.fileno(), size)
+
+    def _find_last(self):
+        if self._index is None:
+            return None
+        number = len(self._index) // _RECORD.size - 1
+        while number >= 0 and not self._record(number)[0]:
+            number -= 1
+        return number if number >= 0 else None
+
+    def _record(self, number):
+        offset = number * _RECORD.size
+        if (number < 0 or self._index is None or
+                offset + _RECORD.size > len(self._index)):
+            return 0, 0, 0
+        return _RECORD.unpack_from(self._index, offset)
+
+    def _set_record(self, number, record):
+        end = (number + 1) * _RECORD.size
+        if self._index is None or end > len(self._index):
+            # grow with reserve, so index is not remapped on each block
+            self._index_file.truncate(end + _INDEX_GROWTH)
+            self._map_index()
+        _RECORD.pack_into(self._index, number * _RECORD.size, *record)
+
+    def _segment_map(self, segment, end):
+        data = self._segments.get(segment)
+        if data is None or len(data) < end:
+            if data is not None:
+                data.close()
+            with open(self._segment_path(segment), 'rb') as f:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._segments[segment] = data
+        return data
+
+    def _append(self, data):
+        if self._writer is None:
+            self._writer = open(self._segment_path(self._segment), 'ab')
+        offset = self._writer.tell()
+        if offset and offset + len(data) > self._segment_size:
+            self._writer.close()
+            self._segment += 1
+            self._writer = open(self._segment_path(self._segment), 'ab')
+            offset = 0
+        self._writer.write(data)
+        self._writer.flush()
+        return self._segment + 1, offset, len(data)
+
+    def __contains__(self, number):
+        return bool(self._record(number)[0])
+
+    def put(self, block):
+        """Store block, replacing stored block with the same number.
+
+        :param block: Block of ``eth_getBlockByNumber``
+        :type block: dict or :class:`aioethereum.models.Block`
+        """
+        if isinstance(block, Model):
+            block = block.to_dict()
+        number = hex_to_dec(block['number'])
+        self.remove(number)
+        data = zlib.compress(json.dumps(block).encode('utf-8'),
+                             self._compress_level)
+        self._set_record(number, self._append(data))
+        self._hashes[block['hash'].lower()] = str(number)
+        if self.last is None or number > self.last:
+            self.last = number
+
+    def remove(self, number):
+        """Forget block, e.g. replaced by reorganization.
+
+        :param number: Block number
+        :type number: int
+        """
+        block = self._read(number)
+        if block is None:
+            return
+        self._set_record(number, (0, 0, 0))
+        try:
+            del self._hashes[block['hash'].lower()]
+        except KeyError:
+            pass
+        if number == self.last:
+            self.last = self._find_last()
+
+    def _read(self, number):
+        segment, offset, size = self._record(number)
+        if not segment:
+            return None
+        data = self._segment_map(segment - 1, offset + size)
+        return json.loads(zlib.decompress(
+            data[offset:offset + size]).decode('utf-8'))
+
+    def _prepare(self, block, tx_objects):
+        if block is None:
+            return None
+        transactions = block['transactions']
+        if not tx_objects:
+            block['transactions'] = [tx['hash'] if isinstance(tx, dict)
+                                     else tx for tx in transactions]
+        elif transactions and not isinstance(transactions[0], dict):
+            # stored without objects
+            return None
+        return block
+
+    def get_by_number(self, number, tx_objects=True):
+        """Read block by number.
+
+        :param number: Block number
+        :type number: int
+
+        :param tx_objects: Return txs full object
+        :type tx_objects: bool
+
+        :return: block or None when it is not stored
+        :rtype: dict
+        """
+        return self._prepare(self._read(number), tx_objects)
+
+    def get_by_hash(self, bhash, tx_objects=True):
+        """Read block by hash.
+
+        :param bhash: Block hash
+        :type bhash: str
+
+        :param tx_objects: Return txs full object
+        :type tx_objects: bool
+
+        :return: block or None when it is not stored
+        :rtype: dict
+        """
+        number = self._hashes.get(bhash.lower())
+        if number is None:
+            return None
+        return self.get_by_number(int(number), tx_objects)
+
+    @asyncio.coroutine
+    def sync(self, client, start=None, end=None, confirmations=12,
+             tx_objects=True, **kwargs):
+        """Fill the store by blocks of the chain, replaced blocks are
+        removed.
+
+        :param client: Client used to fetch blocks
+        :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+        :param start: Number of the first block (optional, next after the
+                      last stored one by default)
+        :type start: int
+
+        :param end: Number of block to stop after (optional, follows the
+                    head forever by default)
+        :type end: int
+
+        :param confirmations: Amount of blocks on top of stored block
+        :type confirmations: int
+
+        :param tx_objects: Store txs full object
+        :type tx_objects: bool
+
+        :param kwargs: Options of :class:`aioethereum.streams.BlockStream`
+        """
+        if start is None:
+            start = 0 if self.last is None else self.last + 1
+        stream = client.stream_blocks(start, confirmations, tx_objects,
+                                      **kwargs)
+        try:
+            while True:
+                event = yield from stream.get()
+                if event.type == BLOCK_EVENT_NEW:
+                    self.put(event.block)
+                else:
+                    self.remove(event.number)
+                if end is not None and event.number >= end:
+                    return
+        finally:
+            stream.close()
+
+    def flush(self):
+        """Write index to disk.
+        """
+        if self._index is not None:
+            self._index.flush()
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self):
+        """Flush and close all files of the store.
+        """
+        self.flush()
+        for data in self._segments.values():
+            data.close()
+        self._segments.clear()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._index is not None:
+            self._index.close()
+            self._index = None
+        self._index_file.close()
+        self._hashes.close()
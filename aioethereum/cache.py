@@ -0,0 +1,273 @@
+import abc
+import asyncio
+import copy
+import dbm
+from collections import OrderedDict
+
+try:
+    from abc import ABC
+except ImportError:
+    class ABC(metaclass=abc.ABCMeta):
+        pass
+
+try:
+    import ujson as json  # noqa
+except ImportError:
+    import json
+
+from .constants import BLOCK_TAGS
+
+
+# results which never change once they are not empty
+_BY_HASH_METHODS = (
+    'eth_getBlockByHash',
+    'eth_getBlockTransactionCountByHash',
+    'eth_getTransactionByBlockHashAndIndex',
+    'eth_getTransactionReceipt',
+    'eth_getUncleByBlockHashAndIndex',
+    'eth_getUncleCountByBlockHash',
+)
+# results which never change when last param is block number
+_AT_BLOCK_METHODS = (
+    'eth_call',
+    'eth_getBalance',
+    'eth_getCode',
+    'eth_getStorageAt',
+    'eth_getTransactionCount',
+)
+
+
+def cache_key(method, params):
+    """Build key of rpc call for cache.
+    """
+    return json.dumps([method, params], sort_keys=True)
+
+
+def is_cacheable(method, params):
+    """Check whether result of rpc call can be cached.
+    """
+    if method in _BY_HASH_METHODS or method == 'eth_getTransactionByHash':
+        return True
+    if method in _AT_BLOCK_METHODS:
+        return bool(params) and params[-1] not in BLOCK_TAGS
+    return False
+
+
+def copy_result(result):
+    """Copy result shared by many callers, so one of them can not change
+    what the others get.
+    """
+    if isinstance(result, (dict, list)):
+        return copy.deepcopy(result)
+    return result
+
+
+def is_cacheable_result(method, result):
+    """Check whether result of cacheable rpc call is final.
+    """
+    if result is None:
+        return False
+    if method == 'eth_getTransactionByHash':
+        # pending transaction is not in block yet
+        return result.get('blockHash') is not None
+    return True
+
+
+class BaseCache(ABC):
+    """Abstract storage of serialized rpc results.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+    @abc.abstractmethod
+    def _get(self, key):
+        pass
+
+    @abc.abstractmethod
+    def set(self, key, value):
+        """Store serialized result.
+
+        :param key: Key of rpc call
+        :type key: str
+
+        :param value: Serialized result
+        :type value: str
+        """
+
+    def get(self, key):
+        """Get serialized result.
+
+        :param key: Key of rpc call
+        :type key: str
+
+        :return: serialized result or None
+        :rtype: str
+        """
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def close(self):
+        """Release resources of the cache.
+        """
+
+
+class LRUCache(BaseCache):
+    """In-memory cache which evicts least recently used results.
+
+    :param max_items: Max amount of results
+    :type max_items: int
+
+    :param max_bytes: Max total size of serialized results
+    :type max_bytes: int
+
+    :return: :class:`LRUCache` instance.
+    """
+
+    def __init__(self, max_items=10000, max_bytes=64 * 1024 * 1024):
+        super().__init__()
+        self._max_items = max_items
+        self._max_bytes = max_bytes
+        self._data = OrderedDict()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def _get(self, key):
+        value = self._data.get(key)
+        if value is not None:
+            self._data.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        size = len(key) + len(value)
+        if size > self._max_bytes:
+            return
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.nbytes -= len(key) + len(old)
+        self._data[key] = value
+        self.nbytes += size
+        while (len(self._data) > self._max_items or
+               self.nbytes > self._max_bytes):
+            old_key, old = self._data.popitem(last=False)
+            self.nbytes -= len(old_key) + len(old)
+
+
+class DiskCache(BaseCache):
+    """Persistent cache in :mod:`dbm` database, has no size limit.
+
+    :param path: Path to database file
+    :type path: str
+
+    :return: :class:`DiskCache` instance.
+    """
+
+    def __init__(self, path):
+        super().__init__()
+        self._db = dbm.open(path, 'c')
+
+    def _get(self, key):
+        value = self._db.get(key.encode('utf-8'))
+        if value is not None:
+            return value.decode('utf-8')
+
+    def set(self, key, value):
+        self._db[key.encode('utf-8')] = value.encode('utf-8')
+
+    def close(self):
+        self._db.close()
+
+
+class TTLCache:
+    """In-memory cache of results which depend on the chain head.
+
+    Result lives for configured amount of seconds for its method and all
+    results are dropped when new block number is observed. Results are
+    copied when they are stored and returned.
+
+    :param ttl: Time to live of results in seconds by method, e.g.
+                ``{'eth_blockNumber': 1, 'eth_gasPrice': 5}``
+    :type ttl: dict
+
+    :param max_items: Max amount of results
+    :type max_items: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`TTLCache` instance.
+    """
+
+    def __init__(self, ttl, max_items=10000, *, loop=None):
+        self._ttl = dict(ttl)
+        self._max_items = max_items
+        self._loop = loop or asyncio.get_event_loop()
+        self._data = OrderedDict()
+        self.block_number = None
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, method):
+        return method in self._ttl
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Get result which is not expired yet.
+
+        :param key: Key of rpc call
+        :type key: str
+
+        :return: result or None
+        """
+        entry = self._data.get(key)
+        if entry is not None:
+            if entry[0] > self._loop.time():
+                self.hits += 1
+                return copy_result(entry[1])
+            del self._data[key]
+        self.misses += 1
+
+    def set(self, key, method, value):
+        """Store result of rpc call.
+
+        :param key: Key of rpc call
+        :type key: str
+
+        :param method: RPC node method
+        :type method: str
+
+        :param value: Result of rpc call
+        """
+        if value is None:
+            return
+        self._data.pop(key, None)
+        self._data[key] = (self._loop.time() + self._ttl[method],
+                           copy_result(value))
+        while len(self._data) > self._max_items:
+            self._data.popitem(last=False)
+
+    def observe_block(self, number):
+        """Drop all results when block number differs from the last one.
+
+        :param number: Block number
+        :type number: int or str
+        """
+        if number != self.block_number:
+            if self.block_number is not None:
+                self._data.clear()
+            self.block_number = number
+
+    def clear(self):
+        """Drop all results.
+        """
+        self._data.clear()
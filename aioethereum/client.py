@@ -1,8 +1,9 @@
 import logging
 import asyncio
+import random
 import warnings
 import abc
-import sys
+from collections import OrderedDict
 from urllib.parse import urlparse
 
 try:
@@ -27,19 +28,211 @@ except ImportError:
 
 from .errors import BadResponseError, BadStatusError, BadJsonError
 from .management import RpcMixin
+from .batch import BatchRequest
+from .cache import (
+    cache_key,
+    copy_result,
+    is_cacheable,
+    is_cacheable_result,
+    TTLCache,
+)
+from .constants import READ_ONLY_METHODS, STREAM_PATHS
+from .coalesce import Coalescer
+from .jsonstream import JSONStreamParser, ResultStream
 
 
 logger = logging.getLogger('asyncio_client')
 
 
-_reconnect_times = 3
+CONNECTION_LOST = 'disconnected'
+CONNECTION_RESTORED = 'reconnected'
+
+
+def _get_error(response):
+    return BadResponseError(response['error']['message'],
+                            response['error']['code'])
+
+
+def _get_result(response):
+    try:
+        return response['result']
+    except KeyError:
+        raise _get_error(response)
+
+
+class _ConnectionLost(ConnectionError):
+    pass
+
+
+class _PendingRequests:
+    """Futures of sent requests waiting for response, keyed by request id.
+    """
+
+    def __init__(self, loop):
+        self._loop = loop
+        self._futures = OrderedDict()
+
+    def __len__(self):
+        return len(self._futures)
+
+    def add(self, data):
+        if isinstance(data, list):
+            ids = [item['id'] for item in data]
+        else:
+            ids = [data['id']]
+        fut = asyncio.Future(loop=self._loop)
+        for id_ in ids:
+            self._futures[id_] = fut
+        return fut, ids
+
+    def discard(self, ids):
+        for id_ in ids:
+            self._futures.pop(id_, None)
+
+    def _pop(self, fut):
+        for id_ in [id_ for id_, f in self._futures.items() if f is fut]:
+            del self._futures[id_]
+        return fut
+
+    def _pop_oldest(self):
+        if not self._futures:
+            return None
+        return self._pop(next(iter(self._futures.values())))
+
+    def resolve(self, response):
+        if isinstance(response, list):
+            ids = [item.get('id') for item in response
+                   if isinstance(item, dict)]
+        else:
+            ids = [response.get('id')]
+
+        fut = None
+        for id_ in ids:
+            if id_ is not None and id_ in self._futures:
+                fut = self._pop(self._futures[id_])
+                break
+        else:
+            if any(id_ is not None for id_ in ids):
+                # late response of cancelled request
+                logger.debug('Dropped response without waiter: %r', ids)
+                return
+            # node could not parse request, so error has no id
+            fut = self._pop_oldest()
+
+        if fut is not None and not fut.done():
+            fut.set_result(response)
+
+    def fail_oldest(self, exc):
+        fut = self._pop_oldest()
+        if fut is not None and not fut.done():
+            fut.set_exception(exc)
+
+    def fail_all(self, exc):
+        futures, self._futures = self._futures, OrderedDict()
+        for fut in set(futures.values()):
+            if not fut.done():
+                fut.set_exception(exc)
 
 
 class BaseAsyncIOClient(ABC):
     """Abstract class for creating client.
+
+    :param timeout: An optional total time of timeout call
+    :type timeout: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :param coalesce_window: Gather calls issued within this time in seconds
+                            into one batch request (disabled by default)
+    :type coalesce_window: float
+
+    :param coalesce_limit: Max amount of calls in one gathered batch
+    :type coalesce_limit: int
+
+    :param cache: Storage for results which never change, e.g. blocks by
+                  hash or balances at block number (disabled by default)
+    :type cache: :class:`aioethereum.cache.BaseCache`
+
+    :param single_flight: Share one request between identical concurrent
+                          read-only calls
+    :type single_flight: bool
+
+    :param ttl: Time to live of cached results in seconds by method,
+                results are dropped on new block (disabled by default)
+    :type ttl: dict
+
+    :param models: Return blocks, transactions, receipts and logs as
+                   :mod:`aioethereum.models` instances instead of dicts
+    :type models: bool
+
+    :param block_store: Local storage consulted before requesting blocks
+                        by number or hash (disabled by default)
+    :type block_store: :class:`aioethereum.blockstore.BlockStore`
     """
 
+    def __init__(self, timeout=60, *, loop=None, coalesce_window=None,
+                 coalesce_limit=100, cache=None, single_flight=False,
+                 ttl=None, models=False, block_store=None):
+        self._timeout = timeout
+        self.models = models
+        self.block_store = block_store
+        self._id = 1
+        self._loop = loop or asyncio.get_event_loop()
+        self.cache = cache
+        self.ttl_cache = None
+        if ttl:
+            self.ttl_cache = TTLCache(ttl, loop=self._loop)
+        self._inflight = {} if single_flight else None
+        self.coalescer = None
+        if coalesce_window is not None:
+            self.coalescer = Coalescer(self, coalesce_window, coalesce_limit,
+                                       loop=self._loop)
+
     @abc.abstractmethod
+    def _request(self, data):
+        """Send raw RPC 2.0 payload to node server.
+
+        :param data: Request object or list of them for a batch
+        :type data: dict or list
+
+        :return: Decoded response from RPC
+        """
+
+    @asyncio.coroutine
+    def _open_stream(self, data):
+        """Send RPC 2.0 request and give access to the raw response body.
+
+        :param data: Request object
+        :type data: dict
+
+        By default the whole response is received by :meth:`_request`
+        and read from memory, clients override it to parse response while
+        it is received.
+
+        :return: stream of response body and callback which releases
+                 its connection
+        :rtype: tuple
+        """
+        response = yield from self._request(data)
+        reader = asyncio.StreamReader(loop=self._loop)
+        reader.feed_data(json.dumps(response).encode('utf-8'))
+        reader.feed_eof()
+        return reader, lambda: None
+
+    def _build_request(self, method, params=None, id_=None):
+        if not id_:
+            id_ = self._id
+            self._id += 1
+        return {
+            'jsonrpc': '2.0',
+            'method': method,
+            'params': params or [],
+            'id': id_,
+        }
+
+    @asyncio.coroutine
     def rpc_call(self, method, params=None, id_=None):
         """Implements RPC 2.0 call to node server.
 
@@ -54,6 +247,151 @@ class BaseAsyncIOClient(ABC):
 
         :return: `Response from RPC`
         """
+        params = params or []
+        if id_:
+            return (yield from self._send_call(method, params, id_))
+        if self.cache is not None and is_cacheable(method, params):
+            return (yield from self._cached_call(method, params))
+        if self.ttl_cache is None:
+            return (yield from self._shared_call(method, params))
+
+        if method in self.ttl_cache:
+            return (yield from self._ttl_call(method, params))
+        result = yield from self._shared_call(method, params)
+        if method == 'eth_blockNumber':
+            self.ttl_cache.observe_block(result)
+        return result
+
+    @asyncio.coroutine
+    def _cached_call(self, method, params):
+        key = cache_key(method, params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return json.loads(cached)
+        result = yield from self._shared_call(method, params, key)
+        if is_cacheable_result(method, result):
+            self.cache.set(key, json.dumps(result))
+        return result
+
+    @asyncio.coroutine
+    def _ttl_call(self, method, params):
+        key = cache_key(method, params)
+        result = self.ttl_cache.get(key)
+        if result is None:
+            result = yield from self._shared_call(method, params, key)
+            if method == 'eth_blockNumber':
+                self.ttl_cache.observe_block(result)
+            self.ttl_cache.set(key, method, result)
+        return result
+
+    @asyncio.coroutine
+    def _shared_call(self, method, params, key=None):
+        if self._inflight is None or method not in READ_ONLY_METHODS:
+            return (yield from self._dispatch_call(method, params))
+
+        key = key or cache_key(method, params)
+        fut = self._inflight.get(key)
+        if fut is None:
+            fut = asyncio.ensure_future(self._dispatch_call(method, params),
+                                        loop=self._loop)
+            self._inflight[key] = fut
+            fut.add_done_callback(lambda f: self._inflight.pop(key, None))
+        # one cancelled caller must not cancel the others
+        result = yield from asyncio.shield(fut, loop=self._loop)
+        # every caller gets its own copy of shared result
+        return copy_result(result)
+
+    @asyncio.coroutine
+    def _dispatch_call(self, method, params):
+        if self.coalescer is not None:
+            return (yield from self.coalescer.call(method, params))
+        return (yield from self._send_call(method, params))
+
+    @asyncio.coroutine
+    def _send_call(self, method, params=None, id_=None):
+        data = self._build_request(method, params, id_)
+        response = yield from self._request(data)
+        return _get_result(response)
+
+    @asyncio.coroutine
+    def rpc_stream(self, method, params=None, path=None, chunk_size=65536):
+        """Implements RPC 2.0 call which result is parsed while it is
+        received, so huge results, e.g. traces or logs, are not kept in
+        memory at once.
+
+        .. code:: python
+
+            stream = yield from client.rpc_stream(
+                'debug_traceTransaction', [tx_hash])
+            async for struct_log in stream:
+                print(struct_log['op'])
+
+        :param method: RPC node method
+        :type method: str
+
+        :param params: Input params for method
+        :type params: list
+
+        :param path: Keys leading to the array or object of items in
+                     response (optional, ``STREAM_PATHS`` of method or
+                     ``('result',)`` by default)
+        :type path: tuple
+
+        :param chunk_size: Max size of response chunk read at once
+        :type chunk_size: int
+
+        :return: :class:`aioethereum.jsonstream.ResultStream` instance.
+        """
+        if path is None:
+            path = STREAM_PATHS.get(method, ('result',))
+        reader, close = yield from self._open_stream(
+            self._build_request(method, params))
+        return ResultStream(reader, close, JSONStreamParser(path),
+                            self._timeout, chunk_size, loop=self._loop)
+
+    @asyncio.coroutine
+    def rpc_batch(self, calls):
+        """Implements RPC 2.0 batch call to node server.
+
+        All calls are sent in one request, failed items do not raise but
+        are returned in place as :class:`BadResponseError` instances.
+
+        :param calls: Pairs of RPC node method and its params
+        :type calls: list
+
+        :return: `Responses from RPC in order of calls`
+        :rtype: list
+        """
+        requests = [self._build_request(method, params)
+                    for method, params in calls]
+        if not requests:
+            return []
+
+        response = yield from self._request(requests)
+        if not isinstance(response, list):
+            # node rejected the whole batch
+            _get_result(response)
+            raise BadJsonError('Invalid received json from node.')
+
+        responses = {item.get('id'): item for item in response}
+        results = []
+        for request in requests:
+            item = responses.get(request['id'])
+            if item is None:
+                results.append(BadResponseError(
+                    'No response for batch item.', None))
+            elif 'result' in item:
+                results.append(item['result'])
+            else:
+                results.append(_get_error(item))
+        return results
+
+    def batch(self):
+        """Create builder of batch request over RPC management methods.
+
+        :return: :class:`aioethereum.batch.BatchRequest` instance.
+        """
+        return BatchRequest(self)
 
     @asyncio.coroutine
     def _call(self, method, params=None, id_=None):
@@ -61,10 +399,27 @@ class BaseAsyncIOClient(ABC):
                       'in v0.3.0', DeprecationWarning)
         return (yield from self.rpc_call(method, params, id_))
 
+    @asyncio.coroutine
+    def close(self):
+        """Close underlying connections of the client.
+        """
+
+    @asyncio.coroutine
+    def __aenter__(self):
+        return self
+
+    @asyncio.coroutine
+    def __aexit__(self, exc_type, exc, tb):
+        yield from self.close()
+
 
 class AsyncIOHTTPClient(BaseAsyncIOClient, RpcMixin):
     """Creates AsyncIOHTTPClient client to communicate via HTTP(s).
 
+    The client keeps one :class:`aiohttp.ClientSession` with a keep-alive
+    connection pool for its whole lifetime, so use :meth:`close` (or
+    ``async with``) when it is not needed anymore.
+
     :param host: Host on ethereum node
     :type host: str
 
@@ -81,17 +436,44 @@ class AsyncIOHTTPClient(BaseAsyncIOClient, RpcMixin):
                  (uses :func:`asyncio.get_event_loop` if not specified).
     :type loop: :ref:`EventLoop<asyncio-event-loop>`
 
+    :param limit: Total number of simultaneous connections in the pool
+                  (0 for unlimited)
+    :type limit: int
+
+    :param limit_per_host: Number of simultaneous connections to the same
+                           endpoint (0 for unlimited)
+    :type limit_per_host: int
+
+    :param keepalive_timeout: Time to keep idle connections alive
+    :type keepalive_timeout: float
+
+    :param use_dns_cache: Cache resolved host addresses
+    :type use_dns_cache: bool
+
+    :param ttl_dns_cache: Time to live of resolved addresses in seconds
+    :type ttl_dns_cache: int
+
+    :param kwargs: Options of :class:`BaseAsyncIOClient`
+
     :return: :class:`AsyncIOHTTPClient` instance.
     """
 
     def __init__(self, host='127.0.0.1', port=8545, tls=False,
-                 timeout=60, *, loop=None):
+                 timeout=60, *, loop=None, limit=100, limit_per_host=0,
+                 keepalive_timeout=30, use_dns_cache=True, ttl_dns_cache=10,
+                 **kwargs):
+        super().__init__(timeout, loop=loop, **kwargs)
         self._host = host
         self._port = port
         self._tls = tls
-        self._timeout = timeout
-        self._id = 1
-        self._loop = loop or asyncio.get_event_loop()
+        self._connector_options = {
+            'limit': limit,
+            'limit_per_host': limit_per_host,
+            'keepalive_timeout': keepalive_timeout,
+            'use_dns_cache': use_dns_cache,
+            'ttl_dns_cache': ttl_dns_cache,
+        }
+        self._session = None
 
     @property
     def _endpoint(self):
@@ -100,75 +482,145 @@ class AsyncIOHTTPClient(BaseAsyncIOClient, RpcMixin):
             scheme += 's'
         return '{0}://{1}:{2}'.format(scheme, self._host, self._port)
 
+    def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(loop=self._loop,
+                                             **self._connector_options)
+            self._session = aiohttp.ClientSession(connector=connector,
+                                                  loop=self._loop)
+        return self._session
+
     @asyncio.coroutine
     def _post(self, data):
-
-        # Newer versions of aiohttp raise TypeError if ClientSession is used
-        # in a "non-async with" statement. This method is a workaround.
-        # See https://www.python.org/dev/peps/pep-0492/#new-syntax
-
-        contextmanager = aiohttp.ClientSession(loop=self._loop)
-        try:
-            session = yield from contextmanager.__aenter__()
-        except AttributeError:
-            session = contextmanager.__enter__()
-        try:
-            with async_timeout.timeout(self._timeout, loop=self._loop):
-                # do not return just yet, the "else" branch needs to run too
-                r = yield from session.post(
-                    url=self._endpoint,
-                    data=json.dumps(data),
-                    headers={'Content-Type': 'application/json'}
-                )
-        except:  # noqa
-            try:
-                exit = yield from contextmanager.__aexit__(*sys.exc_info())
-            except AttributeError:
-                exit = contextmanager.__exit__(*sys.exc_info())
-
-            if not exit:
-                raise
-        else:
-            try:
-                yield from contextmanager.__aexit__(None, None, None)
-            except AttributeError:
-                contextmanager.__exit__(None, None, None)
-        return r
+        session = self._get_session()
+        with async_timeout.timeout(self._timeout, loop=self._loop):
+            return (yield from session.post(
+                url=self._endpoint,
+                data=json.dumps(data),
+                headers={'Content-Type': 'application/json'}
+            ))
 
     @asyncio.coroutine
-    def rpc_call(self, method, params=None, id_=None):
-        params = params or []
-        data = {
-            'jsonrpc': '2.0',
-            'method': method,
-            'params': params,
-            'id': id_ or self._id,
-        }
+    def _request(self, data):
         try:
             r = yield from self._post(data)
         except aiohttp.ClientConnectorError as e:
             raise ConnectionError(e)
 
         if r.status != 200:
+            r.release()
             raise BadStatusError(r.status)
 
         try:
-            response = yield from r.json(loads=json.loads)
+            return (yield from r.json(loads=json.loads))
         except ValueError:
             raise BadJsonError('Invalid received json from node.')
 
-        if not id_:
-            self._id += 1
+    @asyncio.coroutine
+    def _open_stream(self, data):
         try:
-            return response['result']
-        except KeyError:
-            raise BadResponseError(response['error']['message'],
-                                   response['error']['code'])
+            r = yield from self._post(data)
+        except aiohttp.ClientConnectorError as e:
+            raise ConnectionError(e)
+
+        if r.status != 200:
+            r.release()
+            raise BadStatusError(r.status)
+        return r.content, r.release
+
+    @asyncio.coroutine
+    def close(self):
+        """Close the session and all pooled connections.
+        """
+        if self._session is not None and not self._session.closed:
+            yield from self._session.close()
+        self._session = None
+
+
+class _SubscriptionMixin:
+    """Delivery of ``eth_subscription`` notifications to
+    :class:`Subscription` instances, for clients of duplex connections.
+    """
+
+    _max_orphans = 100
+
+    def _init_subscriptions(self):
+        self._subscriptions = {}
+        # notifications which came before subscribe() registered them
+        self._orphans = OrderedDict()
+
+    @staticmethod
+    def _is_notification(message):
+        return (isinstance(message, dict) and
+                message.get('method') == 'eth_subscription')
+
+    def _notify(self, params):
+        result = params['result']
+        if (self.ttl_cache is not None and isinstance(result, dict) and
+                'parentHash' in result):
+            # header of newHeads subscription
+            self.ttl_cache.observe_block(result['number'])
+
+        subscription_id = params['subscription']
+        subscription = self._subscriptions.get(subscription_id)
+        if subscription is not None:
+            subscription._put(params['result'])
+            return
+        self._orphans.setdefault(subscription_id, []).append(
+            params['result'])
+        while len(self._orphans) > self._max_orphans:
+            self._orphans.popitem(last=False)
+
+    def _close_subscriptions(self, exc=None):
+        subscriptions, self._subscriptions = self._subscriptions, {}
+        self._orphans.clear()
+        for subscription in subscriptions.values():
+            subscription._close(exc)
+
+    @asyncio.coroutine
+    def subscribe(self, name, *params, maxsize=1000):
+        """Subscribe to notifications of node.
+
+        .. code:: python
+
+            subscription = yield from client.subscribe(
+                SUBSCRIPTION_NEW_HEADS)
+            async for header in subscription:
+                print(header['number'])
+
+        :param name: Subscription type, see ``SUBSCRIPTIONS``
+        :type name: str
 
+        :param params: Options of subscription, e.g. filter of logs
+        :type params: dict
 
-class AsyncIOIPCClient(BaseAsyncIOClient, RpcMixin):
+        :param maxsize: Max amount of buffered notifications
+        :type maxsize: int
+
+        :return: :class:`Subscription` instance.
+        """
+        subscription_id = yield from self.eth_subscribe(name, *params)
+        subscription = Subscription(self, subscription_id, maxsize,
+                                    loop=self._loop)
+        self._subscriptions[subscription_id] = subscription
+        for item in self._orphans.pop(subscription_id, ()):
+            subscription._put(item)
+        return subscription
+
+
+class AsyncIOIPCClient(_SubscriptionMixin, BaseAsyncIOClient, RpcMixin):
     """Creates AsyncIOIPCClient client to communicate via IPC.
 
+    Requests are pipelined over one connection, responses are matched
+    with waiting calls by request id. The connection also delivers
+    notifications of subscriptions, see :meth:`subscribe`.
+
+    Lost connection is restored in background with exponential backoff
+    and jitter. Meanwhile up to ``replay_size`` requests wait for it
+    within their timeout, read-only requests lost in flight are sent
+    again, other ones fail with :class:`ConnectionError` as node could
+    have received them.
+
     :param reader: Instance of the stream reader
     :type reader: :class:`asyncio.streams.StreamReader`
 
@@ -185,65 +637,577 @@ class AsyncIOIPCClient(BaseAsyncIOClient, RpcMixin):
                  (uses :func:`asyncio.get_event_loop` if not specified).
     :type loop: :ref:`EventLoop<asyncio-event-loop>`
 
+    :param reconnect_delay: Delay before the second attempt to reconnect,
+                            doubled after each failed attempt
+    :type reconnect_delay: float
+
+    :param reconnect_max_delay: Max delay between attempts to reconnect
+    :type reconnect_max_delay: float
+
+    :param replay_size: Max amount of requests waiting for reconnection
+    :type replay_size: int
+
+    :param kwargs: Options of :class:`BaseAsyncIOClient`
+
     :return: :class:`AsyncIOIPCClient` instance.
     """
 
-    def __init__(self, reader, writer, unix_path, timeout=60, *, loop=None):
+    def __init__(self, reader, writer, unix_path, timeout=60, *, loop=None,
+                 reconnect_delay=0.1, reconnect_max_delay=30.0,
+                 replay_size=1000, **kwargs):
+        super().__init__(timeout, loop=loop, **kwargs)
         self._reader = reader
         self._writer = writer
-        self._timeout = timeout
         self._unix_path = unix_path
-        self._id = 1
-        self._loop = loop or asyncio.get_event_loop()
-        self._lock = asyncio.Semaphore(1, loop=self._loop)
+        self._pending = _PendingRequests(self._loop)
+        self._init_subscriptions()
+        self._reader_task = None
+        self._reconnect_delay = reconnect_delay
+        self._reconnect_max_delay = reconnect_max_delay
+        self._replay_size = replay_size
+        self._waiting = 0
+        self._connected = asyncio.Event(loop=self._loop)
+        self._connected.set()
+        self._supervisor = None
+        self._closed = False
+        self._listeners = []
+        self.stats = {'disconnects': 0, 'reconnects': 0,
+                      'failed_attempts': 0, 'replayed': 0, 'rejected': 0}
+
+    def add_connection_listener(self, callback):
+        """Add callback of connection state, it is called with
+        ``CONNECTION_LOST`` or ``CONNECTION_RESTORED`` and :attr:`stats`.
+
+        :param callback: Function called on connection change
+        :type callback: callable
+        """
+        self._listeners.append(callback)
+
+    def _emit(self, event):
+        for callback in self._listeners:
+            try:
+                callback(event, self.stats)
+            except Exception:
+                logger.exception('Connection listener failed.')
+
+    def _ensure_reader(self):
+        if self._reader_task is None or self._reader_task.done():
+            self._reader_task = asyncio.ensure_future(
+                self._read_responses(self._reader), loop=self._loop)
 
     @asyncio.coroutine
-    def rpc_call(self, method, params=None, id_=None):
-        params = params or []
-        data = {
-            'jsonrpc': '2.0',
-            'method': method,
-            'params': params,
-            'id': id_ or self._id,
-        }
-        with (yield from self._lock):
-            self._writer.write(json.dumps(data).encode('utf-8'))
-            b = yield from self._reader.readline()
+    def _read_responses(self, reader):
+        # Works while there are requests in flight or subscriptions, so
+        # the reader is started again by the next request.
+        while ((self._pending or self._subscriptions) and
+               reader is self._reader):
+            try:
+                b = yield from reader.readline()
+            except (OSError, ValueError) as e:
+                logger.warning('Failed to read from %s: %s',
+                               self._unix_path, e)
+                b = b''
             if not b:
-                tried = 0
-                while True:
-                    try:
-                        new_client = yield from create_ethereum_client(
-                            self._unix_path, self._timeout)
-                    except Exception:
-                        tried += 1
-                        if tried == _reconnect_times:
-                            raise ConnectionError('Didn\'t receive any data, '
-                                                  'connection refused.')
-                    else:
-                        break
-                self._id = new_client._id
-                self._reader = new_client._reader
-                self._writer = new_client._writer
-                self._lock = new_client._lock
-                return (yield from self.rpc_call(method, params, id_))
+                self._connection_lost(reader)
+                self._pending.fail_all(_ConnectionLost(
+                    'Didn\'t receive any data.'))
+                return
+            try:
+                response = json.loads(b.decode('utf-8'))
+            except ValueError:
+                self._pending.fail_oldest(
+                    BadJsonError('Invalid received json from node.'))
+            else:
+                if self._is_notification(response):
+                    self._notify(response['params'])
+                else:
+                    self._pending.resolve(response)
+
+    def _connection_lost(self, reader):
+        if (reader is not self._reader or not self._connected.is_set() or
+                self._closed):
+            return
+        self._connected.clear()
+        self.stats['disconnects'] += 1
+        # node drops subscriptions of closed connection
+        self._close_subscriptions(ConnectionError('Connection is lost.'))
+        logger.warning('Connection to %s is lost.', self._unix_path)
+        self._emit(CONNECTION_LOST)
+        self._supervisor = asyncio.ensure_future(self._supervise(),
+                                                 loop=self._loop)
+
+    def _backoff(self, attempt):
+        delay = min(self._reconnect_delay * 2 ** attempt,
+                    self._reconnect_max_delay)
+        # jitter spreads reconnections of many clients after node restart
+        return delay * random.uniform(0.5, 1.0)
+
+    @asyncio.coroutine
+    def _supervise(self):
+        attempt = 0
+        while True:
+            try:
+                reader, writer = yield from asyncio.open_unix_connection(
+                    urlparse(self._unix_path).path, loop=self._loop)
+            except OSError as e:
+                self.stats['failed_attempts'] += 1
+                delay = self._backoff(attempt)
+                attempt += 1
+                logger.debug('Reconnection to %s failed: %s, next attempt '
+                             'in %.2f seconds.', self._unix_path, e, delay)
+                yield from asyncio.sleep(delay, loop=self._loop)
+            else:
+                break
+        self._writer.close()
+        self._reader = reader
+        self._writer = writer
+        self._supervisor = None
+        self.stats['reconnects'] += 1
+        logger.info('Connection to %s is restored.', self._unix_path)
+        self._connected.set()
+        self._emit(CONNECTION_RESTORED)
+
+    @asyncio.coroutine
+    def _wait_connected(self):
+        if not self._connected.is_set():
+            if self._waiting >= self._replay_size:
+                self.stats['rejected'] += 1
+                raise ConnectionError('Too many requests wait for '
+                                      'reconnection.')
+            self._waiting += 1
+            try:
+                yield from self._connected.wait()
+            finally:
+                self._waiting -= 1
+        if self._closed:
+            raise ConnectionError('Client is closed.')
 
+    @asyncio.coroutine
+    def _request(self, data):
+        if isinstance(data, list):
+            replayable = all(item['method'] in READ_ONLY_METHODS
+                             for item in data)
+        else:
+            replayable = data['method'] in READ_ONLY_METHODS
+        with async_timeout.timeout(self._timeout, loop=self._loop):
+            while True:
+                yield from self._wait_connected()
+                reader = self._reader
+                fut, ids = self._pending.add(data)
+                try:
+                    self._writer.write(json.dumps(data).encode('utf-8'))
+                    self._ensure_reader()
+                    return (yield from fut)
+                except _ConnectionLost:
+                    self._connection_lost(reader)
+                    if not replayable:
+                        raise ConnectionError('Connection is lost, request '
+                                              'could be received by node.')
+                    self.stats['replayed'] += 1
+                finally:
+                    self._pending.discard(ids)
+
+    @asyncio.coroutine
+    def subscribe(self, name, *params, maxsize=1000):
+        """Subscribe to notifications of node, they are delivered while
+        connection is alive.
+
+        :param name: Subscription type, see ``SUBSCRIPTIONS``
+        :type name: str
+
+        :param params: Options of subscription, e.g. filter of logs
+        :type params: dict
+
+        :param maxsize: Max amount of buffered notifications
+        :type maxsize: int
+
+        :return: :class:`Subscription` instance.
+        """
+        subscription = yield from super().subscribe(name, *params,
+                                                    maxsize=maxsize)
+        # reader could stop after the response, keep it for notifications
+        self._ensure_reader()
+        return subscription
+
+    @asyncio.coroutine
+    def _open_stream(self, data):
+        # own connection, so pipelined responses are not mixed into it
+        reader, writer = yield from asyncio.open_unix_connection(
+            urlparse(self._unix_path).path, loop=self._loop)
+        writer.write(json.dumps(data).encode('utf-8'))
+        return reader, writer.close
+
+    @asyncio.coroutine
+    def close(self):
+        """Close the unix socket connection.
+        """
+        self._closed = True
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            self._supervisor = None
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+        self._pending.fail_all(ConnectionError('Client is closed.'))
+        self._close_subscriptions(ConnectionError('Client is closed.'))
+        # wake up requests waiting for reconnection
+        self._connected.set()
+        self._writer.close()
+
+
+class AsyncIOIPCPool(BaseAsyncIOClient, RpcMixin):
+    """Creates AsyncIOIPCPool client which spreads requests over several
+    unix socket connections.
+
+    Node serves requests of one IPC connection mostly in order, several
+    connections let it use more cores. Request is sent by the connected
+    :class:`AsyncIOIPCClient` with the least requests in flight. When each
+    of them has at least ``pool_busy`` requests in flight, one more
+    connection is opened in background, up to ``pool_maxsize``.
+    Disconnected ones are skipped until they are restored.
+
+    :param unix_path: Path to unix socket
+    :type unix_path: str
+
+    :param timeout: An optional total time of timeout call
+    :type timeout: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :param pool_size: Amount of connections opened at start
+    :type pool_size: int
+
+    :param pool_maxsize: Max amount of connections
+    :type pool_maxsize: int
+
+    :param pool_busy: Amount of requests in flight of connection after
+                      which pool grows
+    :type pool_busy: int
+
+    :param connection_options: Options of :class:`AsyncIOIPCClient`
+                               connections, e.g. ``reconnect_delay``
+    :type connection_options: dict
+
+    :param kwargs: Options of :class:`BaseAsyncIOClient`
+
+    :return: :class:`AsyncIOIPCPool` instance.
+    """
+
+    def __init__(self, unix_path, timeout=60, *, loop=None, pool_size=1,
+                 pool_maxsize=None, pool_busy=4, connection_options=None,
+                 **kwargs):
+        if pool_maxsize is None:
+            pool_maxsize = pool_size
+        if not 1 <= pool_size <= pool_maxsize:
+            raise ValueError('Invalid pool size.')
+        super().__init__(timeout, loop=loop, **kwargs)
+        self._unix_path = unix_path
+        self._pool_size = pool_size
+        self._pool_maxsize = pool_maxsize
+        self._pool_busy = pool_busy
+        self._connection_options = connection_options or {}
+        self._listeners = []
+        self._growing = None
+        self._closed = False
+        self.connections = []
+
+    def __len__(self):
+        return len(self.connections)
+
+    def add_connection_listener(self, callback):
+        """Add callback of connection state of every connection, see
+        :meth:`AsyncIOIPCClient.add_connection_listener`.
+
+        :param callback: Function called on connection change
+        :type callback: callable
+        """
+        self._listeners.append(callback)
+        for connection in self.connections:
+            connection.add_connection_listener(callback)
+
+    @asyncio.coroutine
+    def _open(self):
+        reader, writer = yield from asyncio.open_unix_connection(
+            urlparse(self._unix_path).path, loop=self._loop)
+        connection = AsyncIOIPCClient(reader, writer, self._unix_path,
+                                      self._timeout, loop=self._loop,
+                                      **self._connection_options)
+        for callback in self._listeners:
+            connection.add_connection_listener(callback)
+        if self._closed:
+            yield from connection.close()
+            raise ConnectionError('Client is closed.')
+        self.connections.append(connection)
+        return connection
+
+    @asyncio.coroutine
+    def _connect(self):
         try:
-            response = json.loads(b.decode('utf-8'))
-        except ValueError:
-            raise BadJsonError('Invalid received json from node.')
+            for _ in range(self._pool_size):
+                yield from self._open()
+        except Exception:
+            yield from self.close()
+            raise
 
-        if not id_:
-            self._id += 1
+    @asyncio.coroutine
+    def _grow(self):
+        try:
+            yield from self._open()
+            logger.debug('IPC pool of %s grew to %d connections.',
+                         self._unix_path, len(self.connections))
+        except Exception as e:
+            logger.warning('Failed to open connection to %s: %r.',
+                           self._unix_path, e)
+        finally:
+            self._growing = None
+
+    def _choose(self):
+        connections = [connection for connection in self.connections
+                       if connection._connected.is_set()]
+        if not connections:
+            # every connection is restoring, request waits for one
+            connections = self.connections
+        if not connections:
+            raise ConnectionError('Client is closed.')
+        connection = min(connections,
+                         key=lambda connection: len(connection._pending))
+        if (len(connection._pending) >= self._pool_busy and
+                len(self.connections) < self._pool_maxsize and
+                self._growing is None and not self._closed):
+            self._growing = asyncio.ensure_future(self._grow(),
+                                                  loop=self._loop)
+        return connection
+
+    @asyncio.coroutine
+    def _request(self, data):
+        return (yield from self._choose()._request(data))
+
+    @asyncio.coroutine
+    def _open_stream(self, data):
+        return (yield from self._choose()._open_stream(data))
+
+    @asyncio.coroutine
+    def subscribe(self, name, *params, maxsize=1000):
+        """Subscribe to notifications of node by one of connections, see
+        :meth:`AsyncIOIPCClient.subscribe`.
+
+        :return: :class:`Subscription` instance.
+        """
+        return (yield from self._choose().subscribe(name, *params,
+                                                    maxsize=maxsize))
+
+    @property
+    def stats(self):
+        """Statistics of connections summed up.
+
+        :rtype: dict
+        """
+        stats = {'connections': len(self.connections),
+                 'in_flight': 0, 'disconnected': 0}
+        for connection in self.connections:
+            stats['in_flight'] += len(connection._pending)
+            if not connection._connected.is_set():
+                stats['disconnected'] += 1
+            for key, value in connection.stats.items():
+                stats[key] = stats.get(key, 0) + value
+        return stats
+
+    @asyncio.coroutine
+    def close(self):
+        """Close all unix socket connections.
+        """
+        self._closed = True
+        if self._growing is not None:
+            self._growing.cancel()
+            self._growing = None
+        connections, self.connections = self.connections, []
+        for connection in connections:
+            yield from connection.close()
+
+
+class Subscription:
+    """Async iterator over notifications of ``eth_subscribe``.
+
+    Created by :meth:`AsyncIOWSClient.subscribe` or
+    :meth:`AsyncIOIPCClient.subscribe`, when consumer is slower than node
+    and ``maxsize`` notifications are buffered, the oldest ones are
+    dropped.
+
+    :param client: Client which owns subscription
+    :type client: :class:`AsyncIOWSClient` or :class:`AsyncIOIPCClient`
+
+    :param subscription_id: Id of subscription on node
+    :type subscription_id: str
+
+    :param maxsize: Max amount of buffered notifications (0 for unlimited)
+    :type maxsize: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`Subscription` instance.
+    """
+
+    def __init__(self, client, subscription_id, maxsize=1000, *, loop=None):
+        self.id = subscription_id
+        self._client = client
+        self._loop = loop or asyncio.get_event_loop()
+        self._queue = asyncio.Queue(loop=self._loop)
+        self._maxsize = maxsize
+        self._closed = False
+
+    def _put(self, item):
+        if self._maxsize and self._queue.qsize() >= self._maxsize:
+            self._queue.get_nowait()
+            logger.warning('Subscription %s overflowed, dropped oldest '
+                           'notification.', self.id)
+        self._queue.put_nowait(item)
+
+    def _close(self, exc=None):
+        if not self._closed:
+            self._closed = True
+            self._queue.put_nowait(exc)
+
+    @asyncio.coroutine
+    def get(self):
+        """Wait for next notification.
+
+        :return: notification result
+        :raises ConnectionError: when connection to node is lost
+        :raises LookupError: when subscription is closed
+        """
+        if self._closed and self._queue.empty():
+            raise LookupError('Subscription is closed.')
+        item = yield from self._queue.get()
+        if item is None:
+            raise LookupError('Subscription is closed.')
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    def __aiter__(self):
+        return self
+
+    @asyncio.coroutine
+    def __anext__(self):
         try:
-            return response['result']
-        except KeyError:
-            raise BadResponseError(response['error']['message'],
-                                   response['error']['code'])
+            return (yield from self.get())
+        except LookupError:
+            raise StopAsyncIteration
+
+    @asyncio.coroutine
+    def unsubscribe(self):
+        """Cancel subscription on node and stop iteration.
+
+        :rtype: bool
+        """
+        self._client._subscriptions.pop(self.id, None)
+        self._close()
+        return (yield from self._client.eth_unsubscribe(self.id))
+
+
+class AsyncIOWSClient(_SubscriptionMixin, BaseAsyncIOClient, RpcMixin):
+    """Creates AsyncIOWSClient client to communicate via websocket.
+
+    Requests are multiplexed over one connection, which also delivers
+    notifications of subscriptions, see :meth:`subscribe`.
+
+    :param url: Websocket url of ethereum node
+    :type url: str
+
+    :param timeout: An optional total time of timeout call
+    :type timeout: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :param kwargs: Options of :class:`BaseAsyncIOClient`
+
+    :return: :class:`AsyncIOWSClient` instance.
+    """
+
+    def __init__(self, url, timeout=60, *, loop=None, **kwargs):
+        super().__init__(timeout, loop=loop, **kwargs)
+        self._url = url
+        self._session = None
+        self._ws = None
+        self._reader_task = None
+        self._connect_lock = asyncio.Lock(loop=self._loop)
+        self._pending = _PendingRequests(self._loop)
+        self._init_subscriptions()
+
+    @asyncio.coroutine
+    def _connect(self):
+        with (yield from self._connect_lock):
+            if self._ws is None or self._ws.closed:
+                if self._session is None:
+                    self._session = aiohttp.ClientSession(loop=self._loop)
+                try:
+                    with async_timeout.timeout(self._timeout,
+                                               loop=self._loop):
+                        self._ws = yield from self._session.ws_connect(
+                            self._url)
+                except aiohttp.ClientError as e:
+                    raise ConnectionError(e)
+                self._reader_task = asyncio.ensure_future(
+                    self._read_messages(self._ws), loop=self._loop)
+            return self._ws
+
+    @asyncio.coroutine
+    def _read_messages(self, ws):
+        while True:
+            msg = yield from ws.receive()
+            if msg.type != aiohttp.WSMsgType.TEXT:
+                if msg.type == aiohttp.WSMsgType.BINARY:
+                    continue
+                break
+            try:
+                message = json.loads(msg.data)
+            except ValueError:
+                self._pending.fail_oldest(
+                    BadJsonError('Invalid received json from node.'))
+                continue
+            if self._is_notification(message):
+                self._notify(message['params'])
+            else:
+                self._pending.resolve(message)
+
+        exc = ConnectionError('Websocket connection is closed.')
+        self._pending.fail_all(exc)
+        self._close_subscriptions(exc)
+
+    @asyncio.coroutine
+    def _request(self, data):
+        ws = yield from self._connect()
+        fut, ids = self._pending.add(data)
+        try:
+            sent = ws.send_str(json.dumps(data))
+            if sent is not None:
+                # coroutine since aiohttp 3.0
+                yield from sent
+            with async_timeout.timeout(self._timeout, loop=self._loop):
+                return (yield from fut)
+        finally:
+            self._pending.discard(ids)
+
+    @asyncio.coroutine
+    def close(self):
+        """Close websocket connection and stop all subscriptions.
+        """
+        if self._ws is not None:
+            yield from self._ws.close()
+        if self._reader_task is not None:
+            yield from asyncio.wait([self._reader_task], loop=self._loop)
+        if self._session is not None:
+            yield from self._session.close()
+        self._ws = self._session = self._reader_task = None
 
 
 @asyncio.coroutine
-def create_ethereum_client(uri, timeout=60, *, loop=None):
+def create_ethereum_client(uri, timeout=60, *, loop=None, **kwargs):
     """Create client to ethereum node based on schema.
 
     :param uri: Host on ethereum node
@@ -256,21 +1220,37 @@ def create_ethereum_client(uri, timeout=60, *, loop=None):
                  (uses :func:`asyncio.get_event_loop` if not specified).
     :type loop: :ref:`EventLoop<asyncio-event-loop>`
 
+    :param kwargs: Extra options for the client constructor, e.g.
+                   connection pool settings of :class:`AsyncIOHTTPClient`,
+                   ``pool_size`` or ``pool_maxsize`` of ipc uri creates
+                   :class:`AsyncIOIPCPool`
+
     :return: :class:`BaseAsyncIOClient` instance.
     """
     if loop is None:
         loop = asyncio.get_event_loop()
 
     presult = urlparse(uri)
-    if presult.scheme in ('ipc', 'unix'):
+    if presult.scheme in ('ipc', 'unix') and (
+            'pool_size' in kwargs or 'pool_maxsize' in kwargs):
+        client = AsyncIOIPCPool(uri, timeout, loop=loop, **kwargs)
+        yield from client._connect()
+        return client
+    elif presult.scheme in ('ipc', 'unix'):
         reader, writer = yield from asyncio.open_unix_connection(presult.path,
                                                                  loop=loop)
-        return AsyncIOIPCClient(reader, writer, uri, timeout, loop=loop)
+        return AsyncIOIPCClient(reader, writer, uri, timeout, loop=loop,
+                                **kwargs)
     elif presult.scheme in ('http', 'https'):
         tls = presult.scheme[-1] == 's'
         netloc = presult.netloc.split(':')
         host = netloc.pop(0)
         port = netloc.pop(0) if netloc else (443 if tls else 80)
-        return AsyncIOHTTPClient(host, port, tls, timeout, loop=loop)
+        return AsyncIOHTTPClient(host, port, tls, timeout, loop=loop,
+                                 **kwargs)
+    elif presult.scheme in ('ws', 'wss'):
+        client = AsyncIOWSClient(uri, timeout, loop=loop, **kwargs)
+        yield from client._connect()
+        return client
     else:
         raise RuntimeError('This scheme does not supported.')
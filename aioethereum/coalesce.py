@@ -0,0 +1,116 @@
+import asyncio
+from collections import Counter
+
+from .errors import BadResponseError
+
+
+class Coalescer:
+    """Gathers rpc calls issued within short window into one batch.
+
+    Each caller still receives its own result or exception.
+
+    :param client: Client used to send batches
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :param window: Time to wait for other calls in seconds
+    :type window: float
+
+    :param limit: Max amount of calls in one batch, batch is sent
+                  immediately when reached
+    :type limit: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`Coalescer` instance.
+    """
+
+    def __init__(self, client, window=0.002, limit=100, *, loop=None):
+        self._client = client
+        self._window = window
+        self._limit = limit
+        self._loop = loop or asyncio.get_event_loop()
+        self._calls = []
+        self._handle = None
+        self._sizes = Counter()
+
+    @property
+    def stats(self):
+        """Statistics of sent batches.
+
+        :return: amount of calls and batches, max and mean batch size and
+                 amount of batches per size
+        :rtype: dict
+        """
+        calls = sum(size * count for size, count in self._sizes.items())
+        batches = sum(self._sizes.values())
+        return {
+            'calls': calls,
+            'batches': batches,
+            'max_size': max(self._sizes) if self._sizes else 0,
+            'mean_size': calls / batches if batches else 0.0,
+            'sizes': dict(self._sizes),
+        }
+
+    @asyncio.coroutine
+    def call(self, method, params=None):
+        """Queue rpc call into the current batch and wait for its result.
+
+        :param method: RPC node method
+        :type method: str
+
+        :param params: Input params for method
+        :type params: list
+
+        :return: `Response from RPC`
+        """
+        fut = asyncio.Future(loop=self._loop)
+        self._calls.append((method, params, fut))
+        if len(self._calls) >= self._limit:
+            self.flush()
+        elif self._handle is None:
+            self._handle = self._loop.call_later(self._window, self.flush)
+        return (yield from fut)
+
+    def flush(self):
+        """Send queued calls without waiting for the window end.
+        """
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        calls, self._calls = self._calls, []
+        if calls:
+            self._sizes[len(calls)] += 1
+            asyncio.ensure_future(self._send(calls), loop=self._loop)
+
+    @asyncio.coroutine
+    def _send(self, calls):
+        if len(calls) == 1:
+            method, params, fut = calls[0]
+            try:
+                result = yield from self._client._send_call(method, params)
+            except Exception as e:
+                if not fut.done():
+                    fut.set_exception(e)
+            else:
+                if not fut.done():
+                    fut.set_result(result)
+            return
+
+        try:
+            results = yield from self._client.rpc_batch(
+                [(method, params) for method, params, _ in calls])
+        except Exception as e:
+            for _, _, fut in calls:
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+
+        for (_, _, fut), result in zip(calls, results):
+            if fut.done():
+                continue
+            if isinstance(result, BadResponseError):
+                fut.set_exception(result)
+            else:
+                fut.set_result(result)
@@ -6,3 +6,64 @@ BLOCK_TAGS = (
     BLOCK_TAG_LATEST,
     BLOCK_TAG_PENDING,
 )
+
+SUBSCRIPTION_NEW_HEADS = 'newHeads'
+SUBSCRIPTION_LOGS = 'logs'
+SUBSCRIPTION_NEW_PENDING_TRANSACTIONS = 'newPendingTransactions'
+SUBSCRIPTION_SYNCING = 'syncing'
+SUBSCRIPTIONS = (
+    SUBSCRIPTION_NEW_HEADS,
+    SUBSCRIPTION_LOGS,
+    SUBSCRIPTION_NEW_PENDING_TRANSACTIONS,
+    SUBSCRIPTION_SYNCING,
+)
+
+# methods which do not change state of node, so they can be repeated
+READ_ONLY_METHODS = frozenset((
+    'eth_accounts',
+    'eth_blockNumber',
+    'eth_call',
+    'eth_coinbase',
+    'eth_estimateGas',
+    'eth_gasPrice',
+    'eth_getBalance',
+    'eth_getBlockByHash',
+    'eth_getBlockByNumber',
+    'eth_getBlockTransactionCountByHash',
+    'eth_getBlockTransactionCountByNumber',
+    'eth_getCode',
+    'eth_getFilterLogs',
+    'eth_getLogs',
+    'eth_getStorageAt',
+    'eth_getTransactionByBlockHashAndIndex',
+    'eth_getTransactionByBlockNumberAndIndex',
+    'eth_getTransactionByHash',
+    'eth_getTransactionCount',
+    'eth_getTransactionReceipt',
+    'eth_getUncleByBlockHashAndIndex',
+    'eth_getUncleByBlockNumberAndIndex',
+    'eth_getUncleCountByBlockHash',
+    'eth_getUncleCountByBlockNumber',
+    'eth_hashrate',
+    'eth_mining',
+    'eth_protocolVersion',
+    'eth_syncing',
+    'net_listening',
+    'net_peerCount',
+    'net_version',
+    'txpool_content',
+    'txpool_inspect',
+    'txpool_status',
+    'web3_clientVersion',
+    'web3_sha3',
+))
+
+# keys leading to items of big results streamed by rpc_stream()
+STREAM_PATHS = {
+    'debug_traceBlockByHash': ('result',),
+    'debug_traceBlockByNumber': ('result',),
+    'debug_traceTransaction': ('result', 'structLogs'),
+    'eth_getFilterLogs': ('result',),
+    'eth_getLogs': ('result',),
+    'txpool_content': ('result', 'pending'),
+}
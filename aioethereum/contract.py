@@ -0,0 +1,189 @@
+import asyncio
+import binascii
+
+from .abi import canonical_type, get_codec, selector, signature
+from .constants import BLOCK_TAG_LATEST
+
+
+def _types(items):
+    return [canonical_type(item['type'], item.get('components'))
+            for item in items or ()]
+
+
+class ContractFunction:
+    """Compiled ABI function with precomputed selector and codecs of
+    inputs and outputs.
+
+    :param entry: Function entry of ABI JSON
+    :type entry: dict
+    """
+
+    def __init__(self, entry):
+        self.name = entry['name']
+        self.signature = signature(entry)
+        self.selector = selector(self.signature)
+        self.input_types = _types(entry.get('inputs'))
+        self.output_types = _types(entry.get('outputs'))
+        self._inputs = get_codec('({0})'.format(','.join(self.input_types)))
+        self._outputs = get_codec('({0})'.format(
+            ','.join(self.output_types)))
+        self._prefix = '0x' + binascii.hexlify(self.selector).decode('ascii')
+
+    def encode_input(self, *args):
+        """Encode call data.
+
+        :return: hex data of call
+        :rtype: str
+        """
+        return self._prefix + binascii.hexlify(
+            self._inputs.encode(args)).decode('ascii')
+
+    def decode_output(self, data):
+        """Decode result of call.
+
+        :param data: Result of ``eth_call``
+        :type data: str or bytes
+
+        :return: single value, or tuple when function has several outputs
+        :raises ValueError: when data does not match outputs
+        """
+        if isinstance(data, str):
+            data = binascii.unhexlify(data[2:])
+        values = self._outputs.decode(data, 0)
+        if len(values) == 1:
+            return values[0]
+        return values
+
+
+_FUNCTIONS = {}
+
+
+def _compile(entry):
+    # contracts sharing ABI share compiled functions
+    key = (signature(entry), tuple(_types(entry.get('outputs'))))
+    function = _FUNCTIONS.get(key)
+    if function is None:
+        function = _FUNCTIONS[key] = ContractFunction(entry)
+    return function
+
+
+class ContractCall:
+    """Call of contract function with encoded arguments.
+
+    ``data`` can be sent in batch by ``eth_call`` and its result decoded
+    by :meth:`decode`.
+    """
+
+    __slots__ = ('contract', 'function', 'data')
+
+    def __init__(self, contract, function, data):
+        self.contract = contract
+        self.function = function
+        self.data = data
+
+    def decode(self, result):
+        """Decode result of ``eth_call``.
+        """
+        return self.function.decode_output(result)
+
+    @asyncio.coroutine
+    def call(self, block=BLOCK_TAG_LATEST, from_=None):
+        """Execute call by ``eth_call``.
+
+        :param block: Block tag or number (optional)
+        :type block: int or BLOCK_TAGS
+
+        :param from_: From account address (optional)
+        :type from_: str
+
+        :return: decoded result
+        """
+        result = yield from self.contract.client.eth_call(
+            from_, self.contract.address, data=self.data, block=block)
+        return self.decode(result)
+
+
+class _BoundFunction:
+
+    __slots__ = ('_contract', '_functions')
+
+    def __init__(self, contract, functions):
+        self._contract = contract
+        self._functions = functions
+
+    def __call__(self, *args):
+        functions = [function for function in self._functions
+                     if len(function.input_types) == len(args)]
+        if len(functions) != 1:
+            raise TypeError('Function is ambiguous or arguments do not '
+                            'match, use signature to select it.')
+        function = functions[0]
+        return ContractCall(self._contract, function,
+                            function.encode_input(*args))
+
+
+class ContractFunctions:
+    """Functions of contract by name, overloaded ones by signature too.
+    """
+
+    def __init__(self, contract, entries):
+        by_name = {}
+        self._by_signature = {}
+        for entry in entries:
+            function = _compile(entry)
+            by_name.setdefault(function.name, []).append(function)
+            self._by_signature[function.signature] = _BoundFunction(
+                contract, [function])
+        self._by_name = {name: _BoundFunction(contract, functions)
+                         for name, functions in by_name.items()}
+
+    def __getattr__(self, name):
+        try:
+            return self._by_name[name]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, name):
+        if name in self._by_signature:
+            return self._by_signature[name]
+        return self._by_name[name]
+
+    def __iter__(self):
+        return iter(self._by_name)
+
+
+class Contract:
+    """Contract with functions compiled from ABI.
+
+    .. code:: python
+
+        token = Contract(client, address, abi)
+        balance = yield from token.functions.balanceOf(owner).call()
+
+        # many calls in one batch
+        calls = [token.functions.balanceOf(owner) for owner in owners]
+        batch = client.batch()
+        for call in calls:
+            batch.eth_call(None, token.address, data=call.data)
+        balances = [call.decode(result) for call, result
+                    in zip(calls, (yield from batch.execute()))]
+
+    :param client: Client used to call functions
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :param address: Contract address
+    :type address: str
+
+    :param abi: ABI JSON
+    :type abi: list
+
+    :return: :class:`Contract` instance.
+    """
+
+    def __init__(self, client, address, abi):
+        self.client = client
+        self.address = address
+        self.abi = abi
+        self.functions = ContractFunctions(
+            self, [entry for entry in abi
+                   if entry.get('type', 'function') == 'function'])
@@ -0,0 +1,180 @@
+import binascii
+
+try:
+    from Crypto.Hash import keccak as _keccak
+except ImportError:
+    _keccak = None
+
+try:
+    import coincurve
+except ImportError:
+    coincurve = None
+
+
+# pure python keccak is used when pycryptodome is not installed, it is
+# correct but much slower
+
+_ROUND_CONSTANTS = (
+    0x0000000000000001, 0x0000000000008082, 0x800000000000808A,
+    0x8000000080008000, 0x000000000000808B, 0x0000000080000001,
+    0x8000000080008081, 0x8000000000008009, 0x000000000000008A,
+    0x0000000000000088, 0x0000000080008009, 0x000000008000000A,
+    0x000000008000808B, 0x800000000000008B, 0x8000000000008089,
+    0x8000000000008003, 0x8000000000008002, 0x8000000000000080,
+    0x000000000000800A, 0x800000008000000A, 0x8000000080008081,
+    0x8000000000008080, 0x0000000080000001, 0x8000000080008008,
+)
+_ROTATIONS = (
+    (0, 36, 3, 41, 18),
+    (1, 44, 10, 45, 2),
+    (62, 6, 43, 15, 61),
+    (28, 55, 25, 21, 56),
+    (27, 20, 39, 8, 14),
+)
+_MASK = (1 << 64) - 1
+_RATE = 136
+
+
+def _rotate(value, shift):
+    return ((value << shift) | (value >> (64 - shift))) & _MASK
+
+
+def _keccak_f(state):
+    for constant in _ROUND_CONSTANTS:
+        c = [state[x][0] ^ state[x][1] ^ state[x][2] ^ state[x][3] ^
+             state[x][4] for x in range(5)]
+        d = [c[x - 1] ^ _rotate(c[(x + 1) % 5], 1) for x in range(5)]
+        state = [[state[x][y] ^ d[x] for y in range(5)] for x in range(5)]
+
+        b = [[0] * 5 for _ in range(5)]
+        for x in range(5):
+            for y in range(5):
+                shift = _ROTATIONS[x][y]
+                b[y][(2 * x + 3 * y) % 5] = (
+                    _rotate(state[x][y], shift) if shift else state[x][y])
+
+        state = [[b[x][y] ^ (~b[(x + 1) % 5][y] & b[(x + 2) % 5][y])
+                  for y in range(5)] for x in range(5)]
+        state[0][0] ^= constant
+    return state
+
+
+def _keccak256(data):
+    data = bytearray(data)
+    padding = _RATE - len(data) % _RATE
+    data += b'\x00' * padding
+    data[len(data) - padding] ^= 0x01
+    data[-1] ^= 0x80
+
+    state = [[0] * 5 for _ in range(5)]
+    for offset in range(0, len(data), _RATE):
+        block = data[offset:offset + _RATE]
+        for i in range(_RATE // 8):
+            state[i % 5][i // 5] ^= int.from_bytes(block[i * 8:i * 8 + 8],
+                                                   'little')
+        state = _keccak_f(state)
+    return b''.join(state[i % 5][i // 5].to_bytes(8, 'little')
+                    for i in range(4))
+
+
+def keccak256(data):
+    """Keccak-256 hash used by ethereum (not NIST SHA3-256).
+
+    :param data: Data to hash
+    :type data: bytes
+
+    :rtype: bytes
+    """
+    if _keccak is not None:
+        return _keccak.new(data=data, digest_bits=256).digest()
+    return _keccak256(data)
+
+
+# order of secp256k1 curve
+_N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+
+
+def _coincurve():
+    if coincurve is None:
+        raise RuntimeError('coincurve is required for signing, install '
+                           'aioethereum[crypto].')
+    return coincurve
+
+
+def _private_key(private_key):
+    curve = _coincurve()
+    if isinstance(private_key, str):
+        private_key = bytes.fromhex(private_key[2:]
+                                    if private_key.startswith('0x')
+                                    else private_key)
+    if len(private_key) != 32:
+        raise ValueError('Private key must be 32 bytes.')
+    if not 0 < int.from_bytes(private_key, 'big') < _N:
+        raise ValueError('Invalid private key.')
+    return curve.PrivateKey(private_key)
+
+
+def sign(msg_hash, private_key):
+    """Sign 32 bytes hash by secp256k1 key.
+
+    :param msg_hash: Hash of message
+    :type msg_hash: bytes
+
+    :param private_key: Private key, bytes or hex string
+    :type private_key: bytes or str
+
+    :return: recovery id (0 or 1), r and s of low-s signature
+    :rtype: tuple
+    :raises RuntimeError: when coincurve is not installed
+    """
+    signature = _private_key(private_key).sign_recoverable(msg_hash,
+                                                           hasher=None)
+    return (signature[64], int.from_bytes(signature[:32], 'big'),
+            int.from_bytes(signature[32:64], 'big'))
+
+
+def _address(public_key):
+    return '0x' + binascii.hexlify(keccak256(public_key)[-20:]).decode()
+
+
+def private_key_to_address(private_key):
+    """Get account address of private key.
+
+    :param private_key: Private key, bytes or hex string
+    :type private_key: bytes or str
+
+    :return: address
+    :rtype: str
+    :raises RuntimeError: when coincurve is not installed
+    """
+    return _address(_private_key(private_key).public_key.format(
+        compressed=False)[1:])
+
+
+def recover_address(msg_hash, recovery, r, s):
+    """Get account address which signed hash.
+
+    :param msg_hash: Hash of message
+    :type msg_hash: bytes
+
+    :param recovery: Recovery id (0 or 1)
+    :type recovery: int
+
+    :param r: r of signature
+    :type r: int
+
+    :param s: s of signature
+    :type s: int
+
+    :return: address
+    :rtype: str
+    :raises ValueError: when signature is invalid
+    :raises RuntimeError: when coincurve is not installed
+    """
+    if not (0 < r < _N and 0 < s < _N and recovery in (0, 1, 2, 3)):
+        raise ValueError('Invalid signature.')
+    signature = (r.to_bytes(32, 'big') + s.to_bytes(32, 'big') +
+                 bytes((recovery,)))
+    public_key = _coincurve().PublicKey.from_signature_and_message(
+        signature, msg_hash, hasher=None)
+    return _address(public_key.format(compressed=False)[1:])
@@ -16,3 +16,7 @@ class BadStatusError(EthereumError):
 
 class BadJsonError(EthereumError):
     pass
+
+
+class ChainReorgError(EthereumError):
+    pass
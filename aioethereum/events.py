@@ -0,0 +1,212 @@
+import asyncio
+import binascii
+from collections import namedtuple
+
+from .abi import _Tuple, canonical_type, get_codec, signature
+from .crypto import keccak256
+from .models import Log
+
+
+DecodedEvent = namedtuple('DecodedEvent',
+                          ('name', 'signature', 'args', 'log'))
+
+
+def _to_bytes(value):
+    if isinstance(value, bytes):
+        return value
+    return binascii.unhexlify(value[2:])
+
+
+class EventABI:
+    """Compiled ABI event with codecs of indexed and data params.
+
+    Indexed params of dynamic types, arrays and tuples are hashed by node,
+    their value is the topic bytes.
+
+    :param entry: Event entry of ABI JSON
+    :type entry: dict
+    """
+
+    def __init__(self, entry):
+        if entry.get('anonymous'):
+            raise ValueError('Anonymous event has no topic to be found by.')
+        self.name = entry['name']
+        self.signature = signature(entry)
+        self.topic = keccak256(self.signature.encode('ascii'))
+        self.indexed = []
+        names = []
+        types = []
+        for index, item in enumerate(entry.get('inputs', ())):
+            name = item.get('name') or '_{0}'.format(index)
+            abi_type = canonical_type(item['type'], item.get('components'))
+            if item.get('indexed'):
+                codec = get_codec(abi_type)
+                if codec.dynamic or isinstance(codec, _Tuple):
+                    codec = None
+                self.indexed.append((name, codec))
+            else:
+                names.append(name)
+                types.append(abi_type)
+        self._data_names = tuple(names)
+        self._data = get_codec('({0})'.format(','.join(types)))
+
+    @property
+    def key(self):
+        """Topic and amount of topics of event, events with the same
+        signature differ by amount of indexed params.
+        """
+        return self.topic, len(self.indexed) + 1
+
+    def decode(self, topics, data):
+        """Decode params of log.
+
+        :param topics: Topics of log as bytes
+        :type topics: list
+
+        :param data: Data of log
+        :type data: bytes
+
+        :return: values by param name
+        :rtype: dict
+        """
+        args = {}
+        for (name, codec), topic in zip(self.indexed, topics[1:]):
+            args[name] = topic if codec is None else codec.decode(topic, 0)
+        args.update(zip(self._data_names, self._data.decode(data, 0)))
+        return args
+
+
+class EventDecoder:
+    """Registry of events indexed by topic which decodes logs and
+    dispatches them to handlers.
+
+    .. code:: python
+
+        decoder = EventDecoder()
+        decoder.register_abi(token_abi, address=token)
+        decoder.on('Transfer', handle_transfer)
+        logs = yield from client.eth_getLogs(start, end, token)
+        yield from decoder.dispatch(logs)
+
+    Logs of :class:`aioethereum.models.Log` models are decoded from their
+    bytes fields without conversion to hex.
+    """
+
+    def __init__(self):
+        # (topic, amount of topics) -> event
+        self._events = {}
+        # (address, topic, amount of topics) -> event
+        self._contract_events = {}
+        self._handlers = {}
+
+    def register(self, entry, address=None):
+        """Register event.
+
+        :param entry: Event entry of ABI JSON
+        :type entry: dict
+
+        :param address: Decode only logs of the contract (optional)
+        :type address: str
+
+        :return: :class:`EventABI` instance.
+        """
+        event = EventABI(entry)
+        if address is None:
+            self._events[event.key] = event
+        else:
+            self._contract_events[(address.lower(),) + event.key] = event
+        return event
+
+    def register_abi(self, abi, address=None):
+        """Register non-anonymous events of ABI JSON.
+
+        :param abi: ABI JSON
+        :type abi: list
+
+        :param address: Decode only logs of the contract (optional)
+        :type address: str
+        """
+        for entry in abi:
+            if entry.get('type') == 'event' and not entry.get('anonymous'):
+                self.register(entry, address)
+
+    def on(self, name, handler):
+        """Add handler of event.
+
+        :param name: Name or signature of event
+        :type name: str
+
+        :param handler: Coroutine function called with
+                        :class:`DecodedEvent`
+        :type handler: callable
+        """
+        self._handlers[name] = self._handlers.get(name, ()) + (handler,)
+
+    def _find(self, address, key):
+        if self._contract_events and address is not None:
+            event = self._contract_events.get((address.lower(),) + key)
+            if event is not None:
+                return event
+        return self._events.get(key)
+
+    def decode(self, log):
+        """Decode log.
+
+        :param log: Log of ``eth_getLogs`` or filters
+        :type log: dict or :class:`aioethereum.models.Log`
+
+        :return: :class:`DecodedEvent` or None for unknown event
+        :raises ValueError: when log does not match event ABI
+        """
+        if isinstance(log, Log):
+            topics = log.topics
+        else:
+            topics = log['topics']
+        if not topics:
+            return None
+        event = self._find(log.get('address'),
+                           (_to_bytes(topics[0]), len(topics)))
+        if event is None:
+            return None
+        if isinstance(log, Log):
+            data = log.data
+        else:
+            # unknown events are skipped before conversion of the rest
+            topics = [_to_bytes(topic) for topic in topics]
+            data = _to_bytes(log['data'])
+        return DecodedEvent(event.name, event.signature,
+                            event.decode(topics, data), log)
+
+    def decode_many(self, logs):
+        """Decode logs, unknown events are skipped.
+
+        :param logs: Logs
+        :type logs: list
+
+        :rtype: list of :class:`DecodedEvent`
+        """
+        decode = self.decode
+        events = []
+        for log in logs:
+            event = decode(log)
+            if event is not None:
+                events.append(event)
+        return events
+
+    @asyncio.coroutine
+    def dispatch(self, logs):
+        """Decode logs and call handlers of events in order of logs.
+
+        :param logs: Logs
+        :type logs: list
+
+        :return: amount of decoded events
+        :rtype: int
+        """
+        events = self.decode_many(logs)
+        handlers = self._handlers
+        for event in events:
+            for handler in (handlers.get(event.name, ()) +
+                            handlers.get(event.signature, ())):
+                yield from handler(event)
+        return len(events)
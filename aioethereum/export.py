@@ -0,0 +1,350 @@
+import argparse
+import asyncio
+import logging
+import os
+import sys
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+try:
+    import ujson as json  # noqa
+except ImportError:
+    import json
+
+from .client import create_ethereum_client
+from .utils import hex_to_dec
+
+
+logger = logging.getLogger('asyncio_client')
+
+
+FORMAT_PARQUET = 'parquet'
+FORMAT_ARROW = 'arrow'
+FORMATS = (
+    FORMAT_PARQUET,
+    FORMAT_ARROW,
+)
+
+# column types, big numbers do not fit into uint64 and stay hex strings
+_INT = 'int'
+_STR = 'str'
+_LIST = 'list'
+
+BLOCK_COLUMNS = (
+    ('number', _INT),
+    ('hash', _STR),
+    ('parentHash', _STR),
+    ('miner', _STR),
+    ('timestamp', _INT),
+    ('size', _INT),
+    ('gasLimit', _INT),
+    ('gasUsed', _INT),
+    ('baseFeePerGas', _STR),
+    ('difficulty', _STR),
+    ('extraData', _STR),
+)
+TRANSACTION_COLUMNS = (
+    ('hash', _STR),
+    ('blockNumber', _INT),
+    ('transactionIndex', _INT),
+    ('from', _STR),
+    ('to', _STR),
+    ('value', _STR),
+    ('gas', _INT),
+    ('gasPrice', _STR),
+    ('nonce', _INT),
+    ('input', _STR),
+    ('type', _INT),
+)
+RECEIPT_COLUMNS = (
+    ('transactionHash', _STR),
+    ('blockNumber', _INT),
+    ('transactionIndex', _INT),
+    ('status', _INT),
+    ('gasUsed', _INT),
+    ('cumulativeGasUsed', _INT),
+    ('effectiveGasPrice', _STR),
+    ('contractAddress', _STR),
+)
+LOG_COLUMNS = (
+    ('blockNumber', _INT),
+    ('transactionHash', _STR),
+    ('transactionIndex', _INT),
+    ('logIndex', _INT),
+    ('address', _STR),
+    ('topics', _LIST),
+    ('data', _STR),
+)
+
+
+def _convert(kind, value):
+    if kind == _INT and value is not None:
+        return hex_to_dec(value)
+    return value
+
+
+class _Table:
+    """Rows of one table collected by columns.
+    """
+
+    def __init__(self, name, columns):
+        self.name = name
+        self.columns = columns
+        self._data = {column: [] for column, _ in columns}
+        self.rows = 0
+
+    def append(self, item):
+        for column, kind in self.columns:
+            self._data[column].append(_convert(kind, item.get(column)))
+        self.rows += 1
+
+    def to_arrow(self):
+        types = {_INT: pa.uint64(), _STR: pa.string(),
+                 _LIST: pa.list_(pa.string())}
+        schema = pa.schema([(column, types[kind])
+                            for column, kind in self.columns])
+        return pa.Table.from_pydict(self._data, schema=schema)
+
+
+class Exporter:
+    """Exports range of blocks with their transactions, receipts and logs
+    to columnar files.
+
+    Range is processed by chunks of blocks, each chunk is written to its
+    own file per table (``<table>/<first>-<last>.<format>``) and then
+    ``checkpoint.json`` is updated, so interrupted export continues after
+    the last written chunk.
+
+    .. code:: python
+
+        exporter = Exporter(client, 'dump', 5000000, 5100000)
+        report = yield from exporter.run()
+
+    :param client: Client used to fetch blocks
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :param path: Output directory
+    :type path: str
+
+    :param start: Number of the first block
+    :type start: int
+
+    :param end: Number of the last block (optional, head by default)
+    :type end: int
+
+    :param format: Format of files, see ``FORMATS``
+    :type format: str
+
+    :param concurrency: Max amount of blocks fetched at once
+    :type concurrency: int
+
+    :param chunk_size: Amount of blocks in one file
+    :type chunk_size: int
+
+    :param row_group_size: Max amount of rows in parquet row group or arrow
+                           record batch
+    :type row_group_size: int
+
+    :param receipts: Export receipts and logs
+    :type receipts: bool
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`Exporter` instance.
+    """
+
+    def __init__(self, client, path, start=0, end=None,
+                 format=FORMAT_PARQUET, concurrency=10, chunk_size=1000,
+                 row_group_size=100000, receipts=True, *, loop=None):
+        if pa is None:
+            raise RuntimeError('pyarrow is required for export.')
+        if format not in FORMATS:
+            raise ValueError('Invalid format.')
+        self._client = client
+        self._path = path
+        self._start = start
+        self._end = end
+        self._format = format
+        self._chunk_size = max(chunk_size, 1)
+        self._row_group_size = row_group_size
+        self._receipts = receipts
+        self._loop = loop or asyncio.get_event_loop()
+        self._semaphore = asyncio.Semaphore(concurrency, loop=self._loop)
+        self._started = None
+        self.stats = {'blocks': 0, 'transactions': 0, 'receipts': 0,
+                      'logs': 0}
+
+    @property
+    def _checkpoint_path(self):
+        return os.path.join(self._path, 'checkpoint.json')
+
+    def _load_checkpoint(self):
+        try:
+            with open(self._checkpoint_path) as f:
+                return json.load(f)['next_block']
+        except FileNotFoundError:
+            return None
+
+    def _save_checkpoint(self, next_block):
+        tmp_path = self._checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump({'next_block': next_block, 'end': self._end}, f)
+        os.replace(tmp_path, self._checkpoint_path)
+
+    @asyncio.coroutine
+    def _fetch(self, number):
+        with (yield from self._semaphore):
+            block = yield from self._client.eth_getBlockByNumber(number, True)
+            if block is None:
+                raise ValueError('Block {0} is not found.'.format(number))
+            receipts = []
+            if self._receipts and block['transactions']:
+                batch = self._client.batch()
+                for tx in block['transactions']:
+                    batch.eth_getTransactionReceipt(tx['hash'])
+                receipts = yield from batch.execute()
+                for receipt in receipts:
+                    if isinstance(receipt, Exception):
+                        raise receipt
+        return block, receipts
+
+    def _write(self, table, first, last):
+        directory = os.path.join(self._path, table.name)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, '{0:012d}-{1:012d}.{2}'.format(
+            first, last, self._format))
+        tmp_path = path + '.tmp'
+        data = table.to_arrow()
+        if self._format == FORMAT_PARQUET:
+            pq.write_table(data, tmp_path,
+                           row_group_size=self._row_group_size)
+        else:
+            with pa.OSFile(tmp_path, 'wb') as sink:
+                writer = pa_ipc.new_file(sink, data.schema)
+                for batch in data.to_batches(self._row_group_size):
+                    writer.write_batch(batch)
+                writer.close()
+        os.replace(tmp_path, path)
+
+    @asyncio.coroutine
+    def _export_chunk(self, first, last):
+        fetches = [asyncio.ensure_future(self._fetch(number),
+                                         loop=self._loop)
+                   for number in range(first, last + 1)]
+        try:
+            results = yield from asyncio.gather(*fetches, loop=self._loop)
+        except BaseException:
+            for fetch in fetches:
+                fetch.cancel()
+            raise
+
+        tables = [_Table('blocks', BLOCK_COLUMNS),
+                  _Table('transactions', TRANSACTION_COLUMNS)]
+        if self._receipts:
+            tables += [_Table('receipts', RECEIPT_COLUMNS),
+                       _Table('logs', LOG_COLUMNS)]
+        for block, receipts in results:
+            tables[0].append(block)
+            for tx in block['transactions']:
+                tables[1].append(tx)
+            for receipt in receipts:
+                tables[2].append(receipt)
+                for log in receipt['logs']:
+                    tables[3].append(log)
+
+        for table in tables:
+            self._write(table, first, last)
+        self._save_checkpoint(last + 1)
+
+        self.stats['blocks'] += tables[0].rows
+        self.stats['transactions'] += tables[1].rows
+        if self._receipts:
+            self.stats['receipts'] += tables[2].rows
+            self.stats['logs'] += tables[3].rows
+        logger.info('Exported blocks %s-%s, %s.', first, last, self.report)
+
+    @property
+    def report(self):
+        """Throughput of the export.
+
+        :return: amount of exported rows per table, elapsed time and
+                 amount of blocks and rows per second
+        :rtype: dict
+        """
+        elapsed = 0.0
+        if self._started is not None:
+            elapsed = self._loop.time() - self._started
+        rows = sum(self.stats.values())
+        report = dict(self.stats)
+        report.update({
+            'seconds': elapsed,
+            'blocks_per_second': self.stats['blocks'] / elapsed
+            if elapsed else 0.0,
+            'rows_per_second': rows / elapsed if elapsed else 0.0,
+        })
+        return report
+
+    @asyncio.coroutine
+    def run(self):
+        """Export the range, starting after the checkpoint if it exists.
+
+        :return: :attr:`report`
+        :rtype: dict
+        """
+        os.makedirs(self._path, exist_ok=True)
+        if self._end is None:
+            self._end = yield from self._client.eth_blockNumber()
+        start = self._start
+        next_block = self._load_checkpoint()
+        if next_block is not None and next_block > start:
+            logger.info('Export continues from block %s.', next_block)
+            start = next_block
+
+        self._started = self._loop.time()
+        for first in range(start, self._end + 1, self._chunk_size):
+            last = min(first + self._chunk_size - 1, self._end)
+            yield from self._export_chunk(first, last)
+        return self.report
+
+
+def main(argv=None):
+    """Entry point of ``aioethereum-export`` command.
+    """
+    parser = argparse.ArgumentParser(
+        description='Export blocks, transactions, receipts and logs of '
+                    'ethereum node to parquet or arrow files.')
+    parser.add_argument('uri', help='uri of ethereum node')
+    parser.add_argument('path', help='output directory')
+    parser.add_argument('start', type=int, help='number of the first block')
+    parser.add_argument('end', type=int, nargs='?',
+                        help='number of the last block (head by default)')
+    parser.add_argument('--format', choices=FORMATS, default=FORMAT_PARQUET)
+    parser.add_argument('--concurrency', type=int, default=10)
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    parser.add_argument('--row-group-size', type=int, default=100000)
+    parser.add_argument('--no-receipts', action='store_true',
+                        help='skip receipts and logs')
+    parser.add_argument('--timeout', type=int, default=60)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    loop = asyncio.get_event_loop()
+    client = loop.run_until_complete(create_ethereum_client(
+        args.uri, args.timeout, loop=loop))
+    try:
+        exporter = Exporter(client, args.path, args.start, args.end,
+                            args.format, args.concurrency, args.chunk_size,
+                            args.row_group_size, not args.no_receipts,
+                            loop=loop)
+        report = loop.run_until_complete(exporter.run())
+    finally:
+        loop.run_until_complete(client.close())
+    json.dump(report, sys.stdout)
+    sys.stdout.write('\n')
@@ -0,0 +1,289 @@
+import asyncio
+import logging
+from collections import deque
+
+from .constants import BLOCK_TAG_LATEST
+from .errors import BadResponseError
+from .utils import hex_to_dec
+
+
+logger = logging.getLogger('asyncio_client')
+
+
+FILTER_LOGS = 'logs'
+FILTER_BLOCKS = 'blocks'
+FILTER_PENDING = 'pending'
+
+
+def _is_filter_missing(exc):
+    if not isinstance(exc, BadResponseError):
+        return False
+    msg = str(exc.msg).lower()
+    return 'filter' in msg and 'not found' in msg
+
+
+def _item_key(item):
+    if isinstance(item, str):
+        return item
+    return item['blockHash'], item['logIndex']
+
+
+class ManagedFilter:
+    """Async iterator over changes of filter owned by
+    :class:`FilterManager`.
+
+    Yields logs of log filters, hashes of blocks or of pending
+    transactions.
+    """
+
+    def __init__(self, manager, kind, address=None, topics=None):
+        self.kind = kind
+        self.address = address
+        self.topics = topics
+        self.filter_id = None
+        self._manager = manager
+        self._items = deque()
+        self._event = asyncio.Event(loop=manager._loop)
+        self._closed = False
+        # last block which changes are received for
+        self._last_block = None
+        # keys of items fetched after re-installation
+        self._refilled = None
+
+    def __aiter__(self):
+        return self
+
+    @asyncio.coroutine
+    def __anext__(self):
+        try:
+            return (yield from self.get())
+        except LookupError:
+            raise StopAsyncIteration
+
+    def _push(self, items):
+        if self._refilled is not None:
+            # filter re-installed in the middle of block may repeat them
+            refilled, self._refilled = self._refilled, None
+            items = [item for item in items
+                     if _item_key(item) not in refilled]
+        if items:
+            self._items.extend(items)
+            self._event.set()
+
+    @asyncio.coroutine
+    def get(self):
+        """Wait for the next change.
+
+        :return: log or hash
+        :raises LookupError: when filter is closed
+        """
+        while not self._items:
+            if self._closed:
+                raise LookupError('Filter is closed.')
+            self._event.clear()
+            yield from self._event.wait()
+        return self._items.popleft()
+
+    @asyncio.coroutine
+    def close(self):
+        """Uninstall filter, changes received before are still yielded.
+        """
+        yield from self._manager._remove(self)
+
+
+class FilterManager:
+    """Owns many filters and polls all of them by one batch request.
+
+    Filters expired on the node are installed again, missed logs are
+    fetched by ``eth_getLogs`` and missed blocks by
+    ``eth_getBlockByNumber``, pending transactions of the gap can not be
+    recovered. Polling stops when there are no filters.
+
+    .. code:: python
+
+        filters = client.filter_manager(poll_interval=1)
+        transfers = yield from filters.new_filter(address=token,
+                                                  topics=[TRANSFER])
+        blocks = yield from filters.new_block_filter()
+        async for log in transfers:
+            save(log)
+
+    :param client: Client used to poll filters
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :param poll_interval: Time between polls in seconds
+    :type poll_interval: float
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`FilterManager` instance.
+    """
+
+    def __init__(self, client, poll_interval=1.0, *, loop=None):
+        self._client = client
+        self._poll_interval = poll_interval
+        self._loop = loop or asyncio.get_event_loop()
+        self._filters = []
+        self._task = None
+
+    def __len__(self):
+        return len(self._filters)
+
+    @asyncio.coroutine
+    def _install(self, managed):
+        client = self._client
+        if managed.kind == FILTER_LOGS:
+            managed.filter_id = yield from client.eth_newFilter(
+                BLOCK_TAG_LATEST, BLOCK_TAG_LATEST, managed.address,
+                managed.topics)
+        elif managed.kind == FILTER_BLOCKS:
+            managed.filter_id = yield from client.eth_newBlockFilter()
+        else:
+            managed.filter_id = (
+                yield from client.eth_newPendingTransactionFilter())
+
+    @asyncio.coroutine
+    def _add(self, managed):
+        yield from self._install(managed)
+        if managed.kind != FILTER_PENDING:
+            managed._last_block = yield from self._client.eth_blockNumber()
+        self._filters.append(managed)
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._poll(), loop=self._loop)
+        return managed
+
+    @asyncio.coroutine
+    def new_filter(self, address=None, topics=None):
+        """Install filter of new logs.
+
+        :param address: Contract address (optional)
+        :type address: str
+
+        :param topics: Topics (optional)
+        :type topics: list
+
+        :return: :class:`ManagedFilter` instance.
+        """
+        return (yield from self._add(
+            ManagedFilter(self, FILTER_LOGS, address, topics)))
+
+    @asyncio.coroutine
+    def new_block_filter(self):
+        """Install filter of new blocks.
+
+        :return: :class:`ManagedFilter` instance.
+        """
+        return (yield from self._add(ManagedFilter(self, FILTER_BLOCKS)))
+
+    @asyncio.coroutine
+    def new_pending_transaction_filter(self):
+        """Install filter of new pending transactions.
+
+        :return: :class:`ManagedFilter` instance.
+        """
+        return (yield from self._add(ManagedFilter(self, FILTER_PENDING)))
+
+    @asyncio.coroutine
+    def _remove(self, managed):
+        if managed._closed:
+            return
+        managed._closed = True
+        managed._event.set()
+        if managed in self._filters:
+            self._filters.remove(managed)
+        try:
+            yield from self._client.eth_uninstallFilter(managed.filter_id)
+        except BadResponseError as e:
+            logger.debug('Filter %s is not uninstalled: %r.',
+                         managed.filter_id, e)
+
+    @asyncio.coroutine
+    def _refill(self, managed, head):
+        start = managed._last_block + 1
+        if start > head:
+            return []
+        client = self._client
+        if managed.kind == FILTER_LOGS:
+            return (yield from client.eth_getLogs(
+                start, head, managed.address, managed.topics))
+        batch = client.batch()
+        for number in range(start, head + 1):
+            batch.eth_getBlockByNumber(number, False)
+        blocks = yield from batch.execute()
+        return [block['hash'] for block in blocks
+                if block is not None and not isinstance(block, Exception)]
+
+    @asyncio.coroutine
+    def _reinstall(self, managed):
+        logger.info('Filter %s is expired, installing again.',
+                    managed.filter_id)
+        yield from self._install(managed)
+        if managed.kind == FILTER_PENDING:
+            return
+        head = yield from self._client.eth_blockNumber()
+        items = yield from self._refill(managed, head)
+        managed._push(items)
+        managed._refilled = {_item_key(item) for item in items}
+        managed._last_block = head
+
+    @asyncio.coroutine
+    def _poll_once(self):
+        filters = list(self._filters)
+        batch = self._client.batch()
+        batch.eth_blockNumber()
+        for managed in filters:
+            batch.eth_getFilterChanges(managed.filter_id)
+        head, *changes = yield from batch.execute()
+        if isinstance(head, Exception):
+            # changes are already taken from the node, so they are pushed
+            logger.warning('Head is not received: %r.', head)
+            head = None
+
+        expired = []
+        for managed, items in zip(filters, changes):
+            if managed._closed:
+                continue
+            if _is_filter_missing(items):
+                expired.append(managed)
+            elif isinstance(items, Exception):
+                logger.warning('Changes of filter %s are not received: %r.',
+                               managed.filter_id, items)
+            else:
+                managed._push(items)
+                if managed.kind == FILTER_PENDING:
+                    continue
+                last = managed._last_block if head is None else head
+                if managed.kind == FILTER_LOGS and items:
+                    # node could add block after eth_blockNumber
+                    last = max(last, max(hex_to_dec(log['blockNumber'])
+                                         for log in items))
+                managed._last_block = max(managed._last_block, last)
+        if expired:
+            yield from asyncio.gather(
+                *[self._reinstall(managed) for managed in expired],
+                loop=self._loop)
+
+    @asyncio.coroutine
+    def _poll(self):
+        while self._filters:
+            try:
+                yield from self._poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning('Filters polling failed: %r.', e)
+            if not self._filters:
+                break
+            yield from asyncio.sleep(self._poll_interval, loop=self._loop)
+
+    @asyncio.coroutine
+    def close(self):
+        """Uninstall all filters and stop polling.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for managed in list(self._filters):
+            yield from self._remove(managed)
@@ -0,0 +1,328 @@
+import asyncio
+import re
+from collections import deque
+
+import async_timeout
+
+try:
+    import ujson as json  # noqa
+except ImportError:
+    import json
+
+from .errors import BadJsonError, BadResponseError
+
+
+_WHITESPACE = re.compile(rb'\s*')
+_STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.S)
+# rest of string after its opening quote, group matches closing quote
+_STRING_REST = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*(")?', re.S)
+# everything up to the next bracket or unfinished string
+_NOT_BRACKETS = re.compile(rb'(?:[^"{}\[\]]+|'
+                           rb'"[^"\\]*(?:\\.[^"\\]*)*")*', re.S)
+_SCALAR_END = re.compile(rb'[\s,\]}]')
+
+_QUOTE = ord('"')
+_OPEN = (ord('{'), ord('['))
+
+# what parser expects outside of values
+_VALUE = 'value'
+_KEY = 'key'
+_COLON = 'colon'
+_ITEM = 'item'
+_NEXT = 'next'
+_END = 'end'
+
+# what parser does with scanned value
+_SKIP = 'skip'
+_YIELD = 'yield'
+_ERROR = 'error'
+
+
+class JSONStreamParser:
+    """Incremental parser of JSON document which returns items of one
+    array (or key and value pairs of one object) as soon as they are
+    received.
+
+    Only the current item is kept in memory, everything outside ``path``
+    is skipped, except the top-level ``error`` which is stored.
+
+    .. code:: python
+
+        parser = JSONStreamParser(('result', 'structLogs'))
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                print(item['op'])
+
+    :param path: Keys of objects leading to the array or object
+    :type path: tuple
+
+    :return: :class:`JSONStreamParser` instance.
+    """
+
+    def __init__(self, path=('result',)):
+        self.path = tuple(path)
+        self.error = None
+        self.done = False
+        self._buf = bytearray()
+        self._pos = 0
+        # [kind, current key, is target] of containers on the way
+        self._frames = []
+        self._state = _VALUE
+        self._value = None
+        self._start = None
+        self._depth = 0
+        self._in_string = False
+        self._scalar = False
+
+    def feed(self, data):
+        """Parse next chunk of document.
+
+        :param data: Chunk of document
+        :type data: bytes
+
+        :return: items completed by the chunk
+        :rtype: list
+        :raises ValueError: when document is not valid JSON
+        """
+        self._buf += data
+        items = []
+        while self._step(items):
+            pass
+
+        keep = self._pos if self._start is None else self._start
+        if keep:
+            del self._buf[:keep]
+            self._pos -= keep
+            if self._start is not None:
+                self._start -= keep
+        return items
+
+    def _step(self, items):
+        if self._value is not None:
+            if not self._scan_value():
+                return False
+            self._finish_value(items)
+            return True
+
+        buf = self._buf
+        pos = self._pos = _WHITESPACE.match(buf, self._pos).end()
+        if pos >= len(buf) or self._state == _END:
+            return False
+        char = buf[pos:pos + 1]
+        state = self._state
+
+        if state == _VALUE:
+            self._begin_value(char)
+        elif state == _KEY:
+            if char == b'}':
+                self._pop()
+                return True
+            if char != b'"':
+                raise ValueError('Expected key at {0}.'.format(pos))
+            match = _STRING.match(buf, pos)
+            if match is None:
+                return False
+            self._frames[-1][1] = json.loads(match.group().decode('utf-8'))
+            self._pos = match.end()
+            self._state = _COLON
+        elif state == _COLON:
+            if char != b':':
+                raise ValueError('Expected colon at {0}.'.format(pos))
+            self._pos += 1
+            self._state = _VALUE
+        elif state == _ITEM:
+            if char == b']':
+                self._pop()
+            else:
+                self._state = _VALUE
+        elif char == b',':
+            self._pos += 1
+            self._state = _KEY if self._frames[-1][0] == b'{' else _VALUE
+        elif char in (b'}', b']'):
+            self._pop()
+        else:
+            raise ValueError('Expected delimiter at {0}.'.format(pos))
+        return True
+
+    def _pop(self):
+        self._frames.pop()
+        self._pos += 1
+        self._state = _NEXT if self._frames else _END
+        self.done = not self._frames
+
+    def _begin_value(self, char):
+        frames = self._frames
+        if frames and frames[-1][2]:
+            mode = _YIELD
+        else:
+            path = tuple(frame[1] for frame in frames)
+            if path == self.path and char in (b'{', b'['):
+                self._push(char, True)
+                return
+            if (char == b'{' and len(path) < len(self.path) and
+                    self.path[:len(path)] == path):
+                self._push(char, False)
+                return
+            mode = _ERROR if path == ('error',) else _SKIP
+
+        self._value = mode
+        self._start = self._pos if mode != _SKIP else None
+        self._depth = 0
+        self._in_string = char == b'"'
+        self._scalar = not self._in_string and char not in (b'{', b'[')
+        if not self._scalar:
+            self._pos += 1
+            if not self._in_string:
+                self._depth = 1
+
+    def _push(self, char, target):
+        self._frames.append([char, None, target])
+        self._pos += 1
+        self._state = _KEY if char == b'{' else _ITEM
+
+    def _scan_value(self):
+        buf = self._buf
+        pos = self._pos
+        if self._scalar:
+            match = _SCALAR_END.search(buf, pos)
+            if match is None:
+                self._pos = len(buf)
+                return False
+            self._pos = match.start()
+            return True
+
+        while True:
+            if self._in_string:
+                match = _STRING_REST.match(buf, pos)
+                pos = match.end()
+                if match.group(1) is None:
+                    # string continues in the next chunk
+                    self._pos = pos
+                    return False
+                self._in_string = False
+                if not self._depth:
+                    self._pos = pos
+                    return True
+                continue
+
+            pos = _NOT_BRACKETS.match(buf, pos).end()
+            if pos >= len(buf):
+                self._pos = pos
+                return False
+            char = buf[pos]
+            pos += 1
+            if char == _QUOTE:
+                self._in_string = True
+            elif char in _OPEN:
+                self._depth += 1
+            else:
+                self._depth -= 1
+                if not self._depth:
+                    self._pos = pos
+                    return True
+
+    def _finish_value(self, items):
+        mode = self._value
+        if mode != _SKIP:
+            raw = bytes(self._buf[self._start:self._pos]).decode('utf-8')
+            value = json.loads(raw)
+            if mode == _ERROR:
+                self.error = value
+            elif self._frames[-1][0] == b'{':
+                items.append((self._frames[-1][1], value))
+            else:
+                items.append(value)
+        self._value = self._start = None
+        self._state = _NEXT if self._frames else _END
+        self.done = not self._frames
+
+
+class ResultStream:
+    """Async iterator over items of rpc result parsed while the response
+    is being received.
+
+    Created by :meth:`aioethereum.BaseAsyncIOClient.rpc_stream`.
+
+    :param reader: Stream of response body
+    :type reader: :class:`asyncio.StreamReader`
+
+    :param close: Callback which releases connection of response
+    :type close: callable
+
+    :param parser: Parser of response
+    :type parser: :class:`JSONStreamParser`
+
+    :param timeout: Max time to wait for the next chunk of response
+    :type timeout: int
+
+    :param chunk_size: Max size of chunk read at once
+    :type chunk_size: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`ResultStream` instance.
+    """
+
+    def __init__(self, reader, close, parser, timeout=60, chunk_size=65536,
+                 *, loop=None):
+        self._reader = reader
+        self._close = close
+        self._parser = parser
+        self._timeout = timeout
+        self._chunk_size = chunk_size
+        self._loop = loop or asyncio.get_event_loop()
+        self._items = deque()
+
+    def __aiter__(self):
+        return self
+
+    @asyncio.coroutine
+    def __anext__(self):
+        try:
+            return (yield from self.get())
+        except LookupError:
+            raise StopAsyncIteration
+
+    @asyncio.coroutine
+    def _read(self):
+        try:
+            with async_timeout.timeout(self._timeout, loop=self._loop):
+                chunk = yield from self._reader.read(self._chunk_size)
+        except BaseException:
+            self.close()
+            raise
+        if not chunk:
+            self.close()
+            raise BadJsonError('Response is incomplete.')
+        try:
+            self._items.extend(self._parser.feed(chunk))
+        except ValueError:
+            self.close()
+            raise BadJsonError('Invalid received json from node.')
+
+    @asyncio.coroutine
+    def get(self):
+        """Wait for the next item of result.
+
+        :return: item of result, key and value pair for object
+        :raises BadResponseError: when node returned error
+        :raises LookupError: when all items are returned
+        """
+        while not self._items:
+            if self._parser.done:
+                self.close()
+                error = self._parser.error
+                if error is not None:
+                    raise BadResponseError(error['message'], error['code'])
+                raise LookupError('All items are received.')
+            yield from self._read()
+        return self._items.popleft()
+
+    def close(self):
+        """Release connection of response.
+        """
+        if self._close is not None:
+            self._close()
+            self._close = None
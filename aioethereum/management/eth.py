@@ -3,10 +3,20 @@ import asyncio
 
 from ..utils import hex_to_dec, validate_block, ether_to_wei
 from ..constants import BLOCK_TAG_LATEST
+from ..models import Block, Log, Receipt, Transaction
+from ..filters import FilterManager
+from ..streams import BlockStream, LogScanner, ReceiptWatcher
 
 
 class EthMixin:
 
+    def _to_model(self, model, result):
+        if result is None or not getattr(self, 'models', False):
+            return result
+        if isinstance(result, list):
+            return [model(item) for item in result]
+        return model(result)
+
     @asyncio.coroutine
     def eth_protocolVersion(self):
         """https://github.com/ethereum/wiki/wiki/JSON-RPC#eth_protocolversion
@@ -291,7 +301,7 @@ class EthMixin:
                  block=BLOCK_TAG_LATEST):
         """https://github.com/ethereum/wiki/wiki/JSON-RPC#eth_call
 
-        :param from_: From account address
+        :param from_: From account address (``None`` to omit)
         :type from_: str
 
         :param to: To account address (optional)
@@ -316,7 +326,8 @@ class EthMixin:
         """
         block = validate_block(block)
         obj = {}
-        obj['from'] = from_
+        if from_ is not None:
+            obj['from'] = from_
         if to is not None:
             obj['to'] = to
         if gas is not None:
@@ -382,12 +393,16 @@ class EthMixin:
         :type tx_objects: bool
 
         :return: block
-        :rtype: dict or None
+        :rtype: dict or :class:`aioethereum.models.Block` or None
         """
-        result = yield from self.rpc_call('eth_getBlockByHash',
-                                          [bhash, tx_objects])
-        # TODO: Update result response
-        return result
+        store = getattr(self, 'block_store', None)
+        result = None
+        if store is not None:
+            result = store.get_by_hash(bhash, tx_objects)
+        if result is None:
+            result = yield from self.rpc_call('eth_getBlockByHash',
+                                              [bhash, tx_objects])
+        return self._to_model(Block, result)
 
     @asyncio.coroutine
     def eth_getBlockByNumber(self, block=BLOCK_TAG_LATEST, tx_objects=True):
@@ -400,13 +415,17 @@ class EthMixin:
         :type tx_objects: bool
 
         :return: block
-        :rtype: dict or None
+        :rtype: dict or :class:`aioethereum.models.Block` or None
         """
-        block = validate_block(block)
-        result = yield from self.rpc_call('eth_getBlockByNumber',
-                                          [block, tx_objects])
-        # TODO: Update result response
-        return result
+        store = getattr(self, 'block_store', None)
+        result = None
+        if store is not None and isinstance(block, int):
+            result = store.get_by_number(block, tx_objects)
+        if result is None:
+            result = yield from self.rpc_call('eth_getBlockByNumber',
+                                              [validate_block(block),
+                                               tx_objects])
+        return self._to_model(Block, result)
 
     @asyncio.coroutine
     def eth_getTransactionByHash(self, txhash):
@@ -416,11 +435,10 @@ class EthMixin:
         :type txhash: str
 
         :return: transaction
-        :rtype: dict or None
+        :rtype: dict or :class:`aioethereum.models.Transaction` or None
         """
         result = yield from self.rpc_call('eth_getTransactionByHash', [txhash])
-        # TODO: Update result response
-        return result
+        return self._to_model(Transaction, result)
 
     @asyncio.coroutine
     def eth_getTransactionByBlockHashAndIndex(self, bhash, index=0):
@@ -434,8 +452,7 @@ class EthMixin:
         """
         result = yield from self.rpc_call('eth_getTransactionByBlockHashAndIndex',
                                           [bhash, hex(index)])
-        # TODO: Update result response
-        return result
+        return self._to_model(Transaction, result)
 
     @asyncio.coroutine
     def eth_getTransactionByBlockNumberAndIndex(self, block=BLOCK_TAG_LATEST,
@@ -449,13 +466,12 @@ class EthMixin:
         :type index: int
 
         :return: transaction
-        :rtype: dict or None
+        :rtype: dict or :class:`aioethereum.models.Transaction` or None
         """
         block = validate_block(block)
         result = yield from self.rpc_call('eth_getTransactionByBlockNumberAndIndex',
                                           [block, hex(index)])
-        # TODO: Update result response
-        return result
+        return self._to_model(Transaction, result)
 
     @asyncio.coroutine
     def eth_getTransactionReceipt(self, txhash):
@@ -465,12 +481,11 @@ class EthMixin:
         :type txhash: str
 
         :return: transaction
-        :rtype: dict or None
+        :rtype: dict or :class:`aioethereum.models.Receipt` or None
         """
         result = yield from self.rpc_call('eth_getTransactionReceipt',
                                           [txhash])
-        # TODO: Update result response
-        return result
+        return self._to_model(Receipt, result)
 
     @asyncio.coroutine
     def eth_getUncleByBlockHashAndIndex(self, bhash, index=0):
@@ -483,12 +498,11 @@ class EthMixin:
         :type index: int
 
         :return: block
-        :rtype: dict or None
+        :rtype: dict or :class:`aioethereum.models.Block` or None
         """
         result = yield from self.rpc_call('eth_getUncleByBlockHashAndIndex',
                                           [bhash, hex(index)])
-        # TODO: Update result response
-        return result
+        return self._to_model(Block, result)
 
     @asyncio.coroutine
     def eth_getUncleByBlockNumberAndIndex(self, block=BLOCK_TAG_LATEST,
@@ -502,13 +516,12 @@ class EthMixin:
         :type index: int
 
         :return: block
-        :rtype: dict or None
+        :rtype: dict or :class:`aioethereum.models.Block` or None
         """
         block = validate_block(block)
         result = yield from self.rpc_call('eth_getUncleByBlockNumberAndIndex',
                                           [block, hex(index)])
-        # TODO: Update result response
-        return result
+        return self._to_model(Block, result)
 
     @asyncio.coroutine
     def eth_getCompilers(self):
@@ -626,7 +639,8 @@ class EthMixin:
         :return: logs
         :rtype: list
         """
-        return (yield from self.rpc_call('eth_getFilterLogs', [filter_id]))
+        result = yield from self.rpc_call('eth_getFilterLogs', [filter_id])
+        return self._to_model(Log, result)
 
     @asyncio.coroutine
     def eth_getLogs(self, from_block=BLOCK_TAG_LATEST,
@@ -655,7 +669,7 @@ class EthMixin:
             'topics': topics
         }
         result = yield from self.rpc_call('eth_getLogs', [obj])
-        return result
+        return self._to_model(Log, result)
 
     @asyncio.coroutine
     def eth_getWork(self):
@@ -700,3 +714,127 @@ class EthMixin:
         """
         return (yield from self.rpc_call('eth_submitHashrate',
                                          [hex(hashrate), id_]))
+
+    @asyncio.coroutine
+    def eth_subscribe(self, name, *params):
+        """https://github.com/ethereum/go-ethereum/wiki/RPC-PUB-SUB#create-subscription
+
+        Notifications are delivered only over websocket or IPC, see
+        :meth:`aioethereum.AsyncIOWSClient.subscribe` and
+        :meth:`aioethereum.AsyncIOIPCClient.subscribe`.
+
+        :param name: Subscription type
+        :type name: SUBSCRIPTIONS
+
+        :param params: Options of subscription (optional)
+        :type params: dict
+
+        :return: subscription_id
+        :rtype: str
+        """
+        return (yield from self.rpc_call('eth_subscribe',
+                                         [name] + list(params)))
+
+    @asyncio.coroutine
+    def eth_unsubscribe(self, subscription_id):
+        """https://github.com/ethereum/go-ethereum/wiki/RPC-PUB-SUB#cancel-subscription
+
+        :param subscription_id: Id of created subscription
+        :type subscription_id: str
+
+        :return: success
+        :rtype: bool
+        """
+        return (yield from self.rpc_call('eth_unsubscribe',
+                                         [subscription_id]))
+
+    def stream_blocks(self, start=None, confirmations=0, tx_objects=False,
+                      concurrency=10, poll_interval=1.0, max_reorg_depth=64):
+        """Follow the chain with handling of reorganizations.
+
+        :param start: Number of the first block (optional, head by default)
+        :type start: int
+
+        :param confirmations: Amount of blocks on top of yielded block
+        :type confirmations: int
+
+        :param tx_objects: Return txs full object (optional)
+        :type tx_objects: bool
+
+        :param concurrency: Max amount of blocks fetched ahead
+        :type concurrency: int
+
+        :param poll_interval: Time between head checks in seconds
+        :type poll_interval: float
+
+        :param max_reorg_depth: Max amount of blocks which can be rolled back
+        :type max_reorg_depth: int
+
+        :return: :class:`aioethereum.streams.BlockStream` instance.
+        """
+        return BlockStream(self, start, confirmations, tx_objects,
+                           concurrency, poll_interval, max_reorg_depth,
+                           loop=getattr(self, '_loop', None))
+
+    def scan_logs(self, from_block, to_block=BLOCK_TAG_LATEST, address=None,
+                  topics=None, chunk_size=1000, max_chunk_size=100000,
+                  workers=4):
+        """Fetch logs of big block range by concurrent chunked requests.
+
+        :param from_block: Block tag or number
+        :type from_block: int or BLOCK_TAGS
+
+        :param to_block: Block tag or number (optional)
+        :type to_block: int or BLOCK_TAGS
+
+        :param address: Contract address (optional)
+        :type address: str
+
+        :param topics: Topics (optional)
+        :type topics: list
+
+        :param chunk_size: Initial amount of blocks in one request
+        :type chunk_size: int
+
+        :param max_chunk_size: Max amount of blocks in one request
+        :type max_chunk_size: int
+
+        :param workers: Max amount of concurrent requests
+        :type workers: int
+
+        :return: :class:`aioethereum.streams.LogScanner` instance.
+        """
+        return LogScanner(self, from_block, to_block, address, topics,
+                          chunk_size, max_chunk_size, workers,
+                          loop=getattr(self, '_loop', None))
+
+    def watch_receipts(self, confirmations=0, poll_interval=1.0,
+                       batch_size=500):
+        """Wait for receipts of many transactions by shared polling.
+
+        :param confirmations: Default amount of blocks on top of receipt's
+                              block
+        :type confirmations: int
+
+        :param poll_interval: Time between head checks in seconds
+        :type poll_interval: float
+
+        :param batch_size: Max amount of receipts in one batch request
+        :type batch_size: int
+
+        :return: :class:`aioethereum.streams.ReceiptWatcher` instance.
+        """
+        return ReceiptWatcher(self, confirmations, poll_interval,
+                              batch_size, loop=getattr(self, '_loop', None))
+
+    def filter_manager(self, poll_interval=1.0):
+        """Poll many filters by batch requests with installing of expired
+        ones again.
+
+        :param poll_interval: Time between polls in seconds
+        :type poll_interval: float
+
+        :return: :class:`aioethereum.filters.FilterManager` instance.
+        """
+        return FilterManager(self, poll_interval,
+                             loop=getattr(self, '_loop', None))
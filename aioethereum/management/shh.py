@@ -1,6 +1,8 @@
 import warnings
 import asyncio
 
+from ..whisper import WhisperStream
+
 
 class ShhMixin:
 
@@ -103,3 +105,20 @@ class ShhMixin:
         """
         warnings.warn('deprecated', DeprecationWarning)
         return (yield from self.rpc_call('shh_getMessages', [filter_id]))
+
+    def shh_stream(self, poll_interval=1.0, max_size=1000, seen_size=10000):
+        """Receive messages of many filters polled together.
+
+        :param poll_interval: Time between polls in seconds
+        :type poll_interval: float
+
+        :param max_size: Max amount of received messages not consumed yet
+        :type max_size: int
+
+        :param seen_size: Max amount of remembered message hashes
+        :type seen_size: int
+
+        :return: :class:`aioethereum.whisper.WhisperStream` instance.
+        """
+        return WhisperStream(self, poll_interval, max_size, seen_size,
+                             loop=getattr(self, '_loop', None))
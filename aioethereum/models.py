@@ -0,0 +1,269 @@
+import binascii
+import re
+
+from .utils import hex_to_dec
+
+
+def _to_bytes(value):
+    return binascii.unhexlify(value[2:])
+
+
+def _from_bytes(value):
+    return '0x' + binascii.hexlify(value).decode('ascii')
+
+
+def _to_bytes_items(values):
+    return [_to_bytes(value) if isinstance(value, str) else value
+            for value in values]
+
+
+def _from_bytes_items(values):
+    return [_from_bytes(value) if isinstance(value, bytes) else value
+            for value in values]
+
+
+def _dump(value):
+    if isinstance(value, Model):
+        return value.to_dict()
+    if isinstance(value, list):
+        return [_dump(item) for item in value]
+    return value
+
+
+# (decode on access, encode back to json)
+INT = (hex_to_dec, hex)
+BYTES = (_to_bytes, _from_bytes)
+BYTES_ITEMS = (_to_bytes_items, _from_bytes_items)
+RAW = (None, None)
+
+
+def _attribute_name(key):
+    name = re.sub(r'([A-Z])', r'_\1', key).lower()
+    return name + '_' if name == 'from' else name
+
+
+class _ModelMeta(type):
+    """Builds slots and lazy properties from ``fields`` of model.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        fields = namespace.get('fields', ())
+        specs = tuple((key, '_' + _attribute_name(key), 1 << index) +
+                      tuple(field)
+                      for index, (key, *field) in enumerate(fields))
+        namespace['__slots__'] = (tuple(namespace.get('__slots__', ())) +
+                                  tuple(spec[1] for spec in specs))
+        namespace['_specs'] = specs
+        namespace['_keys'] = frozenset(spec[0] for spec in specs)
+        for spec in specs:
+            namespace[_attribute_name(spec[0])] = mcs._property(*spec)
+        return super().__new__(mcs, name, bases, namespace)
+
+    @staticmethod
+    def _property(key, slot, bit, decode, encode, load=None):
+        def getter(self):
+            value = getattr(self, slot)
+            if decode is not None and not self._decoded & bit:
+                if value is not None:
+                    value = decode(value)
+                    setattr(self, slot, value)
+                self._decoded |= bit
+            return value
+        getter.__name__ = key
+        return property(getter, doc='Decoded ``{0}``.'.format(key))
+
+
+class Model(metaclass=_ModelMeta):
+    """Compact read-only view of rpc result object.
+
+    Values are kept as received and decoded on the first access of
+    attribute (snake case of the key, ``from_`` for ``from``), keys which
+    are not described in ``fields`` are kept in ``extra``. Item access by
+    the key returns json value, so model can be used in place of dict.
+    Unlike dict, model is hashable by its hash (transaction hash and index
+    of logs), so it can be a key of dict.
+
+    :param data: Rpc result object
+    :type data: dict
+    """
+
+    __slots__ = ('_decoded', '_absent', 'extra')
+
+    def __init__(self, data):
+        self._decoded = self._absent = 0
+        for key, slot, bit, decode, encode, *load in self._specs:
+            value = data.get(key)
+            if value is None:
+                if key not in data:
+                    self._absent |= bit
+            elif load:
+                value = load[0](value)
+            setattr(self, slot, value)
+        extra = {key: value for key, value in data.items()
+                 if key not in self._keys}
+        self.extra = extra or None
+
+    def _json_value(self, spec):
+        key, slot, bit, decode, encode = spec[:5]
+        value = getattr(self, slot)
+        if value is not None and self._decoded & bit:
+            value = encode(value)
+        return _dump(value)
+
+    def __getitem__(self, key):
+        for spec in self._specs:
+            if spec[0] == key:
+                if self._absent & spec[2]:
+                    break
+                return self._json_value(spec)
+        else:
+            if self.extra is not None and key in self.extra:
+                return self.extra[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        """Get json value by key.
+        """
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def to_dict(self):
+        """Convert model back to rpc result object.
+
+        :rtype: dict
+        """
+        data = {spec[0]: self._json_value(spec) for spec in self._specs
+                if not self._absent & spec[2]}
+        if self.extra is not None:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other):
+        if not isinstance(other, Model):
+            return NotImplemented
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def __hash__(self):
+        # models are read-only, equal ones have the same identifying keys
+        return hash((type(self), self.get('hash'),
+                     self.get('transactionHash'), self.get('logIndex')))
+
+    def __repr__(self):
+        return '<{0} {1}>'.format(type(self).__name__,
+                                  self.get('hash') or
+                                  self.get('transactionHash'))
+
+
+def _load_transactions(values):
+    return [Transaction(value) if isinstance(value, dict) else value
+            for value in values]
+
+
+def _load_logs(values):
+    return [Log(value) for value in values]
+
+
+class Transaction(Model):
+    """Transaction of ``eth_getTransactionBy*`` methods and blocks.
+    """
+
+    fields = (
+        ('blockHash',) + BYTES,
+        ('blockNumber',) + INT,
+        ('from',) + RAW,
+        ('gas',) + INT,
+        ('gasPrice',) + INT,
+        ('maxFeePerGas',) + INT,
+        ('maxPriorityFeePerGas',) + INT,
+        ('hash',) + BYTES,
+        ('input',) + BYTES,
+        ('nonce',) + INT,
+        ('to',) + RAW,
+        ('transactionIndex',) + INT,
+        ('value',) + INT,
+        ('type',) + INT,
+        ('chainId',) + INT,
+        ('accessList',) + RAW,
+        ('v',) + INT,
+        ('r',) + INT,
+        ('s',) + INT,
+    )
+
+
+class Block(Model):
+    """Block or uncle of ``eth_getBlockBy*`` and ``eth_getUncleBy*``
+    methods, ``transactions`` are :class:`Transaction` instances or hashes.
+    """
+
+    fields = (
+        ('number',) + INT,
+        ('hash',) + BYTES,
+        ('parentHash',) + BYTES,
+        ('nonce',) + BYTES,
+        ('sha3Uncles',) + BYTES,
+        ('logsBloom',) + BYTES,
+        ('transactionsRoot',) + BYTES,
+        ('stateRoot',) + BYTES,
+        ('receiptsRoot',) + BYTES,
+        ('miner',) + RAW,
+        ('mixHash',) + BYTES,
+        ('difficulty',) + INT,
+        ('totalDifficulty',) + INT,
+        ('extraData',) + BYTES,
+        ('size',) + INT,
+        ('gasLimit',) + INT,
+        ('gasUsed',) + INT,
+        ('baseFeePerGas',) + INT,
+        ('timestamp',) + INT,
+        ('transactions',) + BYTES_ITEMS + (_load_transactions,),
+        ('uncles',) + BYTES_ITEMS,
+    )
+
+
+class Log(Model):
+    """Log of receipts, ``eth_getLogs`` and filters.
+    """
+
+    fields = (
+        ('address',) + RAW,
+        ('topics',) + BYTES_ITEMS,
+        ('data',) + BYTES,
+        ('blockNumber',) + INT,
+        ('blockHash',) + BYTES,
+        ('transactionHash',) + BYTES,
+        ('transactionIndex',) + INT,
+        ('logIndex',) + INT,
+        ('removed',) + RAW,
+    )
+
+
+class Receipt(Model):
+    """Receipt of ``eth_getTransactionReceipt``.
+    """
+
+    fields = (
+        ('transactionHash',) + BYTES,
+        ('transactionIndex',) + INT,
+        ('blockHash',) + BYTES,
+        ('blockNumber',) + INT,
+        ('from',) + RAW,
+        ('to',) + RAW,
+        ('cumulativeGasUsed',) + INT,
+        ('gasUsed',) + INT,
+        ('effectiveGasPrice',) + INT,
+        ('contractAddress',) + RAW,
+        ('logs',) + RAW + (_load_logs,),
+        ('logsBloom',) + BYTES,
+        ('root',) + BYTES,
+        ('status',) + INT,
+        ('type',) + INT,
+    )
@@ -0,0 +1,448 @@
+import asyncio
+import itertools
+import logging
+from collections import deque
+
+import aiohttp
+
+from .client import BaseAsyncIOClient, create_ethereum_client
+from .constants import READ_ONLY_METHODS
+from .errors import BadJsonError, BadStatusError
+from .management import RpcMixin
+from .utils import hex_to_dec
+
+
+logger = logging.getLogger('asyncio_client')
+
+
+STRATEGY_ROUND_ROBIN = 'round_robin'
+STRATEGY_LEAST_OUTSTANDING = 'least_outstanding'
+STRATEGY_LATENCY = 'latency'
+STRATEGIES = (
+    STRATEGY_ROUND_ROBIN,
+    STRATEGY_LEAST_OUTSTANDING,
+    STRATEGY_LATENCY,
+)
+
+
+# failures of node itself, not of the request
+_NODE_ERRORS = (OSError, aiohttp.ClientError, BadStatusError, BadJsonError,
+                asyncio.TimeoutError)
+
+
+def _is_read_only(data):
+    if isinstance(data, list):
+        return all(item['method'] in READ_ONLY_METHODS for item in data)
+    return data['method'] in READ_ONLY_METHODS
+
+
+class Node:
+    """State of one node of :class:`MultiNodeClient`.
+
+    :param uri: Uri of node
+    :type uri: str
+
+    :param client: Client connected to node or None when it is not
+                   connected yet
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+    """
+
+    def __init__(self, uri, client=None):
+        self.uri = uri
+        self.client = client
+        self.healthy = client is not None
+        self.outstanding = 0
+        self.latency = None
+        self.errors = 0
+        self.block_number = None
+
+    def __repr__(self):
+        return '<Node {0} healthy={1}>'.format(self.uri, self.healthy)
+
+    def score(self):
+        """Expected time of request, used by latency strategy.
+        """
+        return (self.latency or 0.0) * (self.outstanding + 1)
+
+
+class HedgePolicy:
+    """Policy of hedged requests of :class:`MultiNodeClient`.
+
+    When allowed request is not answered in ``percentile`` of recent
+    latencies, its duplicate is sent to another healthy node, the first
+    answer is returned and the other request is cancelled.
+
+    :param percentile: Percentile of latencies used as hedge delay
+    :type percentile: float
+
+    :param min_delay: Min hedge delay in seconds
+    :type min_delay: float
+
+    :param max_delay: Max hedge delay in seconds, used until enough
+                      latencies are observed
+    :type max_delay: float
+
+    :param window: Amount of recent latencies to keep
+    :type window: int
+
+    :param min_samples: Amount of latencies required to compute delay
+    :type min_samples: int
+
+    :param methods: Methods which can be hedged, must be read-only
+    :type methods: iterable
+
+    :return: :class:`HedgePolicy` instance.
+    """
+
+    def __init__(self, percentile=95, min_delay=0.005, max_delay=1.0,
+                 window=1000, min_samples=20, methods=READ_ONLY_METHODS):
+        if not 0 < percentile <= 100:
+            raise ValueError('Invalid percentile.')
+        self.percentile = percentile
+        self.methods = frozenset(methods)
+        self._min_delay = min_delay
+        self._max_delay = max_delay
+        self._min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._delay = None
+        self.requests = 0
+        self.fired = 0
+        self.won = 0
+
+    def applies(self, data):
+        """Check whether request can be hedged.
+
+        :param data: Request data
+        :type data: dict or list
+
+        :rtype: bool
+        """
+        return isinstance(data, dict) and data['method'] in self.methods
+
+    def observe(self, latency):
+        """Record latency of answered request.
+
+        :param latency: Time of request in seconds
+        :type latency: float
+        """
+        self._latencies.append(latency)
+        self._delay = None
+
+    def delay(self):
+        """Time to wait for answer before sending a hedge.
+
+        :rtype: float
+        """
+        if self._delay is None:
+            if len(self._latencies) < self._min_samples:
+                self._delay = self._max_delay
+            else:
+                ordered = sorted(self._latencies)
+                index = min(int(len(ordered) * self.percentile / 100),
+                            len(ordered) - 1)
+                self._delay = min(max(ordered[index], self._min_delay),
+                                  self._max_delay)
+        return self._delay
+
+    @property
+    def stats(self):
+        """Statistics of hedged requests.
+
+        :return: amount of requests, fired and won hedges, their rates and
+                 the current delay
+        :rtype: dict
+        """
+        return {
+            'requests': self.requests,
+            'fired': self.fired,
+            'won': self.won,
+            'fire_rate': self.fired / self.requests if self.requests else 0.0,
+            'win_rate': self.won / self.fired if self.fired else 0.0,
+            'delay': self.delay(),
+        }
+
+
+class MultiNodeClient(BaseAsyncIOClient, RpcMixin):
+    """Creates MultiNodeClient client which balances requests between nodes.
+
+    Node is ejected after ``max_errors`` failures in a row or when it lags
+    more than ``max_lag`` blocks behind the best node, health check
+    re-admits it when it answers and catches up. Read-only requests which
+    failed because of node are repeated on other nodes.
+
+    :param nodes: Nodes to use
+    :type nodes: list of :class:`Node`
+
+    :param timeout: An optional total time of timeout call
+    :type timeout: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :param strategy: Strategy of node choice, see ``STRATEGIES``
+    :type strategy: str
+
+    :param max_errors: Amount of failures in a row to eject node
+    :type max_errors: int
+
+    :param max_lag: Amount of blocks node can be behind the best one
+    :type max_lag: int
+
+    :param health_interval: Time between health checks in seconds
+    :type health_interval: float
+
+    :param ewma_alpha: Weight of the last request in node latency
+    :type ewma_alpha: float
+
+    :param node_options: Options for clients created by health check
+    :type node_options: dict
+
+    :param hedge: An optional policy of hedged requests
+    :type hedge: :class:`HedgePolicy`
+
+    :param kwargs: Options of :class:`aioethereum.BaseAsyncIOClient`
+
+    :return: :class:`MultiNodeClient` instance.
+    """
+
+    def __init__(self, nodes, timeout=60, *, loop=None,
+                 strategy=STRATEGY_ROUND_ROBIN, max_errors=3, max_lag=5,
+                 health_interval=5.0, ewma_alpha=0.3, node_options=None,
+                 hedge=None, **kwargs):
+        if strategy not in STRATEGIES:
+            raise ValueError('Invalid strategy.')
+        if not nodes:
+            raise ValueError('At least one node is required.')
+        super().__init__(timeout, loop=loop, **kwargs)
+        self.nodes = list(nodes)
+        self._strategy = strategy
+        self._max_errors = max_errors
+        self._max_lag = max_lag
+        self._health_interval = health_interval
+        self._ewma_alpha = ewma_alpha
+        self._node_options = node_options or {}
+        self.hedge = hedge
+        self._counter = itertools.count()
+        self._health_task = None
+
+    def _ensure_health_check(self):
+        if self._health_task is None or self._health_task.done():
+            self._health_task = asyncio.ensure_future(
+                self._check_health_forever(), loop=self._loop)
+
+    def _choose(self, exclude=()):
+        nodes = [node for node in self.nodes
+                 if node.healthy and node not in exclude]
+        if not nodes:
+            # better to try ejected nodes than to fail
+            nodes = [node for node in self.nodes
+                     if node.client is not None and node not in exclude]
+        if not nodes:
+            raise ConnectionError('No available nodes.')
+
+        if self._strategy == STRATEGY_LEAST_OUTSTANDING:
+            least = min(node.outstanding for node in nodes)
+            nodes = [node for node in nodes if node.outstanding == least]
+        elif self._strategy == STRATEGY_LATENCY:
+            return min(nodes, key=Node.score)
+        return nodes[next(self._counter) % len(nodes)]
+
+    def _eject(self, node, reason):
+        if node.healthy:
+            logger.warning('Node %s is ejected: %s', node.uri, reason)
+        node.healthy = False
+
+    def _admit(self, node):
+        if not node.healthy:
+            logger.info('Node %s is admitted.', node.uri)
+        node.healthy = True
+        node.errors = 0
+
+    @asyncio.coroutine
+    def _node_request(self, node, data):
+        node.outstanding += 1
+        started = self._loop.time()
+        try:
+            response = yield from node.client._request(data)
+        except _NODE_ERRORS as e:
+            node.errors += 1
+            if node.errors >= self._max_errors:
+                self._eject(node, e)
+            raise
+        finally:
+            node.outstanding -= 1
+
+        elapsed = self._loop.time() - started
+        if node.latency is None:
+            node.latency = elapsed
+        else:
+            node.latency += self._ewma_alpha * (elapsed - node.latency)
+        node.errors = 0
+        return response
+
+    @asyncio.coroutine
+    def _failover_request(self, data, tried):
+        retry = _is_read_only(data)
+        while True:
+            node = self._choose(tried)
+            tried.append(node)
+            try:
+                return (yield from self._node_request(node, data))
+            except _NODE_ERRORS:
+                if not retry or len(tried) == len(self.nodes):
+                    raise
+
+    @asyncio.coroutine
+    def _hedged_request(self, data):
+        policy = self.hedge
+        policy.requests += 1
+        started = self._loop.time()
+        tried = [self._choose()]
+        legs = [asyncio.ensure_future(self._node_request(tried[0], data),
+                                      loop=self._loop)]
+        try:
+            yield from asyncio.wait(legs, timeout=policy.delay(),
+                                    loop=self._loop)
+            if not legs[0].done():
+                try:
+                    node = self._choose(tried)
+                except ConnectionError:
+                    # no other node, keep waiting for the first one
+                    node = None
+                if node is not None and node.healthy:
+                    tried.append(node)
+                    policy.fired += 1
+                    legs.append(asyncio.ensure_future(
+                        self._node_request(node, data), loop=self._loop))
+
+            pending = legs
+            while pending:
+                done, pending = yield from asyncio.wait(
+                    pending, loop=self._loop,
+                    return_when=asyncio.FIRST_COMPLETED)
+                for leg in legs:
+                    if leg in done and leg.exception() is None:
+                        # latency of request, not of the winning leg, so
+                        # slow requests raise the hedge delay
+                        policy.observe(self._loop.time() - started)
+                        if leg is not legs[0]:
+                            policy.won += 1
+                        return leg.result()
+        finally:
+            for leg in legs:
+                if not leg.done():
+                    leg.cancel()
+
+        # every leg failed, continue with nodes not tried yet
+        error = legs[-1].exception()
+        if (not isinstance(error, _NODE_ERRORS) or
+                len(tried) == len(self.nodes)):
+            raise error
+        return (yield from self._failover_request(data, tried))
+
+    @asyncio.coroutine
+    def _request(self, data):
+        self._ensure_health_check()
+        if self.hedge is not None and self.hedge.applies(data):
+            return (yield from self._hedged_request(data))
+        return (yield from self._failover_request(data, []))
+
+    @asyncio.coroutine
+    def _open_stream(self, data):
+        node = self._choose()
+        return (yield from node.client._open_stream(data))
+
+    @asyncio.coroutine
+    def _check_node(self, node):
+        if node.client is None:
+            node.client = yield from create_ethereum_client(
+                node.uri, self._timeout, loop=self._loop,
+                **self._node_options)
+        request = self._build_request('eth_blockNumber')
+        response = yield from node.client._request(request)
+        node.block_number = hex_to_dec(response['result'])
+
+    @asyncio.coroutine
+    def check_health(self):
+        """Check all nodes, eject failed or lagging and admit recovered.
+        """
+        results = yield from asyncio.gather(
+            *[self._check_node(node) for node in self.nodes],
+            loop=self._loop, return_exceptions=True)
+        alive = [node for node, result in zip(self.nodes, results)
+                 if not isinstance(result, Exception)]
+        best = max([node.block_number for node in alive], default=0)
+        for node, result in zip(self.nodes, results):
+            if isinstance(result, Exception):
+                self._eject(node, result)
+            elif best - node.block_number > self._max_lag:
+                self._eject(node, 'behind by {0} blocks'.format(
+                    best - node.block_number))
+            else:
+                self._admit(node)
+
+    @asyncio.coroutine
+    def _check_health_forever(self):
+        while True:
+            try:
+                yield from self.check_health()
+            except Exception:
+                logger.exception('Health check failed.')
+            yield from asyncio.sleep(self._health_interval, loop=self._loop)
+
+    @asyncio.coroutine
+    def close(self):
+        """Stop health checks and close clients of all nodes.
+        """
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        for node in self.nodes:
+            if node.client is not None:
+                yield from node.client.close()
+
+
+@asyncio.coroutine
+def create_multinode_client(uris, timeout=60, *, loop=None,
+                            node_options=None, **kwargs):
+    """Create client balancing requests between several ethereum nodes.
+
+    Nodes which are not available at start are connected by health check.
+
+    :param uris: Uris of ethereum nodes, any scheme of
+                 :func:`aioethereum.create_ethereum_client`
+    :type uris: list
+
+    :param timeout: An optional total time of timeout call
+    :type timeout: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :param node_options: Extra options for the client of each node
+    :type node_options: dict
+
+    :param kwargs: Options of :class:`MultiNodeClient`
+
+    :return: :class:`MultiNodeClient` instance.
+    """
+    if loop is None:
+        loop = asyncio.get_event_loop()
+    node_options = node_options or {}
+
+    nodes = []
+    for uri in uris:
+        try:
+            client = yield from create_ethereum_client(
+                uri, timeout, loop=loop, **node_options)
+        except _NODE_ERRORS as e:
+            logger.warning('Node %s is not available: %s', uri, e)
+            client = None
+        nodes.append(Node(uri, client))
+
+    if not any(node.client is not None for node in nodes):
+        raise ConnectionError('No available nodes.')
+    return MultiNodeClient(nodes, timeout, loop=loop,
+                           node_options=node_options, **kwargs)
@@ -0,0 +1,227 @@
+import asyncio
+import heapq
+import logging
+import re
+
+from .constants import BLOCK_TAG_PENDING
+from .errors import BadResponseError
+
+
+logger = logging.getLogger('asyncio_client')
+
+# node errors meaning that nonce is already used by mined transaction
+NONCE_ERRORS = re.compile(r'nonce too low', re.I)
+# node errors meaning that the same transaction is in the pool
+KNOWN_ERRORS = re.compile(r'known transaction|already known', re.I)
+# node errors meaning that nonce is used by transaction in the pool, it
+# can be the same transaction, so it must not be sent again
+POOLED_ERRORS = re.compile(r'known transaction|already known|'
+                           r'replacement transaction underpriced', re.I)
+_KNOWN_HASH = re.compile(r'known transaction:\s*(0x[0-9a-f]{64})', re.I)
+
+
+class _Account:
+
+    __slots__ = ('lock', 'next', 'released')
+
+    def __init__(self, loop):
+        self.lock = asyncio.Lock(loop=loop)
+        self.next = None
+        self.released = []
+
+
+class NonceManager:
+    """Allocates nonces of accounts locally.
+
+    Nonce of account is requested from the node (``pending`` transaction
+    count) once and then incremented for each allocation, so concurrent
+    senders get unique nonces without extra requests. Nonces of rejected
+    transactions are released and reused first, so no gaps stay.
+
+    .. code:: python
+
+        nonces = NonceManager(client)
+        txhash = yield from nonces.send_transaction(address, to=to,
+                                                    value=value)
+
+    :param client: Client used to request nonces and send transactions
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`NonceManager` instance.
+    """
+
+    def __init__(self, client, *, loop=None):
+        self._client = client
+        self._loop = loop or asyncio.get_event_loop()
+        self._accounts = {}
+
+    def _account(self, address):
+        address = address.lower()
+        account = self._accounts.get(address)
+        if account is None:
+            account = self._accounts[address] = _Account(self._loop)
+        return account
+
+    @asyncio.coroutine
+    def _pending_count(self, address):
+        return (yield from self._client.eth_getTransactionCount(
+            address, BLOCK_TAG_PENDING))
+
+    @asyncio.coroutine
+    def allocate(self, address):
+        """Get the next nonce of account.
+
+        :param address: Account address
+        :type address: str
+
+        :return: nonce
+        :rtype: int
+        """
+        account = self._account(address)
+        with (yield from account.lock):
+            if account.next is None:
+                account.next = yield from self._pending_count(address)
+            if account.released:
+                return heapq.heappop(account.released)
+            nonce = account.next
+            account.next += 1
+            return nonce
+
+    @asyncio.coroutine
+    def release(self, address, nonce):
+        """Return nonce of transaction which was not accepted by the node,
+        it is allocated again before new ones.
+
+        :param address: Account address
+        :type address: str
+
+        :param nonce: Allocated nonce
+        :type nonce: int
+        """
+        account = self._account(address)
+        with (yield from account.lock):
+            if account.next is None or nonce >= account.next:
+                return
+            if nonce == account.next - 1:
+                account.next = nonce
+            elif nonce not in account.released:
+                heapq.heappush(account.released, nonce)
+
+    @asyncio.coroutine
+    def resync(self, address):
+        """Move the next nonce of account forward to the node's one, e.g.
+        after transactions sent past the manager.
+
+        :param address: Account address
+        :type address: str
+
+        :return: the next nonce
+        :rtype: int
+        """
+        account = self._account(address)
+        with (yield from account.lock):
+            count = yield from self._pending_count(address)
+            if account.next is None or count > account.next:
+                account.next = count
+            account.released = [nonce for nonce in account.released
+                                if nonce >= count]
+            heapq.heapify(account.released)
+            logger.debug('Nonce of %s is resynced to %s.',
+                         address, account.next)
+            return account.next
+
+    def reset(self, address=None):
+        """Forget nonces of account (or all accounts), they are requested
+        from the node on the next allocation.
+
+        :param address: Account address (optional)
+        :type address: str
+        """
+        if address is None:
+            self._accounts.clear()
+        else:
+            self._accounts.pop(address.lower(), None)
+
+    @staticmethod
+    def is_nonce_error(exc):
+        """Check if error of node means that nonce is used by mined
+        transaction.
+
+        :param exc: Error of request
+        :type exc: Exception
+
+        :rtype: bool
+        """
+        return (isinstance(exc, BadResponseError) and
+                NONCE_ERRORS.search(str(exc.msg)) is not None)
+
+    @staticmethod
+    def is_pooled_error(exc):
+        """Check if error of node means that nonce is used by transaction
+        in the pool, which may be the sent one.
+
+        :param exc: Error of request
+        :type exc: Exception
+
+        :rtype: bool
+        """
+        return (isinstance(exc, BadResponseError) and
+                POOLED_ERRORS.search(str(exc.msg)) is not None)
+
+    @asyncio.coroutine
+    def send_transaction(self, from_, *, passphrase=None, retries=3,
+                         **kwargs):
+        """Send transaction with allocated nonce.
+
+        "Nonce too low" errors resync the account and the transaction is
+        sent again with the next nonce. Transaction already known by the
+        node is not sent again, its hash is returned when the node reports
+        it. Nonce of transaction rejected for another reason is released.
+        Nonce is kept on timeouts and connection errors as the transaction
+        may have reached the node.
+
+        :param from_: From account address
+        :type from_: str
+
+        :param passphrase: Passphrase of account, the transaction is sent
+                           by ``personal_sendTransaction`` (optional)
+        :type passphrase: str
+
+        :param retries: Max amount of resends after nonce errors
+        :type retries: int
+
+        :param kwargs: Options of ``eth_sendTransaction``
+
+        :return: txhash
+        :rtype: str
+        :raises BadResponseError: when transaction is rejected, or nonce is
+                                  used by transaction in the pool and its
+                                  hash is unknown
+        """
+        for attempt in range(retries + 1):
+            nonce = yield from self.allocate(from_)
+            try:
+                if passphrase is not None:
+                    return (yield from self._client.personal_sendTransaction(
+                        from_, nonce=nonce, passphrase=passphrase, **kwargs))
+                return (yield from self._client.eth_sendTransaction(
+                    from_, nonce=nonce, **kwargs))
+            except BadResponseError as e:
+                if self.is_pooled_error(e):
+                    # nonce stays used, resend could double the transaction
+                    match = _KNOWN_HASH.search(str(e.msg))
+                    if match is not None:
+                        return match.group(1)
+                    raise
+                if not self.is_nonce_error(e):
+                    yield from self.release(from_, nonce)
+                    raise
+                if attempt == retries:
+                    raise
+                logger.warning('Nonce %s of %s is used: %s.',
+                               nonce, from_, e.msg)
+                yield from self.resync(from_)
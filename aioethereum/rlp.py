@@ -0,0 +1,84 @@
+def _int_to_bytes(value):
+    if value < 0:
+        raise ValueError('Negative integer can not be encoded.')
+    return value.to_bytes((value.bit_length() + 7) // 8, 'big')
+
+
+def _length_prefix(length, offset):
+    if length < 56:
+        return bytes((offset + length,))
+    length = _int_to_bytes(length)
+    return bytes((offset + 55 + len(length),)) + length
+
+
+def encode(item):
+    """Encode item by RLP.
+
+    :param item: Bytes, non-negative integer or list of items
+    :type item: bytes or int or list
+
+    :rtype: bytes
+    """
+    if isinstance(item, (list, tuple)):
+        payload = b''.join(encode(value) for value in item)
+        return _length_prefix(len(payload), 0xc0) + payload
+    if isinstance(item, int):
+        item = _int_to_bytes(item)
+    elif isinstance(item, (bytearray, memoryview)):
+        item = bytes(item)
+    elif not isinstance(item, bytes):
+        raise TypeError('Can not encode {0!r}.'.format(item))
+    if len(item) == 1 and item[0] < 0x80:
+        return item
+    return _length_prefix(len(item), 0x80) + item
+
+
+def _decode_length(data, pos):
+    prefix = data[pos]
+    if prefix < 0x80:
+        return pos, 1, False
+    if prefix < 0xb8:
+        return pos + 1, prefix - 0x80, False
+    if prefix < 0xc0:
+        size = prefix - 0xb7
+        return (pos + 1 + size,
+                int.from_bytes(data[pos + 1:pos + 1 + size], 'big'), False)
+    if prefix < 0xf8:
+        return pos + 1, prefix - 0xc0, True
+    size = prefix - 0xf7
+    return (pos + 1 + size,
+            int.from_bytes(data[pos + 1:pos + 1 + size], 'big'), True)
+
+
+def _decode(data, pos):
+    start, length, is_list = _decode_length(data, pos)
+    end = start + length
+    if end > len(data):
+        raise ValueError('RLP data is too short.')
+    if not is_list:
+        return data[start:end], end
+    items = []
+    while start < end:
+        item, start = _decode(data, start)
+        items.append(item)
+    if start != end:
+        raise ValueError('Invalid RLP list length.')
+    return items, end
+
+
+def decode(data):
+    """Decode RLP data, integers are returned as big-endian bytes.
+
+    :param data: Encoded data
+    :type data: bytes
+
+    :return: bytes or list of items
+    :raises ValueError: when data is not valid RLP
+    """
+    data = bytes(data)
+    if not data:
+        raise ValueError('RLP data is empty.')
+    item, end = _decode(data, 0)
+    if end != len(data):
+        raise ValueError('Trailing bytes after RLP item.')
+    return item
@@ -0,0 +1,538 @@
+import asyncio
+import logging
+from collections import deque, namedtuple
+
+from .constants import BLOCK_TAG_EARLIEST, BLOCK_TAG_LATEST
+from .errors import BadResponseError, ChainReorgError
+from .utils import hex_to_dec, validate_block
+
+
+logger = logging.getLogger('asyncio_client')
+
+BLOCK_EVENT_NEW = 'block'
+BLOCK_EVENT_ROLLBACK = 'rollback'
+
+
+BlockEvent = namedtuple('BlockEvent', ('type', 'number', 'hash', 'block'))
+
+
+# parts of node errors, when range of logs query should be reduced, e.g.
+# "query returned more than 10000 results" or "Log response size exceeded";
+# rate limits and other failures are raised, halving would add requests
+_RANGE_ERRORS = ('query returned more than', 'block range',
+                 'response size exceeded', 'timeout', 'timed out')
+
+
+def _is_range_error(exc):
+    if isinstance(exc, BadResponseError):
+        msg = str(exc.msg).lower()
+        return any(part in msg for part in _RANGE_ERRORS)
+    return isinstance(exc, asyncio.TimeoutError)
+
+
+class BlockStream:
+    """Async iterator over blocks of the chain which follows its head.
+
+    Yields :class:`BlockEvent` items: ``BLOCK_EVENT_NEW`` with the next
+    canonical block, or ``BLOCK_EVENT_ROLLBACK`` (``block`` is ``None``)
+    when previously yielded block was replaced by reorganization, after
+    rollbacks the stream continues from the first replaced block.
+
+    Only numbers and hashes of the last ``max_reorg_depth`` blocks and up
+    to ``concurrency`` prefetched blocks are kept in memory.
+
+    .. code:: python
+
+        stream = client.stream_blocks(start=0, confirmations=12)
+        async for event in stream:
+            if event.type == BLOCK_EVENT_ROLLBACK:
+                revert(event.number)
+            else:
+                save(event.block)
+
+    :param client: Client used to fetch blocks
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :param start: Number of the first block (optional, head by default)
+    :type start: int
+
+    :param confirmations: Amount of blocks on top of yielded block
+    :type confirmations: int
+
+    :param tx_objects: Return txs full object (optional)
+    :type tx_objects: bool
+
+    :param concurrency: Max amount of blocks fetched ahead
+    :type concurrency: int
+
+    :param poll_interval: Time between head checks in seconds
+    :type poll_interval: float
+
+    :param max_reorg_depth: Max amount of blocks which can be rolled back
+    :type max_reorg_depth: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`BlockStream` instance.
+    """
+
+    def __init__(self, client, start=None, confirmations=0, tx_objects=False,
+                 concurrency=10, poll_interval=1.0, max_reorg_depth=64, *,
+                 loop=None):
+        self._client = client
+        self._start = self._next = start
+        self._confirmations = confirmations
+        self._tx_objects = tx_objects
+        self._concurrency = max(concurrency, 1)
+        self._poll_interval = poll_interval
+        self._loop = loop or asyncio.get_event_loop()
+        self._head = None
+        self._prefetch = deque()
+        self._history = deque(maxlen=max_reorg_depth + 1)
+
+    def __aiter__(self):
+        return self
+
+    @asyncio.coroutine
+    def __anext__(self):
+        return (yield from self.get())
+
+    @asyncio.coroutine
+    def _update_head(self):
+        bnumber = yield from self._client.eth_blockNumber()
+        self._head = bnumber - self._confirmations
+
+    @asyncio.coroutine
+    def _wait_for(self, number):
+        while self._head is None or self._head < number:
+            yield from self._update_head()
+            if self._head < number:
+                yield from asyncio.sleep(self._poll_interval, loop=self._loop)
+
+    def _fill(self):
+        last = min(self._next + self._concurrency - 1, self._head)
+        number = self._next + len(self._prefetch)
+        while number <= last:
+            self._prefetch.append(asyncio.ensure_future(
+                self._client.eth_getBlockByNumber(number, self._tx_objects),
+                loop=self._loop))
+            number += 1
+
+    def _reset(self):
+        while self._prefetch:
+            self._prefetch.popleft().cancel()
+
+    def _rollback(self):
+        number, bhash = self._history.pop()
+        if not self._history and number != self._start:
+            # blocks before are yielded, but already forgotten
+            raise ChainReorgError('Reorganization is deeper than {0} '
+                                  'blocks.'.format(self._history.maxlen - 1))
+        self._reset()
+        self._next = number
+        return BlockEvent(BLOCK_EVENT_ROLLBACK, number, bhash, None)
+
+    @asyncio.coroutine
+    def get(self):
+        """Wait for the next event.
+
+        :return: :class:`BlockEvent` instance.
+        :raises ChainReorgError: when reorganization is too deep to be
+                                 rolled back
+        """
+        if self._next is None:
+            yield from self._update_head()
+            self._start = self._next = max(self._head, 0)
+
+        while True:
+            yield from self._wait_for(self._next)
+            self._fill()
+            try:
+                block = yield from self._prefetch.popleft()
+            except BaseException:
+                self._reset()
+                raise
+
+            if block is None:
+                # chain became shorter after reorganization
+                self._reset()
+                self._head = None
+                yield from asyncio.sleep(self._poll_interval, loop=self._loop)
+                continue
+
+            if self._history and self._history[-1][1] != block['parentHash']:
+                return self._rollback()
+
+            number = self._next
+            self._next += 1
+            self._history.append((number, block['hash']))
+            return BlockEvent(BLOCK_EVENT_NEW, number, block['hash'], block)
+
+    def close(self):
+        """Cancel prefetched requests.
+        """
+        self._reset()
+
+
+class LogScanner:
+    """Async iterator over logs of big block range.
+
+    Range is split into chunks fetched concurrently by ``eth_getLogs``,
+    logs are yielded in block order. Chunk is halved when node refuses it
+    as too big or does not answer in time and doubled after successful
+    request, other errors (e.g. rate limits) are raised.
+
+    .. code:: python
+
+        scanner = client.scan_logs(0, address=token, topics=[TRANSFER])
+        async for log in scanner:
+            save(log)
+
+    :param client: Client used to fetch logs
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :param from_block: Block tag or number
+    :type from_block: int or BLOCK_TAGS
+
+    :param to_block: Block tag or number (optional)
+    :type to_block: int or BLOCK_TAGS
+
+    :param address: Contract address (optional)
+    :type address: str
+
+    :param topics: Topics (optional)
+    :type topics: list
+
+    :param chunk_size: Initial amount of blocks in one request
+    :type chunk_size: int
+
+    :param max_chunk_size: Max amount of blocks in one request
+    :type max_chunk_size: int
+
+    :param workers: Max amount of concurrent requests
+    :type workers: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`LogScanner` instance.
+    """
+
+    def __init__(self, client, from_block, to_block=BLOCK_TAG_LATEST,
+                 address=None, topics=None, chunk_size=1000,
+                 max_chunk_size=100000, workers=4, *, loop=None):
+        validate_block(from_block)
+        validate_block(to_block)
+        self._client = client
+        self._from_block = from_block
+        self._to_block = to_block
+        self._address = address
+        self._topics = topics
+        self._chunk_size = max(chunk_size, 1)
+        self._max_chunk_size = max_chunk_size
+        self._workers = max(workers, 1)
+        self._loop = loop or asyncio.get_event_loop()
+        self._cursor = None
+        self._end = None
+        self._tasks = deque()
+        self._logs = deque()
+
+    @property
+    def chunk_size(self):
+        """Current amount of blocks in one request.
+
+        :rtype: int
+        """
+        return self._chunk_size
+
+    def __aiter__(self):
+        return self
+
+    @asyncio.coroutine
+    def __anext__(self):
+        try:
+            return (yield from self.get())
+        except LookupError:
+            raise StopAsyncIteration
+
+    @asyncio.coroutine
+    def _resolve_block(self, block):
+        if isinstance(block, int):
+            return block
+        if block == BLOCK_TAG_EARLIEST:
+            return 0
+        return (yield from self._client.eth_blockNumber())
+
+    @asyncio.coroutine
+    def _fetch(self, start, end):
+        try:
+            logs = yield from self._client.eth_getLogs(
+                start, end, self._address, self._topics)
+        except (BadResponseError, asyncio.TimeoutError) as e:
+            if start == end or not _is_range_error(e):
+                raise
+            size = end - start + 1
+            self._chunk_size = min(self._chunk_size, max(size // 2, 1))
+            middle = start + size // 2 - 1
+            first = yield from self._fetch(start, middle)
+            second = yield from self._fetch(middle + 1, end)
+            return first + second
+
+        if end - start + 1 >= self._chunk_size:
+            self._chunk_size = min(self._chunk_size * 2,
+                                   self._max_chunk_size)
+        return logs
+
+    def _fill(self):
+        while len(self._tasks) < self._workers and self._cursor <= self._end:
+            start = self._cursor
+            end = min(start + self._chunk_size - 1, self._end)
+            self._cursor = end + 1
+            self._tasks.append((start, asyncio.ensure_future(
+                self._fetch(start, end), loop=self._loop)))
+
+    def _reset(self, cursor):
+        while self._tasks:
+            self._tasks.popleft()[1].cancel()
+        self._cursor = cursor
+
+    @asyncio.coroutine
+    def get(self):
+        """Wait for the next log.
+
+        :return: log
+        :rtype: dict
+        :raises LookupError: when all logs of the range are yielded
+        """
+        if self._cursor is None:
+            self._cursor = yield from self._resolve_block(self._from_block)
+            self._end = yield from self._resolve_block(self._to_block)
+
+        while not self._logs:
+            self._fill()
+            if not self._tasks:
+                raise LookupError('All logs are scanned.')
+            start, task = self._tasks[0]
+            try:
+                logs = yield from task
+            except BaseException:
+                # next call starts again from the failed chunk
+                self._reset(start)
+                raise
+            self._tasks.popleft()
+            self._logs.extend(logs)
+        return self._logs.popleft()
+
+    def close(self):
+        """Cancel requests in flight.
+        """
+        self._reset(self._cursor)
+
+
+class _Watch:
+
+    __slots__ = ('receipt', 'waiters')
+
+    def __init__(self):
+        self.receipt = None
+        # (confirmations, future) pairs
+        self.waiters = []
+
+
+class ReceiptWatcher:
+    """Waits for receipts of many transactions by shared polling.
+
+    Head of the chain is polled every ``poll_interval`` seconds, on each
+    new block receipts of all pending transactions are requested by
+    batches of ``batch_size`` calls, between blocks only receipts of newly
+    registered transactions are requested. Receipt is requested again before
+    it is returned with confirmations, so receipt of block replaced by
+    reorganization is not returned. Polling stops when nothing is
+    watched.
+
+    .. code:: python
+
+        watcher = client.watch_receipts(confirmations=12)
+        receipts = yield from asyncio.gather(
+            *[watcher.wait(txhash, timeout=600) for txhash in txhashes])
+
+    :param client: Client used to fetch receipts
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :param confirmations: Default amount of blocks on top of receipt's
+                          block
+    :type confirmations: int
+
+    :param poll_interval: Time between head checks in seconds
+    :type poll_interval: float
+
+    :param batch_size: Max amount of receipts in one batch request
+    :type batch_size: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`ReceiptWatcher` instance.
+    """
+
+    def __init__(self, client, confirmations=0, poll_interval=1.0,
+                 batch_size=500, *, loop=None):
+        self._client = client
+        self._confirmations = confirmations
+        self._poll_interval = poll_interval
+        self._batch_size = max(batch_size, 1)
+        self._loop = loop or asyncio.get_event_loop()
+        self._watches = {}
+        self._head = None
+        # keys registered since the last check
+        self._new = set()
+        self._added = asyncio.Event(loop=self._loop)
+        self._task = None
+
+    def __len__(self):
+        return len(self._watches)
+
+    def watch(self, txhash, confirmations=None):
+        """Register transaction.
+
+        :param txhash: Transaction hash
+        :type txhash: str
+
+        :param confirmations: Amount of blocks on top of receipt's block
+                              (optional, default of the watcher)
+        :type confirmations: int
+
+        :return: future resolved with receipt
+        :rtype: :class:`asyncio.Future`
+        """
+        if confirmations is None:
+            confirmations = self._confirmations
+        key = txhash.lower()
+        watch = self._watches.get(key)
+        if watch is None:
+            watch = self._watches[key] = _Watch()
+        future = asyncio.Future(loop=self._loop)
+        future.add_done_callback(
+            lambda future: self._forget(key, future))
+        watch.waiters.append((confirmations, future))
+
+        self._new.add(key)
+        self._added.set()
+        if self._task is None or self._task.done():
+            self._task = asyncio.ensure_future(self._poll(), loop=self._loop)
+        return future
+
+    @asyncio.coroutine
+    def wait(self, txhash, confirmations=None, timeout=None):
+        """Wait for receipt of transaction.
+
+        :param txhash: Transaction hash
+        :type txhash: str
+
+        :param confirmations: Amount of blocks on top of receipt's block
+                              (optional, default of the watcher)
+        :type confirmations: int
+
+        :param timeout: Max time to wait in seconds (optional)
+        :type timeout: float
+
+        :return: receipt
+        :rtype: dict
+        :raises asyncio.TimeoutError: when receipt is not received in time
+        """
+        future = self.watch(txhash, confirmations)
+        return (yield from asyncio.wait_for(future, timeout, loop=self._loop))
+
+    def _forget(self, key, future):
+        watch = self._watches.get(key)
+        if watch is None:
+            return
+        watch.waiters = [waiter for waiter in watch.waiters
+                         if waiter[1] is not future]
+        if not watch.waiters:
+            del self._watches[key]
+
+    def _depth(self, receipt):
+        return self._head - hex_to_dec(receipt['blockNumber'])
+
+    def _due(self, watch):
+        if watch.receipt is None:
+            return True
+        depth = self._depth(watch.receipt)
+        return any(depth >= confirmations
+                   for confirmations, _ in watch.waiters)
+
+    @asyncio.coroutine
+    def _fetch(self, keys):
+        batch = self._client.batch()
+        for key in keys:
+            batch.eth_getTransactionReceipt(key)
+        receipts = yield from batch.execute()
+        for key, receipt in zip(keys, receipts):
+            watch = self._watches.get(key)
+            if watch is None:
+                continue
+            if isinstance(receipt, Exception):
+                logger.warning('Receipt of %s is not received: %r.',
+                               key, receipt)
+                continue
+            watch.receipt = receipt
+            if receipt is None:
+                continue
+            depth = self._depth(receipt)
+            for confirmations, future in list(watch.waiters):
+                if depth >= confirmations and not future.done():
+                    future.set_result(receipt)
+
+    @asyncio.coroutine
+    def _check(self, keys=None):
+        if keys is None:
+            keys = self._watches
+        keys = [key for key in keys
+                if key in self._watches and self._due(self._watches[key])]
+        yield from asyncio.gather(
+            *[self._fetch(keys[i:i + self._batch_size])
+              for i in range(0, len(keys), self._batch_size)],
+            loop=self._loop)
+
+    @asyncio.coroutine
+    def _poll(self):
+        while self._watches:
+            new, self._new = self._new, set()
+            self._added.clear()
+            try:
+                head = yield from self._client.eth_blockNumber()
+                if head != self._head:
+                    self._head = head
+                    yield from self._check()
+                elif new:
+                    # the rest is already checked at this block
+                    yield from self._check(new)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning('Receipts polling failed: %r.', e)
+                self._new |= new
+            if not self._watches:
+                break
+            try:
+                yield from asyncio.wait_for(
+                    self._added.wait(), self._poll_interval,
+                    loop=self._loop)
+            except asyncio.TimeoutError:
+                pass
+
+    def close(self):
+        """Stop polling and cancel all waiters.
+        """
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for watch in list(self._watches.values()):
+            for _, future in watch.waiters:
+                future.cancel()
+        self._watches.clear()
@@ -0,0 +1,263 @@
+import asyncio
+import binascii
+import concurrent.futures
+from collections import namedtuple
+
+from . import rlp
+from .crypto import keccak256, private_key_to_address, sign
+from .errors import BadResponseError
+from .nonce import KNOWN_ERRORS
+
+
+TX_TYPE_LEGACY = 0
+TX_TYPE_DYNAMIC_FEE = 2
+
+
+SignedTransaction = namedtuple('SignedTransaction', ('raw', 'hash'))
+
+
+def _to_int(value):
+    if value is None:
+        return 0
+    if isinstance(value, str):
+        return int(value, 16)
+    return value
+
+
+def _to_bytes(value):
+    if value is None:
+        return b''
+    if isinstance(value, str):
+        value = value[2:] if value.startswith('0x') else value
+        return binascii.unhexlify(value)
+    return bytes(value)
+
+
+def _to_hex(data):
+    return '0x' + binascii.hexlify(data).decode('ascii')
+
+
+def _access_list(items):
+    return [[_to_bytes(item['address']),
+             [_to_bytes(key) for key in item.get('storageKeys', ())]]
+            for item in items or ()]
+
+
+def sign_transaction(tx, private_key):
+    """Sign transaction offline.
+
+    EIP-1559 transaction (type 2) is signed when ``max_fee_per_gas`` is
+    set, otherwise legacy transaction with EIP-155 replay protection
+    (unprotected when ``chain_id`` is not set).
+
+    .. code:: python
+
+        signed = sign_transaction({'nonce': 0, 'gas': 21000,
+                                   'gas_price': 20 * 10**9, 'to': address,
+                                   'value': 10**18, 'chain_id': 1}, key)
+        txhash = yield from client.eth_sendRawTransaction(signed.raw)
+
+    :param tx: Transaction with ``nonce``, ``gas``, ``to``, ``value`` (in
+               wei), ``data``, ``chain_id``, ``gas_price`` or
+               ``max_fee_per_gas`` and ``max_priority_fee_per_gas``,
+               ``access_list`` keys, numbers are ints or hex strings
+    :type tx: dict
+
+    :param private_key: Private key, bytes or hex string
+    :type private_key: bytes or str
+
+    :return: :class:`SignedTransaction` with hex ``raw`` data and ``hash``
+    """
+    nonce = _to_int(tx['nonce'])
+    gas = _to_int(tx['gas'])
+    to = _to_bytes(tx.get('to'))
+    value = _to_int(tx.get('value'))
+    data = _to_bytes(tx.get('data'))
+    chain_id = tx.get('chain_id')
+
+    if tx.get('max_fee_per_gas') is not None:
+        if chain_id is None:
+            raise ValueError('chain_id is required for typed transaction.')
+        fields = [_to_int(chain_id), nonce,
+                  _to_int(tx.get('max_priority_fee_per_gas')),
+                  _to_int(tx['max_fee_per_gas']), gas, to, value, data,
+                  _access_list(tx.get('access_list'))]
+        prefix = bytes((TX_TYPE_DYNAMIC_FEE,))
+        recovery, r, s = sign(keccak256(prefix + rlp.encode(fields)),
+                              private_key)
+        raw = prefix + rlp.encode(fields + [recovery, r, s])
+    else:
+        fields = [nonce, _to_int(tx.get('gas_price')), gas, to, value, data]
+        if chain_id is None:
+            recovery, r, s = sign(keccak256(rlp.encode(fields)), private_key)
+            v = recovery + 27
+        else:
+            chain_id = _to_int(chain_id)
+            recovery, r, s = sign(
+                keccak256(rlp.encode(fields + [chain_id, 0, 0])),
+                private_key)
+            v = recovery + 35 + 2 * chain_id
+        raw = rlp.encode(fields + [v, r, s])
+    return SignedTransaction(_to_hex(raw), _to_hex(keccak256(raw)))
+
+
+def _sign_chunk(txs, private_key):
+    return [sign_transaction(tx, private_key) for tx in txs]
+
+
+class TransactionSigner:
+    """Signs transactions of one account in process pool and sends them
+    by ``eth_sendRawTransaction``.
+
+    Transactions are split into chunks signed by workers in parallel, so
+    node does not need unlocked account.
+
+    .. code:: python
+
+        signer = TransactionSigner(key, chain_id=1)
+        txhashes = yield from signer.send_many(client, [
+            {'to': address, 'value': amount, 'gas': 21000,
+             'max_fee_per_gas': max_fee,
+             'max_priority_fee_per_gas': tip}
+            for address, amount in payouts
+        ], nonces=NonceManager(client))
+
+    :param private_key: Private key, bytes or hex string
+    :type private_key: bytes or str
+
+    :param chain_id: Default chain id of transactions (optional)
+    :type chain_id: int
+
+    :param executor: Executor of signing (optional, own
+                     :class:`concurrent.futures.ProcessPoolExecutor` by
+                     default)
+    :type executor: :class:`concurrent.futures.Executor`
+
+    :param workers: Amount of processes of own executor (optional, amount
+                    of CPUs by default)
+    :type workers: int
+
+    :param chunk_size: Amount of transactions signed by one task
+    :type chunk_size: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`TransactionSigner` instance.
+    """
+
+    def __init__(self, private_key, chain_id=None, *, executor=None,
+                 workers=None, chunk_size=64, loop=None):
+        self.address = private_key_to_address(private_key)
+        self._private_key = private_key
+        self._chain_id = chain_id
+        self._executor = executor
+        self._own_executor = executor is None
+        self._workers = workers
+        self._chunk_size = max(chunk_size, 1)
+        self._loop = loop or asyncio.get_event_loop()
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                self._workers)
+        return self._executor
+
+    def _prepare(self, tx):
+        if tx.get('chain_id') is None and self._chain_id is not None:
+            tx = dict(tx, chain_id=self._chain_id)
+        return tx
+
+    @asyncio.coroutine
+    def sign(self, tx):
+        """Sign transaction in executor.
+
+        :param tx: Transaction, see :func:`sign_transaction`
+        :type tx: dict
+
+        :return: :class:`SignedTransaction` instance.
+        """
+        return (yield from self._loop.run_in_executor(
+            self._get_executor(), sign_transaction, self._prepare(tx),
+            self._private_key))
+
+    @asyncio.coroutine
+    def sign_many(self, txs):
+        """Sign transactions by parallel chunks.
+
+        :param txs: Transactions, see :func:`sign_transaction`
+        :type txs: list
+
+        :return: :class:`SignedTransaction` instances in order of
+                 transactions
+        :rtype: list
+        """
+        txs = [self._prepare(tx) for tx in txs]
+        executor = self._get_executor()
+        chunks = yield from asyncio.gather(
+            *[self._loop.run_in_executor(
+                executor, _sign_chunk, txs[i:i + self._chunk_size],
+                self._private_key)
+              for i in range(0, len(txs), self._chunk_size)],
+            loop=self._loop)
+        return [signed for chunk in chunks for signed in chunk]
+
+    @asyncio.coroutine
+    def send_many(self, client, txs, nonces=None):
+        """Sign transactions and send them in one batch request.
+
+        :param client: Client used to send transactions
+        :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+        :param txs: Transactions, see :func:`sign_transaction`
+        :type txs: list
+
+        :param nonces: Allocator of nonces of transactions without
+                       ``nonce`` (optional), nonces of rejected
+                       transactions are released
+        :type nonces: :class:`aioethereum.nonce.NonceManager`
+
+        :return: txhash or :class:`aioethereum.errors.BadResponseError`
+                 in order of transactions
+        :rtype: list
+        """
+        txs = list(txs)
+        allocated = []
+        for i, tx in enumerate(txs):
+            if tx.get('nonce') is None:
+                if nonces is None:
+                    raise ValueError('Transaction without nonce.')
+                nonce = yield from nonces.allocate(self.address)
+                txs[i] = dict(tx, nonce=nonce)
+                allocated.append(i)
+
+        try:
+            signed = yield from self.sign_many(txs)
+        except BaseException:
+            for i in allocated:
+                yield from nonces.release(self.address, txs[i]['nonce'])
+            raise
+
+        batch = client.batch()
+        for item in signed:
+            batch.eth_sendRawTransaction(item.raw)
+        results = yield from batch.execute()
+        for i, result in enumerate(results):
+            if (isinstance(result, BadResponseError) and
+                    KNOWN_ERRORS.search(str(result.msg))):
+                # the same raw transaction is in the pool already
+                results[i] = signed[i].hash
+        for i in allocated:
+            if (isinstance(results[i], Exception) and
+                    not nonces.is_nonce_error(results[i]) and
+                    not nonces.is_pooled_error(results[i])):
+                yield from nonces.release(self.address, txs[i]['nonce'])
+        return results
+
+    def close(self):
+        """Shut down own executor.
+        """
+        if self._own_executor and self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
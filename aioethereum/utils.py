@@ -15,6 +15,64 @@ def hex_to_dec(x):
     return int(x, 16)
 
 
+def _parse_hex(value):
+    return 0 if value is None else int(value, 16)
+
+
+def hex_to_array(values):
+    """Convert hex strings to numpy array.
+
+    Gives ``uint64`` array, or ``object`` array of ints when some value
+    does not fit into 64 bits. ``None`` values, e.g. number of pending
+    block, are masked in :class:`numpy.ma.MaskedArray`.
+
+    :param values: Hex strings
+    :type values: list
+
+    :rtype: :class:`numpy.ndarray`
+    :raises RuntimeError: when numpy is not installed
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        raise RuntimeError('numpy is required for hex_to_array().')
+    values = list(values)
+    # int() of CPython parses hex faster than numpy ops over characters,
+    # values are parsed in one pass into the typed array
+    try:
+        array = np.fromiter(map(_parse_hex, values), dtype=np.uint64,
+                            count=len(values))
+    except OverflowError:
+        array = np.array([_parse_hex(value) for value in values],
+                         dtype=object)
+    if any(value is None for value in values):
+        return np.ma.masked_array(
+            array, mask=[value is None for value in values])
+    return array
+
+
+def hex_columns(items, keys):
+    """Decode numeric fields of rpc results, e.g. blocks of
+    ``eth_getBlockByNumber`` or logs of ``eth_getLogs``, into columns.
+
+    .. code:: python
+
+        columns = hex_columns(logs, ('blockNumber', 'logIndex'))
+        columns['blockNumber'].max()
+
+    :param items: Result objects
+    :type items: list of dict
+
+    :param keys: Keys of numeric fields
+    :type keys: list
+
+    :return: :func:`hex_to_array` arrays by key
+    :rtype: dict
+    """
+    return {key: hex_to_array([item[key] for item in items])
+            for key in keys}
+
+
 def wei_to_ether(wei):
     """Convert wei to ether
     """
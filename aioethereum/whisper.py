@@ -0,0 +1,198 @@
+import asyncio
+import logging
+from collections import OrderedDict, namedtuple
+
+from .errors import BadJsonError, BadResponseError
+
+
+logger = logging.getLogger('asyncio_client')
+
+
+WhisperMessage = namedtuple('WhisperMessage', ('filter_id', 'message'))
+
+
+class WhisperStream:
+    """Async iterator over messages of many whisper filters.
+
+    All filters are polled together every ``poll_interval`` seconds, by
+    one batch request when node supports batches. Messages received by
+    several filters are yielded once, hashes of the last ``seen_size``
+    messages are remembered. Polling waits while ``max_size`` messages
+    are not consumed, so messages stay buffered on the node.
+
+    .. code:: python
+
+        stream = client.shh_stream()
+        yield from stream.add_filter(topics=[topic_a])
+        yield from stream.add_filter(topics=[topic_b])
+        async for filter_id, message in stream:
+            handle(message)
+
+    :param client: Client used to poll filters
+    :type client: :class:`aioethereum.BaseAsyncIOClient`
+
+    :param poll_interval: Time between polls in seconds
+    :type poll_interval: float
+
+    :param max_size: Max amount of received messages not consumed yet
+    :type max_size: int
+
+    :param seen_size: Max amount of remembered message hashes
+    :type seen_size: int
+
+    :param loop: An optional *event loop* instance
+                 (uses :func:`asyncio.get_event_loop` if not specified).
+    :type loop: :ref:`EventLoop<asyncio-event-loop>`
+
+    :return: :class:`WhisperStream` instance.
+    """
+
+    def __init__(self, client, poll_interval=1.0, max_size=1000,
+                 seen_size=10000, *, loop=None):
+        self._client = client
+        self._poll_interval = poll_interval
+        self._seen_size = seen_size
+        self._loop = loop or asyncio.get_event_loop()
+        self._queue = asyncio.Queue(max_size, loop=self._loop)
+        self._filters = []
+        self._seen = OrderedDict()
+        self._batch = True
+        self._task = None
+        self._closed = False
+
+    @property
+    def filters(self):
+        """Ids of installed filters.
+
+        :rtype: list
+        """
+        return list(self._filters)
+
+    def __aiter__(self):
+        return self
+
+    @asyncio.coroutine
+    def __anext__(self):
+        try:
+            return (yield from self.get())
+        except LookupError:
+            raise StopAsyncIteration
+
+    @asyncio.coroutine
+    def add_filter(self, to=None, *, topics):
+        """Install filter and poll it with others.
+
+        :param to: Identity of receiver (optional)
+        :type to: str
+
+        :param topics: Topics
+        :type topics: list
+
+        :return: filter_id
+        :rtype: str
+        """
+        filter_id = yield from self._client.rpc_call(
+            'shh_newFilter', [{'to': to, 'topics': topics}])
+        self._filters.append(filter_id)
+        if self._task is None and not self._closed:
+            self._task = asyncio.ensure_future(self._poll(), loop=self._loop)
+        return filter_id
+
+    @asyncio.coroutine
+    def remove_filter(self, filter_id):
+        """Uninstall filter.
+
+        :param filter_id: Id of filter
+        :type filter_id: str
+        """
+        if filter_id in self._filters:
+            self._filters.remove(filter_id)
+            yield from self._client.rpc_call('shh_uninstallFilter',
+                                             [filter_id])
+
+    @asyncio.coroutine
+    def _fetch(self, filters):
+        calls = [('shh_getFilterChanges', [filter_id])
+                 for filter_id in filters]
+        if self._batch:
+            try:
+                return (yield from self._client.rpc_batch(calls))
+            except (BadJsonError, BadResponseError) as e:
+                logger.info('Batch is not supported by node (%r), whisper '
+                            'filters are polled separately.', e)
+                self._batch = False
+        return (yield from asyncio.gather(
+            *[self._client.rpc_call(method, params)
+              for method, params in calls],
+            loop=self._loop, return_exceptions=True))
+
+    def _is_new(self, message):
+        key = message.get('hash')
+        if key is None:
+            return True
+        if key in self._seen:
+            return False
+        self._seen[key] = None
+        if len(self._seen) > self._seen_size:
+            self._seen.popitem(last=False)
+        return True
+
+    @asyncio.coroutine
+    def _poll(self):
+        try:
+            while self._filters:
+                filters = list(self._filters)
+                try:
+                    results = yield from self._fetch(filters)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning('Whisper polling failed: %r.', e)
+                    results = []
+                for filter_id, messages in zip(filters, results):
+                    if isinstance(messages, Exception):
+                        logger.warning('Messages of filter %s are not '
+                                       'received: %r.', filter_id, messages)
+                        continue
+                    for message in messages or ():
+                        if self._is_new(message):
+                            # waits for consumer when queue is full
+                            yield from self._queue.put(
+                                WhisperMessage(filter_id, message))
+                yield from asyncio.sleep(self._poll_interval, loop=self._loop)
+        finally:
+            self._task = None
+
+    @asyncio.coroutine
+    def get(self):
+        """Wait for the next message.
+
+        :return: :class:`WhisperMessage` instance.
+        :raises LookupError: when stream is closed
+        """
+        if self._closed and self._queue.empty():
+            raise LookupError('Stream is closed.')
+        item = yield from self._queue.get()
+        if item is None:
+            raise LookupError('Stream is closed.')
+        return item
+
+    @asyncio.coroutine
+    def close(self):
+        """Stop polling and uninstall filters.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for filter_id in list(self._filters):
+            try:
+                yield from self.remove_filter(filter_id)
+            except BadResponseError as e:
+                logger.debug('Filter %s is not uninstalled: %r.',
+                             filter_id, e)
+        # wake up waiting consumer
+        if self._queue.empty():
+            self._queue.put_nowait(None)
@@ -73,5 +73,15 @@ setup(
     license="MIT",
     packages=find_packages(exclude=["tests"]),
     install_requires=install_requires,
+    extras_require={
+        'numpy': ['numpy'],
+        'export': ['pyarrow'],
+        'crypto': ['coincurve', 'pycryptodome'],
+    },
+    entry_points={
+        'console_scripts': [
+            'aioethereum-export = aioethereum.export:main',
+        ],
+    },
     include_package_data=True,
 )
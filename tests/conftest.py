@@ -10,6 +10,8 @@ from urllib.error import URLError
 
 import pytest
 import aioethereum
+from aioethereum.errors import BadResponseError
+from aioethereum.management import RpcMixin
 
 
 NodeServer = namedtuple('NodeServer',
@@ -58,6 +60,57 @@ def create_ethereum_client(loop):
     return f
 
 
+class FakeClient(aioethereum.BaseAsyncIOClient, RpcMixin):
+    """Answers requests by handlers of methods.
+
+    Handler is called with params of request and returns result, it can be
+    a coroutine function. :class:`BadResponseError` raised by handler is
+    answered as error.
+    """
+
+    def __init__(self, handlers=None, batch=True, *, loop, **kwargs):
+        super().__init__(loop=loop, **kwargs)
+        self.handlers = dict(handlers or {})
+        self.batch_supported = batch
+        self.requests = []
+
+    @asyncio.coroutine
+    def _request(self, data):
+        self.requests.append(data)
+        if not isinstance(data, list):
+            return (yield from self._response(data))
+        if not self.batch_supported:
+            return {'jsonrpc': '2.0', 'id': None, 'error': {
+                'code': -32600, 'message': 'batch is not supported'}}
+        responses = []
+        for item in data:
+            responses.append((yield from self._response(item)))
+        return responses
+
+    @asyncio.coroutine
+    def _response(self, data):
+        handler = self.handlers.get(data['method'])
+        try:
+            if handler is None:
+                raise BadResponseError('method not found', -32601)
+            result = handler(*data['params'])
+            if asyncio.iscoroutine(result):
+                result = yield from result
+        except BadResponseError as e:
+            return {'jsonrpc': '2.0', 'id': data['id'],
+                    'error': {'code': e.code, 'message': e.msg}}
+        return {'jsonrpc': '2.0', 'id': data['id'], 'result': result}
+
+
+@pytest.fixture
+def fake_client(loop):
+    """Creates :class:`FakeClient` with handlers of methods."""
+
+    def f(handlers=None, **kw):
+        return FakeClient(handlers, loop=loop, **kw)
+    return f
+
+
 @pytest.fixture(scope='session')
 def server(unused_port):
     try:
@@ -82,7 +135,7 @@ def server(unused_port):
         assert process.returncode == 0, stdout.decode('utf-8')
 
         base_uri = 'http://%s:%s' % (host, port)
-        ws_uri = 'http://%s:%s' % (host, wsport)
+        ws_uri = 'ws://%s:%s' % (host, wsport)
         tried = 0
         max_tries = 5
         while tried < max_tries:
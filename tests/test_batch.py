@@ -0,0 +1,52 @@
+import pytest
+
+from aioethereum.errors import BadResponseError
+
+
+@pytest.mark.run_loop
+def test_rpc_batch(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop)
+    results = yield from client.rpc_batch([
+        ('eth_coinbase', []),
+        ('test_method', []),
+        ('eth_getBalance', [server.coinbase, 'latest']),
+    ])
+    assert len(results) == 3
+    assert results[0] == server.coinbase
+    assert isinstance(results[1], BadResponseError)
+    assert results[2].startswith('0x')
+
+
+@pytest.mark.run_loop
+def test_rpc_batch_empty(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop)
+    results = yield from client.rpc_batch([])
+    assert results == []
+
+
+@pytest.mark.run_loop
+def test_batch_builder(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.unixsocket,
+                                               loop=loop)
+    batch = client.batch()
+    assert batch.eth_getBalance(server.coinbase) == 0
+    assert batch.eth_blockNumber() == 1
+    assert batch.add('test_method') == 2
+    assert len(batch) == 3
+
+    balance, bnumber, error = yield from batch.execute()
+    assert isinstance(balance, int)
+    assert isinstance(bnumber, int)
+    assert isinstance(error, BadResponseError)
+    assert len(batch) == 0
+
+
+def test_batch_builder_validates_params(create_ethereum_client, loop, server):
+    client = loop.run_until_complete(create_ethereum_client(
+        server.http_address, loop=loop))
+    batch = client.batch()
+    with pytest.raises(ValueError):
+        batch.eth_getBalance(server.coinbase, block='incorrect')
+    assert len(batch) == 0
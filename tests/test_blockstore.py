@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from aioethereum.blockstore import BlockStore
+from aioethereum.models import Block
+
+
+def make_block(number, transactions=1):
+    return {
+        'number': hex(number),
+        'hash': '0x{0:064X}'.format(number + 1),
+        'parentHash': '0x{0:064x}'.format(number),
+        'transactions': [{'hash': '0x{0:062x}{1:02x}'.format(number, index),
+                          'value': '0x1'}
+                         for index in range(transactions)],
+    }
+
+
+def test_put_get(tmpdir):
+    store = BlockStore(str(tmpdir), segment_size=512)
+    for number in range(20):
+        store.put(make_block(number))
+    assert store.last == 19
+    assert 5 in store and 20 not in store
+    assert store.get_by_number(5) == make_block(5)
+    assert store.get_by_number(5, False)['transactions'] == [
+        make_block(5)['transactions'][0]['hash']]
+    assert store.get_by_hash(make_block(7)['hash'].lower()) == make_block(7)
+    assert store.get_by_number(20) is None
+    assert len(tmpdir.listdir('segment-*')) > 1
+
+    store.put(Block(make_block(5, transactions=2)))
+    assert len(store.get_by_number(5)['transactions']) == 2
+    store.remove(19)
+    assert store.last == 18
+    assert store.get_by_hash(make_block(19)['hash']) is None
+    store.close()
+
+    store = BlockStore(str(tmpdir))
+    assert store.last == 18
+    assert store.get_by_number(12) == make_block(12)
+    store.close()
+
+
+def test_stored_without_objects(tmpdir):
+    store = BlockStore(str(tmpdir))
+    block = make_block(3)
+    block['transactions'] = [tx['hash'] for tx in block['transactions']]
+    store.put(block)
+    assert store.get_by_number(3, False) == block
+    assert store.get_by_number(3) is None
+    store.close()
+
+
+@pytest.mark.run_loop
+def test_sync(create_ethereum_client, loop, server, tmpdir):
+    store = BlockStore(str(tmpdir))
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop, block_store=store)
+    yield from asyncio.wait_for(store.sync(client, end=2, confirmations=0),
+                                30, loop=loop)
+    assert store.last == 2
+
+    block = yield from client.eth_getBlockByNumber(1)
+    assert block == store.get_by_number(1)
+    block = yield from client.eth_getBlockByHash(block['hash'], False)
+    assert block == store.get_by_number(1, False)
+    store.close()
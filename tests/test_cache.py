@@ -0,0 +1,146 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from aioethereum.cache import (
+    LRUCache, DiskCache, TTLCache, cache_key, is_cacheable,
+    is_cacheable_result)
+
+
+def test_is_cacheable():
+    assert is_cacheable('eth_getBlockByHash', ['0x1', True])
+    assert is_cacheable('eth_getBalance', ['0x1', hex(10)])
+    assert not is_cacheable('eth_getBalance', ['0x1', 'latest'])
+    assert not is_cacheable('eth_getBalance', ['0x1', 'pending'])
+    assert not is_cacheable('eth_blockNumber', [])
+
+    assert not is_cacheable_result('eth_getTransactionReceipt', None)
+    assert not is_cacheable_result('eth_getTransactionByHash',
+                                   {'blockHash': None})
+    assert is_cacheable_result('eth_getTransactionByHash',
+                               {'blockHash': '0x1'})
+
+
+def test_cache_key():
+    assert (cache_key('eth_call', [{'to': '0x1', 'from': '0x2'}, '0x1']) ==
+            cache_key('eth_call', [{'from': '0x2', 'to': '0x1'}, '0x1']))
+
+
+def test_lru_cache():
+    cache = LRUCache(max_items=2)
+    cache.set('a', '1')
+    cache.set('b', '2')
+    assert cache.get('a') == '1'
+    cache.set('c', '3')
+    assert cache.get('b') is None
+    assert cache.get('c') == '3'
+    assert len(cache) == 2
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_lru_cache_bytes_limit():
+    cache = LRUCache(max_bytes=10)
+    cache.set('a', '1234')
+    cache.set('b', '1234')
+    assert cache.nbytes == 10
+    cache.set('c', '1234')
+    assert cache.get('a') is None
+    assert cache.nbytes == 10
+    cache.set('d', '1' * 10)
+    assert cache.get('d') is None
+
+
+def test_disk_cache(tmpdir):
+    path = str(tmpdir.join('cache'))
+    cache = DiskCache(path)
+    cache.set('a', '1')
+    cache.close()
+
+    cache = DiskCache(path)
+    assert cache.get('a') == '1'
+    assert cache.get('b') is None
+    cache.close()
+
+
+@pytest.mark.run_loop
+def test_cached_rpc_call(create_ethereum_client, loop, server):
+    cache = LRUCache()
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop, cache=cache)
+    block = yield from client.eth_getBlockByNumber(0)
+    assert cache.misses == 0
+
+    result = yield from client.eth_getBlockByHash(block['hash'])
+    assert result == block
+    result = yield from client.eth_getBlockByHash(block['hash'])
+    assert result == block
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    yield from client.eth_getBalance(server.coinbase)
+    assert len(cache) == 1
+
+
+def test_ttl_cache(loop):
+    cache = TTLCache({'eth_gasPrice': 10, 'eth_blockNumber': 0}, loop=loop)
+    assert 'eth_gasPrice' in cache
+    assert 'eth_getBalance' not in cache
+
+    cache.set('gas', 'eth_gasPrice', '0x1')
+    cache.set('bnumber', 'eth_blockNumber', '0x1')
+    assert cache.get('gas') == '0x1'
+    assert cache.get('bnumber') is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    cache.observe_block('0x1')
+    assert cache.get('gas') == '0x1'
+    cache.observe_block('0x2')
+    assert cache.get('gas') is None
+    assert len(cache) == 0
+
+
+@pytest.mark.run_loop
+def test_single_flight_rpc_call(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop, single_flight=True)
+    with mock.patch.object(client, '_send_call',
+                           wraps=client._send_call) as send_call:
+        results = yield from asyncio.gather(
+            *[client.eth_coinbase() for _ in range(10)], loop=loop)
+        assert results == [server.coinbase] * 10
+        assert send_call.call_count == 1
+    assert not client._inflight
+
+
+@pytest.mark.run_loop
+def test_shared_results_are_copied(fake_client, loop):
+    blocks = []
+
+    def get_block(number, tx_objects):
+        blocks.append(number)
+        return {'number': number, 'transactions': []}
+
+    client = fake_client({'eth_getBlockByNumber': get_block},
+                         single_flight=True,
+                         ttl={'eth_getBlockByNumber': 60})
+    first, second = yield from asyncio.gather(
+        client.eth_getBlockByNumber(1), client.eth_getBlockByNumber(1),
+        loop=loop)
+    first['transactions'].append('0x1')
+    assert second == {'number': '0x1', 'transactions': []}
+    second['number'] = None
+    cached = yield from client.eth_getBlockByNumber(1)
+    assert cached == {'number': '0x1', 'transactions': []}
+    assert blocks == ['0x1']
+
+
+@pytest.mark.run_loop
+def test_ttl_rpc_call(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(
+        server.http_address, loop=loop,
+        ttl={'eth_gasPrice': 60, 'eth_blockNumber': 60})
+    gas_price = yield from client.eth_gasPrice()
+    bnumber = yield from client.eth_blockNumber()
+    assert (yield from client.eth_gasPrice()) == gas_price
+    assert client.ttl_cache.hits == 1
+    assert client.ttl_cache.block_number == hex(bnumber)
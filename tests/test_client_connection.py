@@ -28,3 +28,14 @@ def test_connect_unixsocket(create_ethereum_client, loop, server):
     assert isinstance(writer, asyncio.StreamWriter)
 
     assert client._unix_path == server.unixsocket
+
+
+@pytest.mark.run_loop
+def test_connect_websocket(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.ws_address,
+                                               loop=loop)
+    assert isinstance(client, aioethereum.AsyncIOWSClient)
+    assert not client._ws.closed
+
+    yield from client.close()
+    assert client._ws is None
@@ -0,0 +1,42 @@
+import asyncio
+
+import pytest
+
+from aioethereum.errors import BadResponseError
+
+
+@pytest.mark.run_loop
+def test_coalesced_calls(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop,
+                                               coalesce_window=0.01,
+                                               coalesce_limit=10)
+    results = yield from asyncio.gather(
+        *[client.eth_coinbase() for _ in range(25)], loop=loop)
+    assert results == [server.coinbase] * 25
+
+    stats = client.coalescer.stats
+    assert stats['calls'] == 25
+    assert stats['batches'] == 3
+    assert stats['max_size'] == 10
+    assert stats['sizes'] == {10: 2, 5: 1}
+
+
+@pytest.mark.run_loop
+def test_coalesced_calls_with_error(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.unixsocket,
+                                               loop=loop,
+                                               coalesce_window=0.01)
+    coinbase, error = yield from asyncio.gather(
+        client.eth_coinbase(), client.rpc_call('test_method'),
+        loop=loop, return_exceptions=True)
+    assert coinbase == server.coinbase
+    assert isinstance(error, BadResponseError)
+    assert client.coalescer.stats['batches'] == 1
+
+
+@pytest.mark.run_loop
+def test_coalescing_disabled(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop)
+    assert client.coalescer is None
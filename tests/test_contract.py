@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from aioethereum.abi import (
+    _Codec,
+    canonical_type,
+    decode_abi,
+    encode_abi,
+)
+from aioethereum.contract import Contract
+
+
+ABI = [
+    {'type': 'function', 'name': 'balanceOf',
+     'inputs': [{'name': 'owner', 'type': 'address'}],
+     'outputs': [{'name': '', 'type': 'uint256'}]},
+    {'type': 'function', 'name': 'f',
+     'inputs': [{'type': 'uint'}, {'type': 'uint32[]'},
+                {'type': 'bytes10'}, {'type': 'bytes'}],
+     'outputs': []},
+    {'type': 'function', 'name': 'f', 'inputs': [],
+     'outputs': [{'type': 'bool'}, {'type': 'string'}]},
+    {'type': 'event', 'name': 'Transfer', 'inputs': []},
+]
+OWNER = '0x' + '22' * 20
+
+
+def word(value):
+    return '{0:064x}'.format(value)
+
+
+class FakeClient:
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    @asyncio.coroutine
+    def eth_call(self, from_, to=None, data=None, block=None):
+        self.calls.append((from_, to, data, block))
+        return self.result
+
+
+def test_encode_abi():
+    # example of solidity ABI specification
+    contract = Contract(None, OWNER, ABI)
+    call = contract.functions['f(uint256,uint32[],bytes10,bytes)'](
+        0x123, [0x456, 0x789], b'1234567890', b'Hello, world!')
+    assert call.data == '0x8be65246' + ''.join([
+        word(0x123), word(0x80),
+        '3132333435363738393000000000000000000000000000000000000000000000',
+        word(0xe0), word(2), word(0x456), word(0x789), word(13),
+        '48656c6c6f2c20776f726c642100000000000000000000000000000000000000',
+    ])
+    with pytest.raises(TypeError):
+        contract.functions.f(1)
+    with pytest.raises(ValueError):
+        contract.functions.balanceOf('0x12')
+
+
+def test_decode_abi():
+    types = ['uint256[2][]', 'int8', 'address', '(uint256,string[])',
+             'bytes3']
+    values = ([[1, 2], [3, 4]], -5, OWNER, (5, ['a', 'bc']), b'abc')
+    assert decode_abi(types, encode_abi(types, values)) == values
+    with pytest.raises(ValueError):
+        decode_abi(['uint256', 'uint256'], '0x' + word(1))
+    assert canonical_type('tuple[]', [{'type': 'uint'},
+                                      {'type': 'bool'}]) == '(uint256,bool)[]'
+
+
+def test_incomplete_codec():
+
+    class Codec(_Codec):
+
+        def encode(self, value):
+            return b''
+
+    with pytest.raises(TypeError):
+        Codec()
+
+
+@pytest.mark.run_loop
+def test_call(loop):
+    client = FakeClient('0x' + word(1) + word(0x40) + word(2) +
+                        '6869' + '00' * 30)
+    contract = Contract(client, OWNER, ABI)
+    assert (yield from contract.functions.f().call(5)) == (True, 'hi')
+    assert client.calls == [(None, OWNER, '0x26121ff0', 5)]
+
+    client.result = '0x' + word(10 ** 18)
+    balance = yield from contract.functions.balanceOf(OWNER).call()
+    assert balance == 10 ** 18
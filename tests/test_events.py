@@ -0,0 +1,107 @@
+import pytest
+
+from aioethereum.abi import encode_abi
+from aioethereum.events import EventDecoder
+from aioethereum.models import Log
+
+
+TOKEN = '0x' + '11' * 20
+SENDER = '0x' + '22' * 20
+RECEIVER = '0x' + '33' * 20
+# keccak256 of Transfer(address,address,uint256)
+TRANSFER_TOPIC = (
+    '0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef')
+
+ERC20_TRANSFER = {
+    'type': 'event', 'name': 'Transfer', 'anonymous': False,
+    'inputs': [{'name': 'from', 'type': 'address', 'indexed': True},
+               {'name': 'to', 'type': 'address', 'indexed': True},
+               {'name': 'value', 'type': 'uint256', 'indexed': False}],
+}
+ERC721_TRANSFER = {
+    'type': 'event', 'name': 'Transfer', 'anonymous': False,
+    'inputs': [{'name': 'from', 'type': 'address', 'indexed': True},
+               {'name': 'to', 'type': 'address', 'indexed': True},
+               {'name': 'tokenId', 'type': 'uint256', 'indexed': True}],
+}
+NOTE = {
+    'type': 'event', 'name': 'Note',
+    'inputs': [{'name': 'tag', 'type': 'string', 'indexed': True},
+               {'name': 'text', 'type': 'string', 'indexed': False},
+               {'name': 'values', 'type': 'uint8[]', 'indexed': False}],
+}
+PAIR = {
+    'type': 'event', 'name': 'Pair',
+    'inputs': [{'name': 'pair', 'type': 'uint256[2]', 'indexed': True},
+               {'name': 'point', 'type': 'tuple', 'indexed': True,
+                'components': [{'name': 'x', 'type': 'uint256'},
+                               {'name': 'owner', 'type': 'address'}]}],
+}
+
+
+def topic(address):
+    return '0x' + '00' * 12 + address[2:]
+
+
+def make_log(topics, data=b'', address=TOKEN):
+    return {'address': address, 'topics': topics,
+            'data': '0x' + data.hex(), 'logIndex': '0x0'}
+
+
+def test_decode():
+    decoder = EventDecoder()
+    decoder.register(ERC20_TRANSFER)
+    decoder.register(ERC721_TRANSFER)
+    note = decoder.register(NOTE, address=TOKEN)
+
+    log = make_log([TRANSFER_TOPIC, topic(SENDER), topic(RECEIVER)],
+                   encode_abi(['uint256'], [10 ** 18]))
+    event = decoder.decode(log)
+    assert event.name == 'Transfer'
+    assert event.signature == 'Transfer(address,address,uint256)'
+    assert event.args == {'from': SENDER, 'to': RECEIVER, 'value': 10 ** 18}
+    assert decoder.decode(Log(log)).args == event.args
+
+    log = make_log([TRANSFER_TOPIC, topic(SENDER), topic(RECEIVER),
+                    '0x' + '00' * 31 + '07'])
+    assert decoder.decode(log).args['tokenId'] == 7
+
+    note_log = make_log(['0x' + note.topic.hex(), '0x' + 'ab' * 32],
+                        encode_abi(['string', 'uint8[]'], ['hi', [1, 2]]))
+    assert decoder.decode(note_log).args == {
+        'tag': b'\xab' * 32, 'text': 'hi', 'values': [1, 2]}
+    assert decoder.decode(dict(note_log, address=SENDER)) is None
+
+    assert decoder.decode(make_log(['0x' + '00' * 32])) is None
+    assert decoder.decode(make_log([])) is None
+
+
+def test_decode_hashed_indexed():
+    decoder = EventDecoder()
+    pair = decoder.register(PAIR)
+    assert pair.signature == 'Pair(uint256[2],(uint256,address))'
+
+    log = make_log(['0x' + pair.topic.hex(), '0x' + 'ab' * 32,
+                    '0x' + 'cd' * 32])
+    assert decoder.decode(log).args == {
+        'pair': b'\xab' * 32, 'point': b'\xcd' * 32}
+
+
+@pytest.mark.run_loop
+def test_dispatch(loop):
+    decoder = EventDecoder()
+    decoder.register_abi([ERC20_TRANSFER, {'type': 'function', 'name': 'f'}])
+    received = []
+
+    def handler(event):
+        received.append(event.args['value'])
+        yield
+
+    decoder.on('Transfer', handler)
+    decoder.on('Transfer(address,address,uint256)', handler)
+    logs = [make_log([TRANSFER_TOPIC, topic(SENDER), topic(RECEIVER)],
+                     encode_abi(['uint256'], [value]))
+            for value in range(3)]
+    logs.append(make_log(['0x' + '00' * 32]))
+    assert (yield from decoder.dispatch(logs)) == 3
+    assert received == [0, 0, 1, 1, 2, 2]
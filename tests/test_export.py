@@ -0,0 +1,76 @@
+import asyncio
+import json
+import os
+
+import pytest
+
+pa = pytest.importorskip('pyarrow')
+
+from aioethereum.errors import BadResponseError  # noqa
+from aioethereum.export import FORMAT_ARROW, Exporter  # noqa
+
+
+@pytest.mark.run_loop
+def test_export_parquet(create_ethereum_client, loop, server, tmpdir):
+    import pyarrow.parquet as pq
+
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop)
+    path = str(tmpdir)
+    exporter = Exporter(client, path, 0, 4, chunk_size=2, loop=loop)
+    report = yield from exporter.run()
+    assert report['blocks'] == 5
+    assert report['blocks_per_second'] > 0
+
+    assert sorted(os.listdir(os.path.join(path, 'blocks'))) == [
+        '000000000000-000000000001.parquet',
+        '000000000002-000000000003.parquet',
+        '000000000004-000000000004.parquet',
+    ]
+    blocks = pq.read_table(os.path.join(path, 'blocks'))
+    assert sorted(blocks.column('number').to_pylist()) == [0, 1, 2, 3, 4]
+    for table in ('transactions', 'receipts', 'logs'):
+        assert os.path.isdir(os.path.join(path, table))
+
+    with open(os.path.join(path, 'checkpoint.json')) as f:
+        assert json.load(f)['next_block'] == 5
+
+
+@pytest.mark.run_loop
+def test_export_resume(create_ethereum_client, loop, server, tmpdir):
+    client = yield from create_ethereum_client(server.unixsocket, loop=loop)
+    path = str(tmpdir)
+    exporter = Exporter(client, path, 0, 1, FORMAT_ARROW, receipts=False,
+                        loop=loop)
+    yield from exporter.run()
+
+    exporter = Exporter(client, path, 0, 3, FORMAT_ARROW, receipts=False,
+                        loop=loop)
+    report = yield from exporter.run()
+    assert report['blocks'] == 2
+    assert not os.path.exists(os.path.join(path, 'receipts'))
+
+    reader = pa.ipc.open_file(os.path.join(
+        path, 'blocks', '000000000002-000000000003.arrow'))
+    assert reader.read_all().column('number').to_pylist() == [2, 3]
+
+
+@pytest.mark.run_loop
+def test_export_failed_chunk(loop, fake_client, tmpdir):
+    fetched = []
+
+    @asyncio.coroutine
+    def block(number, tx_objects):
+        if number == '0x0':
+            raise BadResponseError('header not found', -32000)
+        yield from asyncio.sleep(0.05, loop=loop)
+        fetched.append(number)
+        return {'number': number, 'transactions': []}
+
+    client = fake_client({'eth_getBlockByNumber': block})
+    exporter = Exporter(client, str(tmpdir), 0, 3, loop=loop)
+    with pytest.raises(BadResponseError):
+        yield from exporter.run()
+    yield from asyncio.sleep(0.1, loop=loop)
+    # fetches of the rest of chunk are cancelled
+    assert not fetched
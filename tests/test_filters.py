@@ -0,0 +1,124 @@
+import asyncio
+import itertools
+
+import pytest
+
+from aioethereum.errors import BadResponseError
+
+
+class Chain:
+    """In-memory chain keeping filters, which can be expired."""
+
+    def __init__(self):
+        self.head = 5
+        self.head_errors = 0
+        self.filters = {}
+        self._ids = itertools.count(1)
+
+    def handlers(self):
+        return {'eth_blockNumber': self.block_number,
+                'eth_newFilter': self.new_filter,
+                'eth_newBlockFilter': self.new_block_filter,
+                'eth_getFilterChanges': self.filter_changes,
+                'eth_getLogs': self.logs,
+                'eth_getBlockByNumber': self.block,
+                'eth_uninstallFilter': self.uninstall_filter}
+
+    def mine(self):
+        self.head += 1
+        for changes in self.filters.values():
+            changes.append(self.head)
+
+    def log(self, number):
+        return {'blockNumber': hex(number), 'blockHash': self.hash(number),
+                'logIndex': '0x0', 'data': '0x'}
+
+    def hash(self, number):
+        return '0x{0:064x}'.format(number)
+
+    def block_number(self):
+        if self.head_errors:
+            self.head_errors -= 1
+            raise BadResponseError('head is unknown', -32000)
+        return hex(self.head)
+
+    def _install(self, kind):
+        filter_id = hex(next(self._ids))
+        self.filters[filter_id] = [kind]
+        return filter_id
+
+    def new_filter(self, params):
+        return self._install('logs')
+
+    def new_block_filter(self):
+        return self._install('blocks')
+
+    def filter_changes(self, filter_id):
+        if filter_id not in self.filters:
+            raise BadResponseError('filter not found', -32000)
+        kind, *numbers = self.filters[filter_id]
+        self.filters[filter_id] = [kind]
+        if kind == 'logs':
+            return [self.log(number) for number in numbers]
+        return [self.hash(number) for number in numbers]
+
+    def logs(self, params):
+        return [self.log(number) for number in range(
+            int(params['fromBlock'], 16), int(params['toBlock'], 16) + 1)]
+
+    def block(self, number, tx_objects):
+        return {'hash': self.hash(int(number, 16))}
+
+    def uninstall_filter(self, filter_id):
+        return self.filters.pop(filter_id, None) is not None
+
+
+@pytest.mark.run_loop
+def test_filter_manager(loop, fake_client):
+    chain = Chain()
+    client = fake_client(chain.handlers())
+    manager = client.filter_manager(poll_interval=0.01)
+    logs = yield from manager.new_filter(address='0x' + '11' * 20)
+    blocks = yield from manager.new_block_filter()
+    assert len(manager) == 2
+
+    chain.mine()
+    log = yield from asyncio.wait_for(logs.get(), 1, loop=loop)
+    assert log['blockNumber'] == '0x6'
+    assert (yield from asyncio.wait_for(blocks.get(), 1, loop=loop)) == (
+        chain.hash(6))
+
+    # node forgets filters, two blocks are mined before they are polled
+    chain.filters.clear()
+    chain.mine()
+    chain.mine()
+    received = []
+    for _ in range(2):
+        received.append((yield from asyncio.wait_for(logs.get(), 1,
+                                                     loop=loop)))
+    assert [item['blockNumber'] for item in received] == ['0x7', '0x8']
+    received = []
+    for _ in range(2):
+        received.append((yield from asyncio.wait_for(blocks.get(), 1,
+                                                     loop=loop)))
+    assert received == [chain.hash(7), chain.hash(8)]
+
+    # changes are not lost when head is not received
+    chain.head_errors = 1
+    chain.mine()
+    log = yield from asyncio.wait_for(logs.get(), 1, loop=loop)
+    assert log['blockNumber'] == '0x9'
+    assert (yield from asyncio.wait_for(blocks.get(), 1, loop=loop)) == (
+        chain.hash(9))
+    assert not chain.head_errors
+
+    # filters are polled only together with head
+    assert not any(data['method'] == 'eth_getFilterChanges'
+                   for data in client.requests if isinstance(data, dict))
+
+    yield from blocks.close()
+    assert len(manager) == 1
+    with pytest.raises(LookupError):
+        yield from blocks.get()
+    yield from manager.close()
+    assert not chain.filters
@@ -82,3 +82,39 @@ def test_rpc_call_with_bad_result(create_ethereum_client, loop, server):
         assert list(patched.call_args)[0] == ('POST', server.http_address)
         assert -999999 == excinfo.value.code
         assert 'bad' == excinfo.value.msg
+
+
+@pytest.mark.run_loop
+def test_rpc_call_reuses_session(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop, limit=10)
+    yield from client.web3_clientVersion()
+    session = client._session
+    assert session.connector.limit == 10
+
+    yield from client.web3_clientVersion()
+    assert client._session is session
+
+    yield from client.close()
+    assert session.closed
+    assert client._session is None
+
+
+@pytest.mark.run_loop
+def test_rpc_stream(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop)
+    pool = yield from client.txpool_content()
+    stream = yield from client.rpc_stream('txpool_content', chunk_size=16)
+    items = []
+    while True:
+        try:
+            items.append((yield from stream.get()))
+        except LookupError:
+            break
+    assert dict(items) == pool['pending']
+
+    stream = yield from client.rpc_stream('test_method')
+    with pytest.raises(BadResponseError):
+        yield from stream.get()
+    yield from client.close()
@@ -1,9 +1,11 @@
 import sys
+import json
 from unittest import mock
 import asyncio
 
 import pytest
 
+from aioethereum import AsyncIOIPCPool
 from aioethereum.errors import BadJsonError, BadResponseError
 
 
@@ -65,3 +67,198 @@ def test_rpc_call_with_bad_result(create_ethereum_client, loop, server):
 
             with pytest.raises(BadResponseError):
                 yield from client.rpc_call('test_method')
+
+
+@pytest.mark.run_loop
+@pytest.mark.skipif(sys.platform == 'win32',
+                    reason='No unixsocket on Windows')
+def test_rpc_call_pipelining(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.unixsocket,
+                                               loop=loop)
+    writer = client._writer
+
+    results = yield from asyncio.gather(
+        *[client.rpc_call('eth_coinbase') for _ in range(50)], loop=loop)
+
+    assert results == [server.coinbase] * 50
+    assert client._writer is writer
+    assert not client._pending
+
+
+@pytest.mark.run_loop
+@pytest.mark.skipif(sys.platform == 'win32',
+                    reason='No unixsocket on Windows')
+def test_rpc_stream(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.unixsocket,
+                                               loop=loop)
+    accounts = yield from client.eth_accounts()
+    stream = yield from client.rpc_stream('eth_accounts', chunk_size=16)
+    items = []
+    while True:
+        try:
+            items.append((yield from stream.get()))
+        except LookupError:
+            break
+    assert items == accounts
+
+    stream = yield from client.rpc_stream('test_method')
+    with pytest.raises(BadResponseError):
+        yield from stream.get()
+
+
+@asyncio.coroutine
+def _start_node(path, writers, *, loop, delay=0):
+    """Fake node answering every request with '0x1' after delay.
+
+    Subscription '0x9' is answered by notification with id of every
+    following request, sent before its answer.
+    """
+
+    def send(writer, message):
+        writer.write(json.dumps(message).encode('utf-8') + b'\n')
+
+    @asyncio.coroutine
+    def answer(writer, request, subscribed):
+        if subscribed:
+            send(writer, {'jsonrpc': '2.0', 'method': 'eth_subscription',
+                          'params': {'subscription': '0x9',
+                                     'result': request['id']}})
+        yield from asyncio.sleep(delay, loop=loop)
+        result = '0x1'
+        if request['method'] == 'eth_subscribe':
+            subscribed.append(request['id'])
+            result = '0x9'
+        send(writer, {'jsonrpc': '2.0', 'id': request['id'],
+                      'result': result})
+
+    @asyncio.coroutine
+    def handle(reader, writer):
+        writers.append(writer)
+        decoder = json.JSONDecoder()
+        buf = ''
+        subscribed = []
+        while True:
+            data = yield from reader.read(4096)
+            if not data:
+                break
+            buf += data.decode('utf-8')
+            while buf:
+                try:
+                    request, end = decoder.raw_decode(buf)
+                except ValueError:
+                    break
+                buf = buf[end:]
+                asyncio.ensure_future(answer(writer, request, subscribed),
+                                      loop=loop)
+
+    return (yield from asyncio.start_unix_server(handle, path, loop=loop))
+
+
+@pytest.mark.run_loop
+@pytest.mark.skipif(sys.platform == 'win32',
+                    reason='No unixsocket on Windows')
+def test_reconnect(create_ethereum_client, loop, tmpdir):
+    path = str(tmpdir.join('node.ipc'))
+    writers = []
+
+    node = yield from _start_node(path, writers, loop=loop)
+    client = yield from create_ethereum_client(
+        'ipc://' + path, loop=loop, timeout=5, reconnect_delay=0.01)
+    events = []
+    client.add_connection_listener(lambda event, stats: events.append(event))
+    assert (yield from client.eth_blockNumber()) == 1
+
+    # node restarts
+    node.close()
+    yield from node.wait_closed()
+    for writer in writers:
+        writer.close()
+    yield from asyncio.sleep(0.01, loop=loop)
+
+    with pytest.raises(ConnectionError):
+        yield from client.rpc_call('eth_sendRawTransaction', ['0x00'])
+    calls = [asyncio.ensure_future(client.eth_blockNumber(), loop=loop)
+             for _ in range(3)]
+    yield from asyncio.sleep(0.1, loop=loop)
+    assert not any(call.done() for call in calls)
+    assert client.stats['failed_attempts'] > 1
+
+    node = yield from _start_node(path, writers, loop=loop)
+    assert (yield from asyncio.gather(*calls, loop=loop)) == [1, 1, 1]
+    assert events == ['disconnected', 'reconnected']
+    assert client.stats['disconnects'] == client.stats['reconnects'] == 1
+    yield from client.close()
+    node.close()
+    for writer in writers:
+        writer.close()
+
+
+@pytest.mark.run_loop
+@pytest.mark.skipif(sys.platform == 'win32',
+                    reason='No unixsocket on Windows')
+def test_pool(create_ethereum_client, loop, tmpdir):
+    path = str(tmpdir.join('node.ipc'))
+    writers = []
+    node = yield from _start_node(path, writers, loop=loop, delay=0.05)
+    client = yield from create_ethereum_client(
+        'ipc://' + path, loop=loop, timeout=5, pool_size=2, pool_maxsize=4,
+        pool_busy=2)
+    assert isinstance(client, AsyncIOIPCPool)
+    assert len(client) == 2
+
+    # requests are spread over the least busy connections
+    calls = [asyncio.ensure_future(client.eth_blockNumber(), loop=loop)
+             for _ in range(4)]
+    yield from asyncio.sleep(0.01, loop=loop)
+    assert [len(connection._pending)
+            for connection in client.connections] == [2, 2]
+    assert (yield from asyncio.gather(*calls, loop=loop)) == [1] * 4
+
+    # busy pool grows up to pool_maxsize
+    for _ in range(3):
+        yield from asyncio.gather(
+            *[client.eth_blockNumber() for _ in range(20)], loop=loop)
+    assert len(client) == 4
+    assert client.stats['connections'] == 4
+
+    # disconnected connection is skipped
+    lost = client.connections[0]
+    lost._connected.clear()
+    assert all(client._choose() is not lost for _ in range(10))
+    lost._connected.set()
+
+    yield from client.close()
+    assert not len(client)
+    node.close()
+    for writer in writers:
+        writer.close()
+
+
+@pytest.mark.run_loop
+@pytest.mark.skipif(sys.platform == 'win32',
+                    reason='No unixsocket on Windows')
+def test_subscribe(create_ethereum_client, loop, tmpdir):
+    path = str(tmpdir.join('node.ipc'))
+    writers = []
+    node = yield from _start_node(path, writers, loop=loop, delay=0.01)
+    client = yield from create_ethereum_client('ipc://' + path, loop=loop,
+                                               timeout=5)
+    subscription = yield from client.subscribe('newHeads')
+    assert subscription.id == '0x9'
+
+    # notifications are not taken as answers of requests
+    results = yield from asyncio.gather(
+        *[client.eth_blockNumber() for _ in range(3)], loop=loop)
+    assert results == [1, 1, 1]
+    notified = []
+    for _ in range(3):
+        notified.append((yield from asyncio.wait_for(
+            subscription.get(), 1, loop=loop)))
+    assert len(set(notified)) == 3
+
+    yield from client.close()
+    with pytest.raises(ConnectionError):
+        yield from subscription.get()
+    node.close()
+    for writer in writers:
+        writer.close()
@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from aioethereum.errors import BadResponseError
+from aioethereum.jsonstream import JSONStreamParser
+
+
+LOGS = [{'address': '0x%x' % i, 'data': '0x' + 'ab' * i,
+         'topics': ['0x\\"]}', '{['], 'removed': False}
+        for i in range(20)]
+
+
+def parse(document, path=('result',), size=1):
+    parser = JSONStreamParser(path)
+    data = json.dumps(document).encode('utf-8')
+    items = []
+    for i in range(0, len(data), size):
+        items.extend(parser.feed(data[i:i + size]))
+    assert parser.done
+    return items, parser
+
+
+@pytest.mark.parametrize('size', [1, 3, 64, 100000])
+def test_array_items(size):
+    items, parser = parse({'jsonrpc': '2.0', 'id': 1, 'result': LOGS},
+                          size=size)
+    assert items == LOGS
+    assert parser.error is None
+    assert len(parser._buf) < 1000
+
+
+@pytest.mark.parametrize('size', [1, 7])
+def test_nested_items(size):
+    trace = {'gas': 1, 'returnValue': 'ab' * 1000, 'structLogs': LOGS}
+    items, _ = parse({'id': 1, 'result': trace},
+                     ('result', 'structLogs'), size)
+    assert items == LOGS
+
+
+@pytest.mark.parametrize('size', [1, 7])
+def test_object_items(size):
+    pool = {'queued': {'0x2': {}},
+            'pending': {'0x1': {'1': LOGS[0]}, '0x3': {}}}
+    items, _ = parse({'id': 1, 'result': pool}, ('result', 'pending'), size)
+    assert items == [('0x1', {'1': LOGS[0]}), ('0x3', {})]
+
+
+def test_error():
+    error = {'code': -32000, 'message': 'bad "}'}
+    items, parser = parse({'id': 1, 'error': error})
+    assert items == []
+    assert parser.error == error
+
+
+@pytest.mark.parametrize('result', [[], {}, None, [1, 'a', None, [2]]])
+def test_small_results(result):
+    items, _ = parse({'id': 1, 'result': result})
+    assert items == (result if isinstance(result, list) else [])
+
+
+def test_invalid_json():
+    with pytest.raises(ValueError):
+        JSONStreamParser().feed(b'{"result" 1}')
+
+
+@pytest.mark.run_loop
+def test_buffered_stream(fake_client, loop):
+    client = fake_client({'eth_getLogs': lambda query: LOGS})
+    stream = yield from client.rpc_stream('eth_getLogs', [{}], chunk_size=16)
+    items = []
+    while True:
+        try:
+            items.append((yield from stream.get()))
+        except LookupError:
+            break
+    assert items == LOGS
+
+    stream = yield from client.rpc_stream('test_method')
+    with pytest.raises(BadResponseError):
+        yield from stream.get()
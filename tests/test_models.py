@@ -0,0 +1,108 @@
+import pytest
+
+from aioethereum.models import Block, Log, Receipt, Transaction
+
+
+TRANSACTION = {
+    'blockHash': '0x' + '11' * 32,
+    'blockNumber': '0x10',
+    'from': '0x' + 'aa' * 20,
+    'gas': '0x5208',
+    'gasPrice': '0x3b9aca00',
+    'hash': '0x' + '22' * 32,
+    'input': '0x',
+    'nonce': '0x1',
+    'to': None,
+    'transactionIndex': '0x0',
+    'value': '0xde0b6b3a7640000',
+    'v': '0x1b',
+    'r': '0x' + '33' * 32,
+    's': '0x' + '44' * 32,
+}
+
+BLOCK = {
+    'number': '0x10',
+    'hash': '0x' + '11' * 32,
+    'parentHash': '0x' + '55' * 32,
+    'nonce': '0x0000000000000042',
+    'logsBloom': '0x' + '00' * 256,
+    'miner': '0x' + 'bb' * 20,
+    'difficulty': '0x20000',
+    'extraData': '0x',
+    'gasLimit': '0x47e7c4',
+    'gasUsed': '0x5208',
+    'timestamp': '0x5a8c5a1e',
+    'transactions': [TRANSACTION],
+    'uncles': [],
+    'sealFields': ['0x1'],
+}
+
+
+def test_lazy_decoding():
+    block = Block(BLOCK)
+    assert block._decoded == 0
+    assert block.number == 16
+    assert block.hash == b'\x11' * 32
+    assert block._decoded == 3
+
+    transaction = block.transactions[0]
+    assert isinstance(transaction, Transaction)
+    assert transaction.value == 10 ** 18
+    assert transaction.from_ == TRANSACTION['from']
+    assert transaction.to is None
+    assert transaction.max_fee_per_gas is None
+    assert block.extra == {'sealFields': ['0x1']}
+
+
+def test_dict_compatibility():
+    block = Block(BLOCK)
+    block.number, block.transactions[0].gas
+    assert block.to_dict() == BLOCK
+    assert block['hash'] == BLOCK['hash']
+    assert block['number'] == BLOCK['number']
+    assert block.get('baseFeePerGas') is None
+    assert 'baseFeePerGas' not in block
+    assert 'sealFields' in block
+    with pytest.raises(KeyError):
+        block['baseFeePerGas']
+    assert Block(BLOCK) == block
+    assert {block: 1}[Block(BLOCK)] == 1
+    assert hash(block) != hash(Transaction(TRANSACTION))
+
+
+def test_slots():
+    block = Block(BLOCK)
+    assert not hasattr(block, '__dict__')
+    with pytest.raises(AttributeError):
+        block.number = 1
+
+
+def test_block_with_hashes():
+    block = Block(dict(BLOCK, transactions=[TRANSACTION['hash']]))
+    assert block.transactions == [b'\x22' * 32]
+    assert block['transactions'] == [TRANSACTION['hash']]
+
+
+def test_receipt_logs():
+    log = {'address': '0x' + 'cc' * 20, 'topics': ['0x' + 'ab' * 32],
+           'data': '0x0001', 'logIndex': '0x0', 'removed': False}
+    receipt = Receipt({'transactionHash': TRANSACTION['hash'],
+                       'status': '0x1', 'logs': [log]})
+    assert receipt.status == 1
+    assert isinstance(receipt.logs[0], Log)
+    assert receipt.logs[0].topics == [b'\xab' * 32]
+    assert receipt.logs[0].data == b'\x00\x01'
+    assert receipt.to_dict()['logs'] == [log]
+
+
+@pytest.mark.run_loop
+def test_client_models(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop, models=True)
+    block = yield from client.eth_getBlockByNumber(0)
+    assert isinstance(block, Block)
+    assert block.number == 0
+
+    batch = client.batch()
+    batch.eth_getBlockByNumber(0)
+    assert (yield from batch.execute()) == [block]
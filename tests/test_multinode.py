@@ -0,0 +1,158 @@
+import asyncio
+
+import pytest
+
+from aioethereum.errors import BadResponseError
+from aioethereum.multinode import (
+    STRATEGY_LATENCY, STRATEGY_LEAST_OUTSTANDING, HedgePolicy,
+    MultiNodeClient, Node, create_multinode_client,
+)
+
+
+@pytest.fixture
+def dead_uri(unused_port):
+    return 'http://localhost:%s' % unused_port()
+
+
+@pytest.mark.run_loop
+def test_round_robin(loop, server):
+    client = yield from create_multinode_client(
+        [server.http_address, server.unixsocket], loop=loop)
+    assert isinstance(client, MultiNodeClient)
+    results = yield from asyncio.gather(
+        *[client.eth_coinbase() for _ in range(10)], loop=loop)
+    assert results == [server.coinbase] * 10
+    assert all(node.latency is not None for node in client.nodes)
+    yield from client.close()
+
+
+@pytest.mark.run_loop
+@pytest.mark.parametrize('strategy', [STRATEGY_LEAST_OUTSTANDING,
+                                      STRATEGY_LATENCY])
+def test_strategies(loop, server, strategy):
+    client = yield from create_multinode_client(
+        [server.http_address, server.unixsocket], loop=loop,
+        strategy=strategy)
+    results = yield from asyncio.gather(
+        *[client.eth_coinbase() for _ in range(10)], loop=loop)
+    assert results == [server.coinbase] * 10
+    yield from client.close()
+
+
+@pytest.mark.run_loop
+def test_invalid_strategy(loop, server):
+    with pytest.raises(ValueError):
+        yield from create_multinode_client([server.http_address], loop=loop,
+                                           strategy='random')
+
+
+@pytest.mark.run_loop
+def test_no_available_nodes(loop, server):
+    with pytest.raises(ConnectionError):
+        yield from create_multinode_client(
+            [server.unixsocket + '.missing'], loop=loop)
+
+
+@pytest.mark.run_loop
+def test_failover(loop, server, dead_uri):
+    client = yield from create_multinode_client(
+        [dead_uri, server.http_address], loop=loop, max_errors=1)
+    dead, alive = client.nodes
+    assert dead.healthy and alive.healthy
+    results = yield from asyncio.gather(
+        *[client.eth_coinbase() for _ in range(4)], loop=loop)
+    assert results == [server.coinbase] * 4
+    assert not dead.healthy
+    assert alive.healthy
+    yield from client.close()
+
+
+@pytest.mark.run_loop
+def test_unavailable_node_at_start(loop, server):
+    client = yield from create_multinode_client(
+        [server.unixsocket + '.missing', server.http_address], loop=loop)
+    missing, alive = client.nodes
+    assert missing.client is None and not missing.healthy
+    assert (yield from client.eth_coinbase()) == server.coinbase
+    yield from client.close()
+
+
+@pytest.mark.run_loop
+def test_request_error_is_not_retried(loop, server):
+    client = yield from create_multinode_client(
+        [server.http_address, server.unixsocket], loop=loop)
+    with pytest.raises(BadResponseError):
+        yield from client.rpc_call('test_method')
+    assert all(node.healthy for node in client.nodes)
+    yield from client.close()
+
+
+@pytest.mark.run_loop
+def test_health_check(loop, server):
+    client = yield from create_multinode_client(
+        [server.http_address, server.unixsocket], loop=loop, max_lag=0)
+    first, second = client.nodes
+    yield from client.check_health()
+    assert first.healthy and second.healthy
+    assert first.block_number is not None
+
+    second.healthy = False
+    yield from client.check_health()
+    assert second.healthy
+    yield from client.close()
+
+
+def test_hedge_policy_delay():
+    policy = HedgePolicy(percentile=90, min_delay=0.01, max_delay=1.0,
+                         min_samples=10)
+    assert policy.delay() == 1.0
+    for i in range(1, 101):
+        policy.observe(i / 1000)
+    assert policy.delay() == 0.091
+    assert policy.applies({'method': 'eth_call'})
+    assert not policy.applies({'method': 'eth_sendRawTransaction'})
+    assert not policy.applies([{'method': 'eth_call'}])
+
+
+@pytest.mark.run_loop
+def test_hedged_request(loop, server):
+    policy = HedgePolicy(max_delay=0.05)
+    client = yield from create_multinode_client(
+        [server.http_address, server.unixsocket], loop=loop, hedge=policy)
+    stalled = client.nodes[0].client
+    request = stalled._request
+
+    @asyncio.coroutine
+    def stall(data):
+        yield from asyncio.sleep(10, loop=loop)
+        return (yield from request(data))
+
+    stalled._request = stall
+    results = []
+    for _ in range(4):
+        results.append((yield from client.eth_coinbase()))
+    assert results == [server.coinbase] * 4
+    assert policy.stats['requests'] == 4
+    assert policy.stats['fired'] > 0
+    assert policy.stats['won'] == policy.stats['fired']
+    assert client.nodes[0].outstanding == 0
+    yield from client.close()
+
+
+@pytest.mark.run_loop
+def test_hedge_without_other_node(loop, fake_client):
+
+    @asyncio.coroutine
+    def block_number():
+        yield from asyncio.sleep(0.05, loop=loop)
+        return '0x1'
+
+    policy = HedgePolicy(max_delay=0.01)
+    client = MultiNodeClient(
+        [Node('ipc://a', fake_client({'eth_blockNumber': block_number})),
+         Node('ipc://b')], loop=loop, hedge=policy)
+    assert (yield from client.eth_blockNumber()) == 1
+    assert policy.stats['fired'] == 0
+    # latency of the whole request is observed
+    assert policy._latencies[0] >= 0.05
+    yield from client.close()
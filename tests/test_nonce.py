@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from aioethereum.errors import BadResponseError
+from aioethereum.nonce import NonceManager
+
+
+class FakeClient:
+
+    def __init__(self, count=5):
+        self.count = count
+        self.requests = 0
+        self.sent = []
+        self.errors = []
+
+    @asyncio.coroutine
+    def eth_getTransactionCount(self, address, block):
+        assert block == 'pending'
+        self.requests += 1
+        return self.count
+
+    @asyncio.coroutine
+    def eth_sendTransaction(self, from_, nonce=None, **kwargs):
+        if self.errors:
+            raise self.errors.pop(0)
+        if nonce < self.count:
+            raise BadResponseError('nonce too low', -32000)
+        self.sent.append(nonce)
+        self.count = nonce + 1
+        return hex(nonce)
+
+
+@pytest.mark.run_loop
+def test_allocate(loop):
+    client = FakeClient()
+    nonces = NonceManager(client, loop=loop)
+    allocated = yield from asyncio.gather(
+        *[nonces.allocate('0xAA') for _ in range(10)], loop=loop)
+    assert sorted(allocated) == list(range(5, 15))
+    assert client.requests == 1
+
+    yield from nonces.release('0xaa', 7)
+    yield from nonces.release('0xaa', 14)
+    assert (yield from nonces.allocate('0xaa')) == 7
+    assert (yield from nonces.allocate('0xaa')) == 14
+    assert (yield from nonces.allocate('0xaa')) == 15
+
+
+@pytest.mark.run_loop
+def test_send_transaction(loop):
+    client = FakeClient()
+    nonces = NonceManager(client, loop=loop)
+    assert (yield from nonces.send_transaction('0xaa', value=1)) == '0x5'
+
+    # transaction sent past the manager
+    client.count += 2
+    assert (yield from nonces.send_transaction('0xaa', value=1)) == '0x8'
+    assert client.sent == [5, 8]
+
+    client.errors.append(BadResponseError('insufficient funds', -32000))
+    with pytest.raises(BadResponseError):
+        yield from nonces.send_transaction('0xaa', value=1)
+    assert (yield from nonces.allocate('0xaa')) == 9
+
+
+@pytest.mark.run_loop
+def test_send_known_transaction(loop):
+    client = FakeClient()
+    nonces = NonceManager(client, loop=loop)
+    txhash = '0x' + '12' * 32
+    client.errors.append(BadResponseError('known transaction: ' + txhash,
+                                          -32000))
+    assert (yield from nonces.send_transaction('0xaa', value=1)) == txhash
+
+    client.errors.append(BadResponseError('already known', -32000))
+    with pytest.raises(BadResponseError):
+        yield from nonces.send_transaction('0xaa', value=1)
+    # transactions are not sent again and their nonces stay used
+    assert client.sent == []
+    assert (yield from nonces.allocate('0xaa')) == 7
+
+
+def test_is_nonce_error():
+    assert NonceManager.is_nonce_error(
+        BadResponseError('nonce too low', -32000))
+    assert not NonceManager.is_nonce_error(
+        BadResponseError('known transaction: 0x12', -32000))
+    assert NonceManager.is_pooled_error(
+        BadResponseError('already known', -32000))
+    assert not NonceManager.is_nonce_error(
+        BadResponseError('gas too low', -32000))
+    assert not NonceManager.is_nonce_error(ValueError('nonce too low'))
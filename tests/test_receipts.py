@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+
+class Chain:
+    """In-memory chain answering head and receipts."""
+
+    def __init__(self):
+        self.head = 10
+        self.mined = {}
+
+    def handlers(self):
+        return {'eth_blockNumber': self.block_number,
+                'eth_getTransactionReceipt': self.receipt}
+
+    def block_number(self):
+        return hex(self.head)
+
+    def receipt(self, txhash):
+        number = self.mined.get(txhash)
+        if number is None:
+            return None
+        return {'transactionHash': txhash, 'blockNumber': hex(number),
+                'status': '0x1'}
+
+
+@pytest.mark.run_loop
+def test_watch_receipts(loop, fake_client):
+    chain = Chain()
+    client = fake_client(chain.handlers())
+    watcher = client.watch_receipts(confirmations=2, poll_interval=0.01,
+                                    batch_size=3)
+    hashes = ['0x{0:064x}'.format(i) for i in range(10)]
+    futures = [watcher.watch(txhash) for txhash in hashes]
+    fast = watcher.watch(hashes[0], confirmations=0)
+    yield from asyncio.sleep(0.05, loop=loop)
+    assert not any(future.done() for future in futures + [fast])
+    assert len(watcher) == 10
+
+    # between blocks only new transactions are checked
+    sent = len(client.requests)
+    futures.append(watcher.watch('0x' + 'ff' * 32))
+    yield from asyncio.sleep(0.05, loop=loop)
+    checked = [item['params'][0] for data in client.requests[sent:]
+               if isinstance(data, list) for item in data]
+    assert checked == ['0x' + 'ff' * 32]
+    hashes.append('0x' + 'ff' * 32)
+
+    for txhash in hashes:
+        chain.mined[txhash] = 11
+    chain.head = 11
+    receipt = yield from asyncio.wait_for(fast, 1, loop=loop)
+    assert receipt['blockNumber'] == '0xb'
+    assert not any(future.done() for future in futures)
+
+    # receipt of replaced block is dropped
+    del chain.mined[hashes[1]]
+    chain.head = 13
+    done, pending = yield from asyncio.wait(futures, timeout=1, loop=loop)
+    assert len(done) == 10 and futures[1] in pending
+
+    batches = [data for data in client.requests if isinstance(data, list)]
+    assert max(len(batch) for batch in batches) == 3
+    watcher.close()
+    assert futures[1].cancelled()
+
+
+@pytest.mark.run_loop
+def test_watch_after_close(loop, fake_client):
+    chain = Chain()
+    client = fake_client(chain.handlers())
+    watcher = client.watch_receipts(poll_interval=0.01)
+    watcher.watch('0x' + '01' * 32)
+    yield from asyncio.sleep(0.02, loop=loop)
+    watcher.close()
+    watcher.watch('0x' + '02' * 32)
+    task = watcher._task
+    # cancelled poller ends after the new one is started
+    yield from asyncio.sleep(0.02, loop=loop)
+    watcher.watch('0x' + '03' * 32)
+    assert watcher._task is task and not task.done()
+    watcher.close()
+
+
+@pytest.mark.run_loop
+def test_wait_timeout(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop)
+    watcher = client.watch_receipts(poll_interval=0.1)
+    with pytest.raises(asyncio.TimeoutError):
+        yield from watcher.wait('0x' + '00' * 32, timeout=0.3)
+    yield from asyncio.sleep(0, loop=loop)
+    assert not len(watcher)
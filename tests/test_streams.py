@@ -0,0 +1,96 @@
+import asyncio
+
+import pytest
+
+from aioethereum.errors import BadResponseError
+from aioethereum.streams import BLOCK_EVENT_NEW
+
+
+@pytest.mark.run_loop
+def test_stream_blocks(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop)
+    stream = client.stream_blocks(start=0, concurrency=3)
+    for number in range(3):
+        event = yield from asyncio.wait_for(stream.get(), 30, loop=loop)
+        assert event.type == BLOCK_EVENT_NEW
+        assert event.number == number
+        assert event.hash == event.block['hash']
+        assert int(event.block['number'], 16) == number
+    stream.close()
+
+
+@pytest.mark.run_loop
+def test_stream_blocks_from_head(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop)
+    bnumber = yield from client.eth_blockNumber()
+    stream = client.stream_blocks(confirmations=1, poll_interval=0.1)
+    event = yield from asyncio.wait_for(stream.get(), 30, loop=loop)
+    assert event.number >= bnumber - 1
+    stream.close()
+
+
+@pytest.mark.run_loop
+def test_scan_logs(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.http_address,
+                                               loop=loop)
+    bnumber = yield from client.eth_blockNumber()
+    expected = yield from client.eth_getLogs(0, bnumber)
+
+    scanner = client.scan_logs(0, bnumber, chunk_size=2, workers=3)
+    logs = []
+    while True:
+        try:
+            logs.append((yield from scanner.get()))
+        except LookupError:
+            break
+    assert logs == expected
+    assert scanner.chunk_size > 2
+
+
+@pytest.mark.run_loop
+def test_scan_logs_adaptive(fake_client, loop):
+    expected = [{'blockNumber': hex(number), 'logIndex': '0x0'}
+                for number in range(200)]
+    fetched = []
+    refused = []
+
+    def get_logs(query):
+        start = int(query['fromBlock'], 16)
+        end = int(query['toBlock'], 16)
+        # node refuses big ranges only for a while
+        if end - start >= 8 and len(refused) < 2:
+            refused.append((start, end))
+            raise BadResponseError(
+                'query returned more than 10000 results', -32005)
+        fetched.append(end - start + 1)
+        return expected[start:end + 1]
+
+    client = fake_client({'eth_getLogs': get_logs})
+    scanner = client.scan_logs(0, 199, chunk_size=32, max_chunk_size=64,
+                               workers=1)
+    logs = []
+    while True:
+        try:
+            logs.append((yield from scanner.get()))
+        except LookupError:
+            break
+    assert logs == expected
+    assert refused == [(0, 31), (0, 15)]
+    assert fetched[:2] == [8, 8]
+    assert max(fetched) == 64
+    assert scanner.chunk_size == 64
+
+
+@pytest.mark.run_loop
+def test_scan_logs_rate_limit(fake_client, loop):
+    def get_logs(query):
+        raise BadResponseError('rate limit exceeded', 429)
+
+    client = fake_client({'eth_getLogs': get_logs})
+    scanner = client.scan_logs(0, 199, chunk_size=32, workers=1)
+    with pytest.raises(BadResponseError):
+        yield from scanner.get()
+    assert len(client.requests) == 1
+    assert scanner.chunk_size == 32
@@ -0,0 +1,133 @@
+import pytest
+
+from aioethereum import crypto, rlp
+from aioethereum.crypto import (
+    keccak256,
+    private_key_to_address,
+    recover_address,
+)
+from aioethereum.errors import BadResponseError
+from aioethereum.nonce import NonceManager
+from aioethereum.transactions import TransactionSigner, sign_transaction
+
+
+KEY = '0x' + '46' * 32
+ADDRESS = '0x9d8a62f656a8d1615c1294fd71e9cfb3e4855a4f'
+
+# example of EIP-155
+LEGACY = {'nonce': 9, 'gas_price': 20 * 10 ** 9, 'gas': 21000,
+          'to': '0x' + '35' * 20, 'value': 10 ** 18, 'chain_id': 1}
+LEGACY_RAW = (
+    '0xf86c098504a817c800825208943535353535353535353535353535353535353535'
+    '880de0b6b3a76400008025a028ef61340bd939bc2195fe537567866003e1a15d3c71'
+    'ff63e1590620aa636276a067cbe9d8997f761aecb703304b3800ccf555c9f3dc6421'
+    '4b297fb1966a3b6d83'
+)
+
+DYNAMIC_FEE = {'nonce': 1, 'gas': 21000, 'to': '0x' + '35' * 20,
+               'value': 1, 'chain_id': 5, 'max_fee_per_gas': 10 ** 10,
+               'max_priority_fee_per_gas': 10 ** 9,
+               'access_list': [{'address': '0x' + '11' * 20,
+                                'storageKeys': ['0x' + '00' * 32]}]}
+
+
+def test_rlp():
+    assert rlp.encode(b'dog') == b'\x83dog'
+    assert rlp.encode([b'cat', b'dog']) == b'\xc8\x83cat\x83dog'
+    assert rlp.encode(0) == b'\x80'
+    assert rlp.encode(1024) == b'\x82\x04\x00'
+    assert rlp.encode(b'x' * 56)[:2] == b'\xb8\x38'
+    item = [b'', b'\x01', [b'x' * 60, []]]
+    assert rlp.decode(rlp.encode(item)) == item
+    with pytest.raises(ValueError):
+        rlp.decode(b'\x83do')
+
+
+def test_keccak256():
+    assert keccak256(b'').hex() == (
+        'c5d2460186f7233c927e7db2dcc703c0e500b653ca82273b7bfad8045d85a470')
+
+
+def test_recover_address():
+    pytest.importorskip('coincurve')
+    fields = rlp.decode(bytes.fromhex(LEGACY_RAW[2:]))
+    v, r, s = [int.from_bytes(value, 'big') for value in fields[6:]]
+    msg_hash = keccak256(rlp.encode(fields[:6] + [1, 0, 0]))
+    assert recover_address(msg_hash, v - 37, r, s) == ADDRESS
+    with pytest.raises(ValueError):
+        recover_address(msg_hash, v - 37, 0, s)
+
+
+def test_sign_without_coincurve(monkeypatch):
+    monkeypatch.setattr(crypto, 'coincurve', None)
+    with pytest.raises(RuntimeError):
+        sign_transaction(LEGACY, KEY)
+    with pytest.raises(RuntimeError):
+        private_key_to_address(KEY)
+    with pytest.raises(RuntimeError):
+        recover_address(b'\x00' * 32, 0, 1, 1)
+
+
+def test_sign_legacy():
+    pytest.importorskip('coincurve')
+    signed = sign_transaction(LEGACY, KEY)
+    assert signed.raw == LEGACY_RAW
+    assert signed.hash == '0x' + keccak256(bytes.fromhex(LEGACY_RAW[2:])).hex()
+    assert private_key_to_address(KEY) == ADDRESS
+
+
+def test_sign_dynamic_fee():
+    pytest.importorskip('coincurve')
+    raw = bytes.fromhex(sign_transaction(DYNAMIC_FEE, KEY).raw[2:])
+    assert raw[0] == 2
+    fields = rlp.decode(raw[1:])
+    assert int.from_bytes(fields[0], 'big') == 5
+    msg_hash = keccak256(raw[:1] + rlp.encode(fields[:9]))
+    recovery, r, s = [int.from_bytes(value, 'big') for value in fields[9:]]
+    assert recover_address(msg_hash, recovery, r, s) == ADDRESS
+
+    with pytest.raises(ValueError):
+        sign_transaction(dict(DYNAMIC_FEE, chain_id=None), KEY)
+
+
+@pytest.mark.run_loop
+def test_signer(loop):
+    pytest.importorskip('coincurve')
+    signer = TransactionSigner(KEY, chain_id=1, workers=2, chunk_size=2,
+                               loop=loop)
+    assert signer.address == ADDRESS
+    txs = [dict(LEGACY, nonce=nonce) for nonce in range(5)]
+    txs[1].pop('chain_id')
+    signed = yield from signer.sign_many(txs)
+    assert signed[4] == sign_transaction(txs[4], KEY)
+    assert signed[1] == sign_transaction(dict(txs[1], chain_id=1), KEY)
+    assert (yield from signer.sign(LEGACY)).raw == LEGACY_RAW
+    signer.close()
+
+
+@pytest.mark.run_loop
+def test_send_many(loop, fake_client):
+    pytest.importorskip('coincurve')
+    pooled = []
+
+    def send_raw_transaction(raw):
+        if raw in pooled:
+            raise BadResponseError('already known', -32000)
+        pooled.append(raw)
+        return '0x{0:064x}'.format(len(pooled))
+
+    client = fake_client({'eth_sendRawTransaction': send_raw_transaction,
+                          'eth_getTransactionCount': lambda *args: '0x5'})
+    nonces = NonceManager(client, loop=loop)
+    signer = TransactionSigner(KEY, chain_id=1, workers=1, loop=loop)
+    tx = dict(LEGACY, nonce=None)
+    first, = yield from signer.send_many(client, [tx], nonces)
+    assert first == '0x{0:064x}'.format(1)
+
+    # resent transaction is answered by its hash
+    txs = [dict(LEGACY, nonce=5), tx]
+    results = yield from signer.send_many(client, txs, nonces)
+    assert results == [sign_transaction(txs[0], KEY).hash,
+                       '0x{0:064x}'.format(2)]
+    assert (yield from nonces.allocate(ADDRESS)) == 7
+    signer.close()
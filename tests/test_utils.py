@@ -3,7 +3,7 @@ import pytest
 from aioethereum.constants import (
     BLOCK_TAG_EARLIEST, BLOCK_TAG_LATEST, BLOCK_TAG_PENDING)
 from aioethereum.utils import (
-    add_0x, hex_to_dec, validate_block,
+    add_0x, hex_to_dec, hex_to_array, hex_columns, validate_block,
     wei_to_ether, ether_to_wei, gwei_to_ether, ether_to_gwei)
 
 
@@ -85,3 +85,33 @@ def test_ether_to_gwei():
     assert result == 10 ** 9  # 10 in 9 step Gwei
     result = ether_to_gwei(10 ** -9)
     assert result == 1  # 1 Gwei
+
+
+def test_hex_to_array():
+    np = pytest.importorskip('numpy')
+    result = hex_to_array(['0x0', '0x10', '0xffffffffffffffff'])
+    assert result.dtype == np.uint64
+    assert result.tolist() == [0, 16, 2 ** 64 - 1]
+
+    result = hex_to_array(['0x1', hex(2 ** 64)])
+    assert result.dtype == object
+    assert result.tolist() == [1, 2 ** 64]
+
+    assert len(hex_to_array([])) == 0
+    with pytest.raises(ValueError):
+        hex_to_array(['0xzz'])
+
+    # number of pending block is null
+    result = hex_to_array(['0x1', None, '0x3'])
+    assert result.dtype == np.uint64
+    assert result.mask.tolist() == [False, True, False]
+    assert result.sum() == 4
+
+
+def test_hex_columns():
+    pytest.importorskip('numpy')
+    logs = [{'blockNumber': '0x1', 'logIndex': '0x0'},
+            {'blockNumber': '0x2', 'logIndex': '0x5'}]
+    columns = hex_columns(logs, ('blockNumber', 'logIndex'))
+    assert columns['blockNumber'].tolist() == [1, 2]
+    assert columns['logIndex'].tolist() == [0, 5]
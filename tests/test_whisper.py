@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+
+class Whisper:
+    """Keeps messages of whisper filters in memory."""
+
+    def __init__(self):
+        self.filters = {}
+
+    def handlers(self):
+        return {'shh_newFilter': self.new_filter,
+                'shh_getFilterChanges': self.filter_changes,
+                'shh_uninstallFilter': self.uninstall_filter}
+
+    def post(self, topic, message_hash):
+        for topics, messages in self.filters.values():
+            if topic in topics:
+                messages.append({'hash': message_hash, 'topic': topic})
+
+    def new_filter(self, params):
+        filter_id = hex(len(self.filters))
+        self.filters[filter_id] = (params['topics'], [])
+        return filter_id
+
+    def filter_changes(self, filter_id):
+        messages = self.filters[filter_id][1]
+        result = list(messages)
+        del messages[:]
+        return result
+
+    def uninstall_filter(self, filter_id):
+        return self.filters.pop(filter_id, None) is not None
+
+
+@pytest.mark.parametrize('batch', [True, False])
+@pytest.mark.run_loop
+def test_shh_stream(loop, fake_client, batch):
+    whisper = Whisper()
+    client = fake_client(whisper.handlers(), batch=batch)
+    stream = client.shh_stream(poll_interval=0.01, max_size=2, seen_size=2)
+    first = yield from stream.add_filter(topics=['0x01'])
+    yield from stream.add_filter(topics=['0x01', '0x02'])
+
+    whisper.post('0x01', '0xaa')
+    item = yield from asyncio.wait_for(stream.get(), 1, loop=loop)
+    assert item.filter_id == first
+    assert item.message['hash'] == '0xaa'
+
+    for message_hash in ('0xb1', '0xb2', '0xb3', '0xb4'):
+        whisper.post('0x02', message_hash)
+    yield from asyncio.sleep(0.05, loop=loop)
+    # polling waits for consumer
+    assert stream._queue.full()
+    received = []
+    for _ in range(4):
+        item = yield from asyncio.wait_for(stream.get(), 1, loop=loop)
+        received.append(item.message['hash'])
+    assert received == ['0xb1', '0xb2', '0xb3', '0xb4']
+
+    batches = [data for data in client.requests if isinstance(data, list)]
+    assert bool(batches) and (len(batches) > 1) == batch
+
+    yield from stream.close()
+    assert not whisper.filters
+    with pytest.raises(LookupError):
+        yield from stream.get()
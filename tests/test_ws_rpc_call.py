@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+
+from aioethereum.constants import SUBSCRIPTION_NEW_HEADS
+from aioethereum.errors import BadResponseError
+
+
+@pytest.mark.run_loop
+def test_rpc_call(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.ws_address,
+                                               loop=loop)
+    results = yield from asyncio.gather(
+        *[client.eth_coinbase() for _ in range(10)], loop=loop)
+    assert results == [server.coinbase] * 10
+    assert not client._pending
+
+    with pytest.raises(BadResponseError):
+        yield from client.rpc_call('test_method')
+    yield from client.close()
+
+
+@pytest.mark.run_loop
+def test_subscribe_new_heads(create_ethereum_client, loop, server):
+    client = yield from create_ethereum_client(server.ws_address,
+                                               loop=loop)
+    subscription = yield from client.subscribe(SUBSCRIPTION_NEW_HEADS)
+    assert subscription.id in client._subscriptions
+
+    header = yield from asyncio.wait_for(subscription.get(), 30, loop=loop)
+    assert 'number' in header and 'hash' in header
+
+    assert (yield from subscription.unsubscribe()) is True
+    assert subscription.id not in client._subscriptions
+    with pytest.raises(LookupError):
+        while True:
+            yield from subscription.get()
+    yield from client.close()
+
+
+@pytest.mark.run_loop
+def test_subscription_closed_with_connection(create_ethereum_client, loop,
+                                             server):
+    client = yield from create_ethereum_client(server.ws_address,
+                                               loop=loop)
+    subscription = yield from client.subscribe(SUBSCRIPTION_NEW_HEADS)
+    yield from client._ws.close()
+    with pytest.raises(ConnectionError):
+        while True:
+            yield from subscription.get()
+    yield from client.close()